@@ -0,0 +1,58 @@
+"""Memory & task time of list[RowData] vs ColumnTable.
+
+Run: uv run python benchmarks/bench_columns.py [rows]
+"""
+
+import sys
+import tracemalloc
+from collections.abc import Callable
+from timeit import default_timer
+from typing import Any
+
+from dataplaybook import ColumnTable
+from dataplaybook.helpers.typeh import TYPECHECK
+from dataplaybook.tasks import filter_rows, unique
+
+
+def _rows(count: int) -> list[dict[str, Any]]:
+    return [
+        {"id": i, "name": f"name {i}", "group": f"g{i % 100}", "value": i * 0.5}
+        for i in range(count)
+    ]
+
+
+def _columns(count: int) -> ColumnTable:
+    return ColumnTable(
+        {
+            "id": list(range(count)),
+            "name": [f"name {i}" for i in range(count)],
+            "group": [f"g{i % 100}" for i in range(count)],
+            "value": [i * 0.5 for i in range(count)],
+        }
+    )
+
+
+def _mem_mb(build: Callable[[int], Any], count: int) -> float:
+    tracemalloc.start()
+    table = build(count)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del table
+    return size / 1024 / 1024
+
+
+def main() -> None:
+    """Measure each."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    TYPECHECK.mode = "sample"
+    for name, build in (("list[RowData]", _rows), ("ColumnTable", _columns)):
+        print(f"{name:>14}: {_mem_mb(build, count):7.1f}MB for {count} rows")
+        table = build(count)
+        start = default_timer()
+        len(list(filter_rows(table=table, include={"group": "g1"})))
+        len(list(unique(table=table, key="group")))
+        print(f"{'':>14}  filter_rows + unique {default_timer() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Throughput of read_csv vs read_csv_chunks, and of write_csv.
+
+Run: uv run python benchmarks/bench_csv.py [rows]
+"""
+
+import sys
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from timeit import default_timer
+from typing import Any
+
+from dataplaybook.helpers.typeh import TYPECHECK
+from dataplaybook.tasks.io_misc import read_csv, read_csv_chunks, write_csv
+
+
+def _write(file: Path, count: int) -> None:
+    with file.open("w", encoding="utf-8") as fil:
+        fil.write("id,name,group,value\n")
+        for i in range(count):
+            fil.write(f'{i},"name {i}",g{i % 100},{i * 0.5}\n')
+
+
+def _count(table: Iterable[Any]) -> int:
+    return sum(len(c) if isinstance(c, list) else 1 for c in table)
+
+
+def main() -> None:
+    """Read the file with each option."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    TYPECHECK.mode = "off"
+    with TemporaryDirectory() as tmp:
+        file = Path(tmp) / "bench.csv"
+        _write(file, count)
+        types = {"id": int, "value": float}
+        cases: tuple[tuple[str, Callable[[], Iterable[Any]]], ...] = (
+            ("read_csv", lambda: read_csv(file=file)),
+            ("read_csv_chunks", lambda: read_csv_chunks(file=file)),
+            ("  + types", lambda: read_csv_chunks(file=file, types=types)),
+            (
+                "  + as_columns",
+                lambda: read_csv_chunks(file=file, types=types, as_columns=True),
+            ),
+            ("  + workers=4", lambda: read_csv_chunks(file=file, workers=4)),
+        )
+        for name, read in cases:
+            start = default_timer()
+            _count(read())
+            print(f"{name:>16}: {default_timer() - start:5.2f}s for {count} rows")
+
+        for name, out in (("write_csv", "out.csv"), ("  + gzip", "out.csv.gz")):
+            start = default_timer()
+            write_csv(table=read_csv(file=file), file=Path(tmp) / out)
+            took = default_timer() - start
+            print(f"{name:>16}: {took:5.2f}s incl. read_csv")
+
+
+if __name__ == "__main__":
+    main()
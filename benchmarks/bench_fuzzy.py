@@ -0,0 +1,56 @@
+"""fuzzy_match: all pairs vs trigram blocking vs a process pool.
+
+Run: uv run python benchmarks/bench_fuzzy.py [rows]
+"""
+
+import random
+import string
+import sys
+from timeit import default_timer
+
+from dataplaybook.helpers.typeh import TYPECHECK
+from dataplaybook.tasks.fuzzy import fuzzy_match
+
+
+def _name(rnd: random.Random) -> str:
+    words = (
+        "".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(3, 9)))
+        for _ in range(rnd.randint(1, 3))
+    )
+    return " ".join(words)
+
+
+def _typo(rnd: random.Random, name: str) -> str:
+    pos = rnd.randrange(len(name))
+    return name[:pos] + rnd.choice(string.ascii_lowercase) + name[pos + 1 :]
+
+
+def main() -> None:
+    """Time each mode."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 3_000
+    TYPECHECK.mode = "sample"
+    rnd = random.Random(1)
+    names = [_name(rnd) for _ in range(count)]
+    table2 = [{"name": n} for n in names]
+
+    for title, kwargs in (
+        ("all pairs", {"ngram": 0}),
+        ("trigram blocking", {}),
+        ("blocking, 4 workers", {"workers": 4}),
+    ):
+        table1 = [{"name": _typo(rnd, n)} for n in names]
+        start = default_timer()
+        fuzzy_match(
+            table1=table1,
+            table2=table2,
+            t1_column="name",
+            t2_column="name",
+            t1_target_column="match",
+            **kwargs,  # type:ignore[arg-type]
+        )
+        total = default_timer() - start
+        print(f"{title:>20}: {total:7.2f}s for {count} x {count} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Standards extraction from requirement cells: all patterns, literal check, cached.
+
+Run: uv run python benchmarks/bench_ietf.py [cells]
+"""
+
+import random
+import sys
+from timeit import default_timer
+
+from dataplaybook.helpers.typeh import TYPECHECK
+from dataplaybook.tasks import ietf
+
+WORDS = (
+    "the system shall support",
+    "as per",
+    "compliant",
+    "partially compliant",
+    "RFC 4271",
+    "IEEE 802.1Q",
+    "ITU-T G.8032",
+    "draft-ietf-idr-bgp-ls-05",
+    "with the following exceptions",
+)
+
+
+def _all_patterns(val: str) -> list[ietf.KeyStr]:
+    return [rex(m) for rex in ietf.STANDARDS for m in rex.rex.finditer(val)]
+
+
+def main() -> None:
+    """Time each."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rnd = random.Random(1)
+    cells = [" ".join(rnd.choices(WORDS, k=rnd.randint(1, 5))) for _ in range(count)]
+
+    for name, func in (
+        ("all patterns", _all_patterns),
+        ("literal check", lambda v: list(ietf._extract_standards(v))),
+        ("cached", ietf.extract_standards),
+    ):
+        start = default_timer()
+        for cell in cells:
+            func(cell)
+        print(f"{name:>14}: {default_timer() - start:7.2f}s for {count} cells")
+    print(f"cache: {ietf.STANDARDS_CACHE}")
+
+    TYPECHECK.mode = "sample"
+    table = [{"req": c} for c in cells]
+    for workers in (0, 4):
+        ietf.STANDARDS_CACHE.clear()
+        start = default_timer()
+        rows = sum(
+            1
+            for _ in ietf.extract_standards_from_table(
+                table=table, extract_columns=["req"], workers=workers
+            )
+        )
+        total = default_timer() - start
+        print(f"table, workers={workers}: {total:7.2f}s for {rows} rows")
+
+
+if __name__ == "__main__":
+    main()
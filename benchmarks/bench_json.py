@@ -0,0 +1,51 @@
+"""Peak memory & time of orjson_load vs json_iter for a large JSON array.
+
+Run: uv run python benchmarks/bench_json.py [rows]
+"""
+
+import sys
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from timeit import default_timer
+from typing import Any
+
+from dataplaybook.utils.json import json_iter, orjson_load, write_orjson
+
+
+def _count(file: Path) -> int:
+    return sum(1 for _ in json_iter(file, path="data.rows"))
+
+
+def _load(file: Path) -> int:
+    return len(orjson_load(file)["data"]["rows"])
+
+
+def main() -> None:
+    """Load the file both ways."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    rows = [{"id": i, "name": f"name {i}", "tags": ["a", "b"]} for i in range(count)]
+    with TemporaryDirectory() as tmp:
+        file = Path(tmp) / "bench.json"
+        write_orjson(data={"data": {"rows": rows}}, file=file, indent=2)
+        del rows
+        size = file.stat().st_size / 2**20
+        cases: tuple[tuple[str, Callable[[Path], Any]], ...] = (
+            ("orjson_load", _load),
+            ("json_iter", _count),
+        )
+        for name, func in cases:
+            start = default_timer()
+            tracemalloc.start()
+            func(file)
+            peak = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+            took = default_timer() - start
+            print(
+                f"{name:>12}: {took:5.2f}s, peak {peak:7.1f}MB for a {size:.0f}MB file"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Memory of read_csv rows as dicts vs compact Records.
+
+Run: uv run python benchmarks/bench_records.py [rows]
+"""
+
+import sys
+import tracemalloc
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from timeit import default_timer
+
+from dataplaybook.helpers.typeh import TYPECHECK
+from dataplaybook.tasks import filter_rows
+from dataplaybook.tasks.io_misc import read_csv
+
+COLUMNS = 8
+
+
+def _write(file: Path, count: int) -> None:
+    header = ",".join(f"col{c}" for c in range(COLUMNS))
+    with file.open("w", encoding="utf-8") as fil:
+        fil.write(header + "\n")
+        for i in range(count):
+            fil.write(",".join(f"{i % 7 * c}" for c in range(COLUMNS)) + "\n")
+
+
+def main() -> None:
+    """Read the file both ways."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    TYPECHECK.mode = "sample"
+    with TemporaryDirectory() as tmp:
+        file = Path(tmp) / "bench.csv"
+        _write(file, count)
+        for compact in (False, True):
+            name = "Record" if compact else "dict"
+            start = default_timer()
+            tracemalloc.start()
+            table = list(read_csv(file=file, compact=compact))
+            size = tracemalloc.get_traced_memory()[0] / 1024 / 1024
+            tracemalloc.stop()
+            took = default_timer() - start
+            print(
+                f"{name:>7}: {size:7.1f}MB, {size * 2**20 / count:5.0f}B/row, ", end=""
+            )
+            start = default_timer()
+            len(list(filter_rows(table=table, include={"col1": "3"})))
+            print(f"read {took:.2f}s, filter_rows {default_timer() - start:.2f}s")
+            del table
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Import time of dataplaybook and the lazy task registry, in a fresh interpreter.
+
+Run: uv run python benchmarks/bench_startup.py [runs]
+"""
+
+import subprocess
+import sys
+
+IMPORTS = (
+    ("dataplaybook", "import dataplaybook"),
+    ("tasks.all", "import dataplaybook.tasks.all"),
+    ("tasks.all + read_excel", "from dataplaybook.tasks.all import read_excel"),
+    ("all task modules", "from dataplaybook.tasks.all import *"),
+)
+
+
+def _import_ms(code: str) -> float:
+    """Time the import, excluding interpreter startup."""
+    timed = f"import time;s=time.perf_counter();{code};print(time.perf_counter()-s)"
+    res = subprocess.run(
+        [sys.executable, "-c", timed], check=True, capture_output=True, text=True
+    )
+    return float(res.stdout.splitlines()[-1]) * 1000
+
+
+def main() -> None:
+    """Time each import, best of runs."""
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    for name, code in IMPORTS:
+        best = min(_import_ms(code) for _ in range(runs))
+        print(f"{name:>22}: {best:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
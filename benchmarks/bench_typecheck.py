@@ -0,0 +1,42 @@
+"""Per-call overhead of task type checking on a 100k row table.
+
+Run: uv run python benchmarks/bench_typecheck.py
+"""
+
+from timeit import timeit
+
+from typeguard import typechecked
+
+from dataplaybook import RowData, task
+from dataplaybook.helpers.typeh import TYPECHECK
+
+ROWS = 100_000
+CALLS = 5
+
+
+@task
+def count_rows(*, table: list[RowData]) -> int:
+    """Return the number of rows."""
+    return len(table)
+
+
+def main() -> None:
+    """Time each mode."""
+    table = [{"a": i, "b": str(i)} for i in range(ROWS)]
+    raw = count_rows.__wrapped__  # type:ignore[attr-defined]
+
+    def _per_call() -> None:
+        typechecked(raw)(table=table)
+
+    res = {"typechecked() per call": timeit(_per_call, number=CALLS)}
+    for mode in ("all", "sample", "off"):
+        TYPECHECK.mode = mode  # type:ignore[assignment]
+        res[mode] = timeit(lambda: count_rows(table=table), number=CALLS)
+    TYPECHECK.mode = "all"
+
+    for name, total in res.items():
+        print(f"{name:>24}: {total / CALLS * 1000:9.3f} ms/call")
+
+
+if __name__ == "__main__":
+    main()
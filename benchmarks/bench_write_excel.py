@@ -0,0 +1,50 @@
+"""Peak RSS and wall time of write_excel, default vs write_only.
+
+Each run is in a fresh process, so ru_maxrss is the peak for that path.
+Run: uv run python benchmarks/bench_write_excel.py [rows]
+"""
+
+import resource
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from timeit import default_timer
+
+from dataplaybook import DataEnvironment, LazyTable
+from dataplaybook.helpers.typeh import TYPECHECK
+from dataplaybook.tasks.io_xlsx import write_excel
+
+
+def _rows(count: int) -> LazyTable:
+    return LazyTable(
+        {"id": i, "name": f"name {i}", "value": i * 1.5, "flag": i % 2 == 0}
+        for i in range(count)
+    )
+
+
+def _run(write_only: bool, count: int) -> tuple[float, int]:
+    """Write count rows, return (seconds, peak RSS kB)."""
+    TYPECHECK.mode = "sample"
+    tables = DataEnvironment()
+    tables["data"] = _rows(count)
+    with tempfile.TemporaryDirectory() as tmp:
+        start = default_timer()
+        write_excel(tables=tables, file=Path(tmp) / "x.xlsx", write_only=write_only)
+        total = default_timer() - start
+    return total, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def main() -> None:
+    """Compare both paths."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    for write_only in (False, True):
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            total, rss = pool.submit(_run, write_only, count).result()
+        print(
+            f"write_only={write_only!s:5} {count} rows: {total:7.2f}s {rss / 1024:8.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""write_mongo with mongomock: full replace vs diff, after changing 1% of rows.
+
+mongomock runs in-process, so this shows the client side cost and the number
+of documents written, not network/server time.
+Run: uv run python benchmarks/bench_write_mongo.py [rows]
+"""
+
+import logging
+import sys
+from timeit import default_timer
+
+import mongomock
+
+from dataplaybook.helpers.typeh import TYPECHECK
+from dataplaybook.tasks.io_mongo import MongoURI, write_mongo
+
+
+def main() -> None:
+    """Time each mode."""
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("dataplaybook.tasks.io_mongo").setLevel(logging.INFO)
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    TYPECHECK.mode = "sample"
+    mdb = MongoURI("mdb://localhost/bench/col")
+    mdb.client = mongomock.MongoClient()
+
+    orig = [{"id": i, "name": f"name {i}", "value": i * 1.5} for i in range(count)]
+    table = [dict(r) for r in orig]
+    for row in table[::100]:
+        row["value"] = -1
+
+    for name, kwargs in (
+        ("replace", {}),
+        ("replace, 4 workers", {"workers": 4}),
+        ("diff", {"diff": True}),
+    ):
+        mdb.get_collection().delete_many({})  # reset
+        write_mongo(mdb=mdb, table=orig, set_id="s1", diff=True)
+        start = default_timer()
+        write_mongo(mdb=mdb, table=table, set_id="s1", **kwargs)  # type:ignore[arg-type]
+        print(f"{name:>20}: {default_timer() - start:7.2f}s for {count} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Peak memory & time of read_xml, read_xml(iterparse=True) and read_xml_rows.
+
+Run: uv run python benchmarks/bench_xml.py [rows]
+"""
+
+import sys
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from timeit import default_timer
+from typing import Any
+
+from dataplaybook import DataEnvironment
+from dataplaybook.helpers.typeh import TYPECHECK
+from dataplaybook.tasks.io_xml import read_xml, read_xml_rows
+
+
+def _write(file: Path, count: int) -> None:
+    with file.open("w", encoding="utf-8") as fil:
+        fil.write("<export>\n")
+        for i in range(count):
+            fil.write(
+                f'<item id="{i}"><name>name {i}</name><group>g{i % 100}</group></item>\n'
+            )
+        fil.write("</export>\n")
+
+
+def main() -> None:
+    """Read the file each way."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    TYPECHECK.mode = "sample"
+    with TemporaryDirectory() as tmp:
+        file = Path(tmp) / "bench.xml"
+        _write(file, count)
+        cases: tuple[tuple[str, Callable[[], Any]], ...] = (
+            (
+                "read_xml",
+                lambda: read_xml(tables=DataEnvironment(), file=str(file), targets=[]),
+            ),
+            (
+                "  iterparse",
+                lambda: read_xml(
+                    tables=DataEnvironment(),
+                    file=str(file),
+                    targets=["item"],
+                    iterparse=True,
+                ),
+            ),
+            (
+                "read_xml_rows",
+                lambda: sum(1 for _ in read_xml_rows(file=file, targets=["item"])),
+            ),
+        )
+        for name, func in cases:
+            start = default_timer()
+            tracemalloc.start()
+            func()
+            peak = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+            took = default_timer() - start
+            print(f"{name:>14}: {took:5.2f}s, peak {peak:7.1f}MB for {count} rows")
+
+
+if __name__ == "__main__":
+    main()
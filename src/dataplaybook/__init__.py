@@ -7,14 +7,17 @@ from dataplaybook.const import (
     RowData,
     Tables,
 )
+from dataplaybook.helpers.env import ColumnTable, LazyTable
 from dataplaybook.main import _ENV as ENV
 from dataplaybook.main import playbook, task
 
 PathStr = PathLike | str
 
 __all__ = [  # noqa:RUF022
+    "ColumnTable",
     "DataEnvironment",
     "ENV",
+    "LazyTable",
     "playbook",
     "RowData",
     "Tables",
@@ -1,11 +1,16 @@
 """Constants."""
 
 from __future__ import annotations
-from typing import Any
+from typing import Annotated, Any
 
 from dataplaybook.helpers.env import DataEnvironment
 
-type RowData = dict[str, Any]
+
+class ReadOnlyRows:
+    """Marks RowData, type checks also accept Record & ColumnRow rows."""
+
+
+type RowData = Annotated[dict[str, Any], ReadOnlyRows]
 type Tables = dict[str, list[RowData]] | DataEnvironment
 
 __all__ = (
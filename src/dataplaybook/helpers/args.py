@@ -15,6 +15,18 @@ class DPArg:
     all: bool = False
     v: int = 0
     """Debug verbosity."""
+    typecheck: str = "all"
+    """Default type checking mode for tasks."""
+    cache: str = "off"
+    """Task result cache mode."""
+    stats: str = ""
+    """Write task statistics to this JSON file."""
+    no_stats: bool = False
+    """Don't measure the tasks or print the task summary."""
+    profile: str = ""
+    """Profile the playbook, write pstats to this file."""
+    dry_run: bool = False
+    """Print the plan of run_steps, without running the steps."""
 
 
 def parse_args(
@@ -37,6 +49,42 @@ def parse_args(
         help=f"The playbook function name: {', '.join(playbooks)}",
     )
     parser.add_argument("-v", action="count", help="Debug level")
+    parser.add_argument(
+        "--typecheck",
+        choices=("all", "sample", "off"),
+        default="all",
+        help="Task type checking: all items, a sample of each list, or off",
+    )
+    parser.add_argument(
+        "--cache",
+        choices=("on", "off", "refresh", "clear"),
+        default="off",
+        help="Cache of @task(cache=True) results: use, bypass, rerun, or clear first",
+    )
+    parser.add_argument(
+        "--stats",
+        type=str,
+        default="",
+        metavar="FILE",
+        help="Write the time, rows & memory of each task call to a JSON file",
+    )
+    parser.add_argument(
+        "--no-stats",
+        action="store_true",
+        help="Don't measure the tasks or print the task summary",
+    )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        default="",
+        metavar="FILE",
+        help="Run the playbook under cProfile, write pstats to FILE",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the plan & critical path of run_steps, without running the steps",
+    )
 
     res = DPArg()
     args = parser.parse_args(namespace=res)
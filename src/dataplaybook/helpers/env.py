@@ -85,6 +85,196 @@ class _DataEnv(dict):
         return self[key]
 
 
+class LazyTable:
+    """A single pass table. Rows are generated when a task consumes it.
+
+    Store a generator chain in the DataEnvironment without creating a list, i.e.
+    env["rows"] = LazyTable(read_csv(file=...)). Use materialize() if the table
+    is needed more than once.
+    """
+
+    __slots__ = ("_consumed", "_iter", "_rows")
+
+    def __init__(self, rows: abc.Iterable[RowData]) -> None:
+        """Init."""
+        self._iter = iter(rows)
+        self._rows: list[RowData] | None = None
+        self._consumed = False
+
+    def __iter__(self) -> abc.Iterator[RowData]:
+        """Iterate the rows, only once unless materialized."""
+        if self._rows is not None:
+            return iter(self._rows)
+        if self._consumed:
+            raise RuntimeError("LazyTable already consumed, use materialize()")
+        self._consumed = True
+        return self._iter
+
+    def __repr__(self) -> str:
+        """Represent."""
+        if self._rows is not None:
+            return f"LazyTable(rows={len(self._rows)})"
+        return f"LazyTable(consumed={self._consumed})"
+
+    @property
+    def consumed(self) -> bool:
+        """True if the rows were consumed (and not materialized)."""
+        return self._consumed and self._rows is None
+
+    def materialize(self) -> list[RowData]:
+        """Evaluate the rows into a list, allowing multiple consumers."""
+        if self._rows is None:
+            self._rows = list(iter(self))
+        return self._rows
+
+
+class ColumnRow(abc.MutableMapping[str, Any]):
+    """A row of a ColumnTable, reads & writes the columns of the table."""
+
+    __slots__ = ("_idx", "_table")
+
+    def __init__(self, table: ColumnTable, idx: int) -> None:
+        """Init."""
+        self._table = table
+        self._idx = idx
+
+    def __getitem__(self, key: str) -> Any:
+        """Get the value in the column."""
+        return self._table.columns[key][self._idx]
+
+    def __setitem__(self, key: str, val: Any) -> None:
+        """Set the value in the column, adding the column if required."""
+        self._table.column(key, create=True)[self._idx] = val  # type:ignore[index]
+
+    def __delitem__(self, key: str) -> None:
+        """Columns are shared by all rows, keys cannot be removed."""
+        raise TypeError(
+            f"Cannot delete {key!r}, columns are shared, use row[{key!r}] = None"
+        )
+
+    def __iter__(self) -> abc.Iterator[str]:
+        """Iterate the column names."""
+        return iter(self._table.columns)
+
+    def __len__(self) -> int:
+        """Return the number of columns."""
+        return len(self._table.columns)
+
+    def __repr__(self) -> str:
+        """Represent."""
+        return repr(dict(self))
+
+
+class ColumnTable:
+    """A table stored as columns, a list of values per column.
+
+    Iterating returns ColumnRow views, no row dicts are created. Columns can be
+    lists, NumPy arrays or other sequences of the same length.
+    """
+
+    __slots__ = ("_len", "columns")
+
+    def __init__(
+        self, columns: abc.Mapping[str, abc.Sequence[Any]] | None = None
+    ) -> None:
+        """Init."""
+        self.columns: dict[str, abc.Sequence[Any]] = dict(columns or {})
+        lengths = {len(col) for col in self.columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+        self._len = lengths.pop() if lengths else 0
+
+    @classmethod
+    def from_rows(cls, rows: abc.Iterable[abc.Mapping[str, Any]]) -> ColumnTable:
+        """Convert rows to columns, missing values are None."""
+        columns: dict[str, list[Any]] = {}
+        count = 0
+        for row in rows:
+            for key, val in row.items():
+                if (col := columns.get(key)) is None:
+                    col = columns[key] = [None] * count
+                col.append(val)
+            count += 1
+            if len(row) < len(columns):
+                for col in columns.values():
+                    if len(col) < count:
+                        col.append(None)
+        return cls(columns)
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return self._len
+
+    def __iter__(self) -> abc.Iterator[ColumnRow]:
+        """Iterate the rows as views."""
+        return (ColumnRow(self, idx) for idx in range(self._len))
+
+    def __getitem__(self, idx: int) -> ColumnRow:
+        """Get a row view."""
+        if not -self._len <= idx < self._len:
+            raise IndexError(f"Row {idx} out of range")
+        return ColumnRow(self, idx % self._len)
+
+    def __repr__(self) -> str:
+        """Represent."""
+        return f"ColumnTable(rows={self._len}, columns={list(self.columns)})"
+
+    def column(self, name: str, create: bool = False) -> abc.Sequence[Any]:
+        """Get a column, None values if it does not exist."""
+        if name in self.columns:
+            return self.columns[name]
+        col = [None] * self._len
+        if create:
+            self.columns[name] = col
+        return col
+
+    def append(self, row: abc.Mapping[str, Any]) -> None:
+        """Append a row, the columns must be lists."""
+        for name in row.keys() - self.columns.keys():
+            self.column(name, create=True)
+        for name, col in self.columns.items():
+            col.append(row.get(name))  # type:ignore[attr-defined]
+        self._len += 1
+
+    def take(self, indexes: abc.Sequence[int]) -> ColumnTable:
+        """Return a table with the rows at indexes, NumPy/Arrow arrays are taken natively."""
+        return ColumnTable(
+            {
+                name: col.take(indexes)  # type:ignore[attr-defined]
+                if hasattr(col, "take")
+                else [col[idx] for idx in indexes]
+                for name, col in self.columns.items()
+            }
+        )
+
+    def rows(self) -> list[RowData]:
+        """Convert to a list of row dicts."""
+        names = list(self.columns)
+        return [
+            dict(zip(names, vals, strict=True))
+            for vals in zip(*self.columns.values(), strict=True)
+        ]
+
+    def to_numpy(self) -> dict[str, Any]:
+        """Return the columns as NumPy arrays, NumPy columns are not copied."""
+        import numpy as np  # type: ignore[import-not-found]
+
+        return {name: np.asarray(col) for name, col in self.columns.items()}
+
+    @classmethod
+    def from_arrow(cls, table: Any) -> ColumnTable:
+        """Convert a pyarrow Table, the values are converted to Python objects."""
+        return cls(
+            {name: table.column(name).to_pylist() for name in table.column_names}
+        )
+
+    def to_arrow(self) -> Any:
+        """Convert to a pyarrow Table."""
+        import pyarrow as pa  # type: ignore[import-not-found]
+
+        return pa.table({name: list(col) for name, col in self.columns.items()})
+
+
 class DataEnvironment(dict[str, list[dict[str, Any]]]):
     """DataEnvironment supports key access and variables."""
 
@@ -119,8 +309,8 @@ class DataEnvironment(dict[str, list[dict[str, Any]]]):
         """Set item."""
         if key == "var":
             raise SyntaxError("Cannot set variables directly. Use .var.")
-        if isinstance(val, list):
-            dict.__setitem__(self, key, val)
+        if isinstance(val, list | LazyTable | ColumnTable):
+            dict.__setitem__(self, key, val)  # type:ignore[assignment]
             _LOG.debug("tables[%s] = %s", key, val)
             return
         if isgenerator(val):
@@ -134,14 +324,18 @@ class DataEnvironment(dict[str, list[dict[str, Any]]]):
         res = []
         for name in table_names:
             if name in self:
-                if isinstance(self[name], list):
+                if isinstance(self[name], list | LazyTable | ColumnTable):
                     res.append(name)
                 else:
                     _LOG.warning("Table %s is not a list: %s", name, self[name])
             else:
                 _LOG.warning("Table %s does not exist", name)
         if not table_names:
-            res = [k for k, v in self.items() if isinstance(v, list)]
+            res = [
+                k
+                for k, v in self.items()
+                if isinstance(v, list | LazyTable | ColumnTable)
+            ]
         return res
 
     def as_dict(self, *table_names: str) -> dict[str, list[RowData]]:
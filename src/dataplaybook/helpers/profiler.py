@@ -0,0 +1,66 @@
+"""Profile a playbook run with cProfile."""
+
+import cProfile
+import logging
+import pstats
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+
+from dataplaybook.utils.json import PathStr
+from dataplaybook.utils.prettytable import StatSummary
+
+_LOG = logging.getLogger(__name__)
+
+
+def task_profile(stats: pstats.Stats, funcs: Mapping[str, Callable]) -> StatSummary:
+    """Time per task function, slowest first.
+
+    Functions are matched on file & name, type checked tasks are recompiled by
+    typeguard and can have a different line number.
+    """
+    by_code = {
+        (f.__code__.co_filename, f.__code__.co_name): n for n, f in funcs.items()
+    }
+    totals: dict[str, list[float]] = {}
+    for (file, _, fname), (_, ncalls, tottime, cumtime, _) in stats.stats.items():  # type:ignore[attr-defined]
+        if name := by_code.get((file, fname)):
+            tot = totals.setdefault(name, [0, 0, 0])
+            tot[0] += ncalls
+            tot[1] += tottime
+            tot[2] += cumtime
+
+    res = StatSummary(
+        stat_cols=("calls", "own_ms", "cumulative_ms"), label_cols=("task",)
+    )
+    for name, (ncalls, tottime, cumtime) in sorted(
+        totals.items(), key=lambda nt: nt[1][2], reverse=True
+    ):
+        res.add(
+            StatSummary.stats(
+                calls=int(ncalls),
+                own_ms=round(tottime * 1000),
+                cumulative_ms=round(cumtime * 1000),
+            ),
+            task=name,
+        )
+    return res
+
+
+@contextmanager
+def profile(file: PathStr, funcs: Mapping[str, Callable]) -> Iterator[None]:
+    """Profile the block, write pstats to file and print the time per task.
+
+    Open the file with ``python -m pstats``, snakeviz or flameprof.
+    Calls in generator tasks are counted for every row resumed.
+    """
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        prof.dump_stats(file)
+        _LOG.info("Profile written to %s", file)
+        task_profile(pstats.Stats(prof), funcs).print(
+            wrap_length=0, header="Task profile"
+        )
@@ -0,0 +1,96 @@
+"""Compact read-only rows, a tuple of values with the keys shared by the table."""
+
+from __future__ import annotations
+from collections import abc
+from functools import lru_cache
+from typing import Any, ClassVar
+
+
+class Record(tuple, abc.Mapping[str, Any]):
+    """A read-only row, a Mapping backed by a tuple of values.
+
+    The keys are stored once in the Schema of the table, rows use less than half
+    the memory of a dict. Use dict(row) for a mutable copy.
+    """
+
+    __slots__ = ()
+    _schema: ClassVar[Schema]
+
+    def __getitem__(self, key: str) -> Any:  # type:ignore[override]
+        """Get the value of a key."""
+        return tuple.__getitem__(self, self._schema.index[key])
+
+    def __iter__(self) -> abc.Iterator[str]:  # type:ignore[override]
+        """Iterate the keys, like a dict."""
+        return iter(self._schema.keys)
+
+    def __contains__(self, key: object) -> bool:
+        """Test if the key exists."""
+        return key in self._schema.index
+
+    def __eq__(self, other: object) -> bool:
+        """Compare as a Mapping."""
+        if isinstance(other, abc.Mapping):
+            return self._dict() == dict(other.items())
+        return NotImplemented
+
+    def __ne__(self, other: object) -> bool:
+        """Compare as a Mapping, tuple.__ne__ would compare the values."""
+        res = self.__eq__(other)
+        return res if res is NotImplemented else not res
+
+    __hash__ = None  # type:ignore[assignment]
+
+    def __repr__(self) -> str:
+        """Represent as a dict."""
+        return repr(self._dict())
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle with the keys, the Record classes are created at runtime."""
+        return (_record, (self._schema.keys, tuple(tuple.__iter__(self))))
+
+    def _dict(self) -> dict[str, Any]:
+        return dict(zip(self._schema.keys, tuple.__iter__(self), strict=True))
+
+
+class Schema:
+    """The keys of a table, shared by its records.
+
+    Schema(keys)(values) returns a Record. Schemas are created once per set of
+    keys by schema().
+    """
+
+    __slots__ = ("index", "keys", "record")
+
+    def __init__(self, keys: abc.Iterable[str]) -> None:
+        """Init."""
+        self.keys = tuple(keys)
+        self.index = {key: idx for idx, key in enumerate(self.keys)}
+        if len(self.index) != len(self.keys):
+            raise ValueError(f"Duplicate keys: {self.keys}")
+        self.record: type[Record] = type(
+            "Record", (Record,), {"__slots__": (), "_schema": self}
+        )
+
+    def __call__(self, values: abc.Iterable[Any]) -> Record:
+        """Create a record, values in the order of the keys."""
+        return self.record(values)
+
+    def __repr__(self) -> str:
+        """Represent."""
+        return f"Schema({list(self.keys)})"
+
+
+@lru_cache(maxsize=1024)
+def schema(keys: tuple[str, ...]) -> Schema:
+    """Return the shared Schema for the keys."""
+    return Schema(keys)
+
+
+def record(row: abc.Mapping[str, Any]) -> Record:
+    """Convert a row to a Record, rows with the same keys share a Schema."""
+    return schema(tuple(row))(row.values())
+
+
+def _record(keys: tuple[str, ...], values: tuple[Any, ...]) -> Record:
+    return schema(keys)(values)
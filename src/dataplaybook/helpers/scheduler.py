@@ -0,0 +1,217 @@
+"""Declarative playbook steps, run as a dependency graph."""
+
+import logging
+import sys
+from collections.abc import Callable, Generator, Sequence
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, field
+from importlib import import_module
+from typing import Any, Literal
+
+from dataplaybook.helpers.env import DataEnvironment
+from dataplaybook.utils.prettytable import StatSummary
+
+_LOG = logging.getLogger(__name__)
+
+type ExecutorMode = Literal["thread", "process"]
+
+
+@dataclass(slots=True)
+class SchedulerConfig:
+    """Run the steps of run_steps in a pool.
+
+    thread: IO-bound steps, tasks can modify tables in place
+    process: CPU-bound steps, arguments & return values are pickled
+    """
+
+    executor: ExecutorMode = "thread"
+    workers: int = 4
+    dry_run: bool = False
+    """Print the plan & critical path, without running the steps."""
+
+
+SCHEDULER = SchedulerConfig()
+"""Defaults for run_steps, dry_run is set by the --dry-run CLI option."""
+
+
+@dataclass(slots=True)
+class Step:
+    """A task call that reads & writes tables in the DataEnvironment.
+
+    Tables modified in place, or set by the task in its tables argument, should
+    be listed in writes.
+    """
+
+    task: Callable[..., Any]
+    reads: dict[str, str] = field(default_factory=dict)
+    """Task argument -> table name."""
+    writes: tuple[str, ...] | str = ()
+    """Table for the return value (a single table) or tables the task changes."""
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    """Other task arguments."""
+    cost: float = 1
+    """Estimated duration, for the critical path."""
+    name: str = ""
+
+    def __post_init__(self) -> None:
+        """Normalize writes & name the step."""
+        if isinstance(self.writes, str):
+            self.writes = (self.writes,) if self.writes else ()
+        if not self.name:
+            self.name = self.writes[0] if self.writes else self.task.__name__
+
+
+def dependencies(
+    steps: Sequence[Step], tables: DataEnvironment | None = None
+) -> list[set[int]]:
+    """Return the indexes of the steps each step waits for.
+
+    A step runs after the last step writing a table it reads, and after earlier
+    steps reading or writing a table it writes.
+    """
+    last_write: dict[str, int] = {}
+    readers: dict[str, list[int]] = {}
+    res: list[set[int]] = []
+    for idx, step in enumerate(steps):
+        deps: set[int] = set()
+        for name in step.reads.values():
+            if name in last_write:
+                deps.add(last_write[name])
+            elif tables is not None and name not in tables and name not in tables.var:
+                raise ValueError(
+                    f"Step {step.name}: table {name} is not written by an earlier step"
+                )
+        for name in step.writes:
+            deps.update(readers.get(name, ()))
+            if name in last_write:
+                deps.add(last_write[name])
+        deps.discard(idx)
+        res.append(deps)
+        for name in step.reads.values():
+            readers.setdefault(name, []).append(idx)
+        for name in step.writes:
+            last_write[name] = idx
+            readers[name] = []
+    return res
+
+
+def critical_path(steps: Sequence[Step], deps: Sequence[set[int]]) -> list[int]:
+    """Longest chain of dependent steps by cost."""
+    finish: list[float] = []
+    prev: list[int | None] = []
+    for idx, step in enumerate(steps):
+        before = max(deps[idx], key=lambda d: finish[d], default=None)
+        prev.append(before)
+        finish.append(step.cost + (0 if before is None else finish[before]))
+    if not finish:
+        return []
+    path = [max(range(len(steps)), key=lambda i: finish[i])]
+    while (before := prev[path[-1]]) is not None:
+        path.append(before)
+    return path[::-1]
+
+
+def print_plan(steps: Sequence[Step], tables: DataEnvironment | None = None) -> None:
+    """Print the steps by level, steps in a level can run concurrently."""
+    deps = dependencies(steps, tables)
+    levels: list[int] = []
+    for dep in deps:
+        levels.append(1 + max((levels[d] for d in dep), default=-1))
+    res = StatSummary(
+        stat_cols=(), label_cols=("level", "step", "task", "reads", "writes", "after")
+    )
+    for idx in sorted(range(len(steps)), key=lambda i: levels[i]):
+        step = steps[idx]
+        res.add(
+            {},
+            level=levels[idx],
+            step=step.name,
+            task=step.task.__name__,
+            reads=", ".join(sorted(set(step.reads.values()))),
+            writes=", ".join(step.writes),
+            after=", ".join(steps[d].name for d in sorted(deps[idx])),
+        )
+    res.print(wrap_length=0, header="Plan")
+    path = critical_path(steps, deps)
+    print(
+        f"Critical path: {' -> '.join(steps[i].name for i in path)} "
+        f"(cost {sum(steps[i].cost for i in path):g})",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def _call(func: Callable[..., Any], kwargs: dict[str, Any]) -> Any:
+    """Call the task, consume generators in the worker."""
+    value = func(**kwargs)
+    return list(value) if isinstance(value, Generator) else value
+
+
+def _call_by_name(module: str, name: str, kwargs: dict[str, Any]) -> Any:
+    """Call a task in a child process, tasks are not picklable."""
+    return _call(getattr(import_module(module), name), kwargs)
+
+
+def _submit(pool: Executor, step: Step, tables: DataEnvironment) -> Future:
+    kwargs = dict(step.kwargs)
+    for arg, name in step.reads.items():
+        kwargs[arg] = tables[name] if name in tables else tables.var[name]
+    if isinstance(pool, ProcessPoolExecutor):
+        return pool.submit(
+            _call_by_name, step.task.__module__, step.task.__name__, kwargs
+        )
+    return pool.submit(_call, step.task, kwargs)
+
+
+def run_steps(
+    tables: DataEnvironment,
+    steps: Sequence[Step],
+    *,
+    executor: ExecutorMode | None = None,
+    workers: int | None = None,
+    dry_run: bool | None = None,
+) -> None:
+    """Run the steps, independent steps concurrently. Defaults from SCHEDULER.
+
+    The return value of a step writing a single table is stored in tables.
+    """
+    executor = executor or SCHEDULER.executor
+    dry_run = SCHEDULER.dry_run if dry_run is None else dry_run
+    if dry_run:
+        print_plan(steps, tables)
+        return
+
+    deps = dependencies(steps, tables)
+    waiting = {idx: set(dep) for idx, dep in enumerate(deps)}
+    dependents: list[list[int]] = [[] for _ in steps]
+    for idx, dep in enumerate(deps):
+        for before in dep:
+            dependents[before].append(idx)
+
+    pool_cls = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    with pool_cls(max_workers=workers or SCHEDULER.workers) as pool:
+        running = {
+            _submit(pool, steps[idx], tables): idx
+            for idx, dep in waiting.items()
+            if not dep
+        }
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                idx = running.pop(fut)
+                step = steps[idx]
+                value = fut.result()
+                if len(step.writes) == 1 and value is not None:
+                    tables[step.writes[0]] = value
+                _LOG.debug("Step %s done", step.name)
+                for after in dependents[idx]:
+                    waiting[after].discard(idx)
+                    if not waiting[after]:
+                        running[_submit(pool, steps[after], tables)] = after
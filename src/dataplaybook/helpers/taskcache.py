@@ -0,0 +1,170 @@
+"""On-disk cache of task results, for @task(cache=True).
+
+Only TASKCACHE is used on import, the cache is off by default. The other
+imports are deferred to the first cached call.
+"""
+
+import logging
+import shutil
+import sys
+import time
+from collections import abc
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path, PurePath
+from typing import Any, Literal
+
+_LOG = logging.getLogger(__name__)
+
+type TaskCacheMode = Literal["on", "off", "refresh", "clear"]
+
+
+@dataclass(slots=True)
+class TaskCacheConfig:
+    """On-disk cache of task results.
+
+    on: return cached results when the inputs are unchanged
+    off: bypass the cache
+    refresh: always run the task, store the new results
+    clear: remove all cached results on first use, then on
+    """
+
+    mode: TaskCacheMode = "off"
+    folder: Path = field(default_factory=lambda: Path(".dataplaybook_cache"))
+    """Relative to the playbook folder."""
+    max_days: float = 30
+    """Remove results not used for max_days."""
+    max_mb: float = 500
+    """Remove the least recently used results beyond max_mb."""
+
+    _sizes: dict[Path, int] = field(default_factory=dict, repr=False)
+    """Bytes stored per folder, counted by evict and updated by stored."""
+
+    def clear(self) -> None:
+        """Remove all cached results."""
+        self._sizes.pop(self.folder, None)
+        if self.folder.is_dir():
+            _LOG.info("Clearing the task cache in %s", self.folder)
+            shutil.rmtree(self.folder)
+
+    def evict(self) -> None:
+        """Remove old results and the least recently used beyond max_mb."""
+        oldest = time.time() - self.max_days * 86400
+        files = sorted(
+            ((p, p.stat()) for p in self.folder.glob("*.pickle")),
+            key=lambda ps: ps[1].st_mtime,
+            reverse=True,
+        )
+        total = kept = 0
+        for path, stat in files:
+            total += stat.st_size
+            if stat.st_mtime < oldest or total > self.max_mb * 1024 * 1024:
+                path.unlink(missing_ok=True)
+            else:
+                kept += stat.st_size
+        self._sizes[self.folder] = kept
+
+    def stored(self, size: int) -> None:
+        """Count a stored result, evict on the first store and beyond max_mb."""
+        total = self._sizes.get(self.folder)
+        if total is not None and total + size <= self.max_mb * 1024 * 1024:
+            self._sizes[self.folder] = total + size
+            return
+        self.evict()
+
+
+TASKCACHE = TaskCacheConfig()
+"""Set by the --cache CLI option."""
+
+
+def _fingerprint_value(value: Any) -> Any:
+    """Files by path, size & modification time, other values as is."""
+    if isinstance(value, str) and (len(value) > 1024 or "\n" in value):
+        return value
+    if isinstance(value, PurePath | str) and (path := Path(value)).is_file():
+        stat = path.stat()
+        return [str(path.resolve()), stat.st_size, stat.st_mtime_ns]
+    return value
+
+
+def fingerprint(func: Callable, kwargs: dict[str, Any]) -> str | None:
+    """Fingerprint of the task code and its arguments, None if not possible.
+
+    The code includes the modification time of the task's module, so a change
+    to a helper in the same module is detected. Changes to helpers in other
+    modules are not, use --cache refresh (or clear) after changing them.
+    """
+    args = {
+        k: _fingerprint_value(v)
+        for k, v in kwargs.items()
+        if k != "tables"  # the output of tasks like read_excel
+    }
+    from hashlib import blake2b
+    from importlib.metadata import version
+
+    from dataplaybook.utils.json import orjson_hash
+
+    code = blake2b(func.__code__.co_code, digest_size=16).hexdigest()
+    module = getattr(sys.modules.get(func.__module__), "__file__", None)
+    module_stamp = _fingerprint_value(module) if module else None
+    try:
+        return orjson_hash(
+            [func.__qualname__, version("dataplaybook"), code, module_stamp, args]
+        )
+    except TypeError as err:
+        _LOG.debug("Cannot fingerprint %s: %s", func.__qualname__, err)
+        return None
+
+
+def cached_call(
+    name: str, func: Callable, call: Callable[..., Any], kwargs: dict[str, Any]
+) -> Any:
+    """Call a task, return the stored result if the fingerprint is unchanged.
+
+    Generators are stored and returned as lists. Tables the task sets in its
+    tables argument are stored and set again on a cache hit.
+    """
+    import pickle
+
+    if TASKCACHE.mode == "clear":
+        TASKCACHE.clear()
+        TASKCACHE.mode = "on"
+    fprint = fingerprint(func, kwargs)
+    if fprint is None:
+        return call(**kwargs)
+    path = TASKCACHE.folder / f"{name}-{fprint}.pickle"
+    tables = kwargs.get("tables")
+
+    if TASKCACHE.mode == "on" and path.is_file():
+        try:
+            value, new_tables = pickle.loads(path.read_bytes())
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError) as err:
+            _LOG.warning("Ignoring cached result %s: %s", path, err)
+        else:
+            _LOG.info("Task %s: cached result from %s", name, path)
+            path.touch()
+            if tables is not None:
+                for key, table in new_tables.items():
+                    tables[key] = table
+            return value
+
+    before = {k: id(v) for k, v in tables.items()} if tables is not None else {}
+    value = call(**kwargs)
+    if isinstance(value, abc.Generator):
+        value = list(value)
+    new_tables = (
+        {k: v for k, v in tables.items() if before.get(k) != id(v)}
+        if tables is not None
+        else {}
+    )
+    try:
+        raw = pickle.dumps((value, new_tables), protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError) as err:
+        _LOG.warning("Task %s: result not cached: %s", name, err)
+        return value
+    TASKCACHE.folder.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(raw)
+    tmp.replace(path)
+    TASKCACHE.stored(len(raw))
+    return value
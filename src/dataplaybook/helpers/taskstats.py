@@ -0,0 +1,185 @@
+"""Timing, row counts and memory of task calls."""
+
+from __future__ import annotations
+import sys
+from collections import abc
+from collections.abc import AsyncGenerator, AsyncIterator, Generator, Iterator
+from dataclasses import asdict, dataclass, field
+from time import perf_counter, process_time
+from typing import TYPE_CHECKING, Any
+
+from dataplaybook.helpers.env import ColumnTable, LazyTable
+
+if TYPE_CHECKING:  # imported by main, the summary & JSON imports are deferred
+    from dataplaybook.utils.json import PathStr
+    from dataplaybook.utils.prettytable import StatSummary
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type:ignore[assignment]
+
+
+def _peak_rss() -> int:
+    """Peak resident memory of the process in bytes, 0 if unknown."""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _rows(value: Any) -> int:
+    """Rows of a table: a list of rows, ColumnTable or materialized LazyTable."""
+    if isinstance(value, ColumnTable):
+        return len(value)
+    if isinstance(value, LazyTable):
+        return len(value._rows) if value._rows is not None else 0
+    if isinstance(value, list | tuple) and value and isinstance(value[0], abc.Mapping):
+        return len(value)
+    return 0
+
+
+@dataclass(slots=True)
+class TaskStat:
+    """Measurements of a single task call.
+
+    For generator tasks the time is measured while the rows are consumed and
+    includes the time of upstream generators.
+    """
+
+    name: str
+    wall: float = 0
+    cpu: float = 0
+    rows_in: int = 0
+    rows_out: int = 0
+    peak_delta: int = 0
+    """Increase of the peak memory (ru_maxrss) of the process, in bytes.
+
+    0 if the task stays below an earlier peak, not the memory the task used.
+    """
+    _rss: int = field(default=0, repr=False)
+
+
+def _consume[T](stat: TaskStat, gen: Generator[T]) -> Iterator[T]:
+    """Count the rows and time spent in the generator."""
+    try:
+        while True:
+            wall, cpu = perf_counter(), process_time()
+            try:
+                row = next(gen)
+            finally:
+                stat.wall += perf_counter() - wall
+                stat.cpu += process_time() - cpu
+            stat.rows_out += 1
+            yield row
+    except StopIteration:
+        return
+    finally:
+        gen.close()
+        stat.peak_delta = _peak_rss() - stat._rss
+
+
+async def _consume_async[T](stat: TaskStat, gen: AsyncGenerator[T]) -> AsyncIterator[T]:
+    """Count the rows and time spent in the async generator."""
+    try:
+        while True:
+            wall, cpu = perf_counter(), process_time()
+            try:
+                row = await anext(gen)
+            finally:
+                stat.wall += perf_counter() - wall
+                stat.cpu += process_time() - cpu
+            stat.rows_out += 1
+            yield row
+    except StopAsyncIteration:
+        return
+    finally:
+        await gen.aclose()
+        stat.peak_delta = _peak_rss() - stat._rss
+
+
+@dataclass(slots=True)
+class TaskStats:
+    """Measurements of all task calls, summarised after a run."""
+
+    enabled: bool = False
+    calls: list[TaskStat] = field(default_factory=list)
+
+    def start(self, name: str, kwargs: dict[str, Any]) -> TaskStat | None:
+        """Start measuring a task call."""
+        if not self.enabled:
+            return None
+        stat = TaskStat(
+            name=name,
+            rows_in=sum(map(_rows, kwargs.values())),
+            _rss=_peak_rss(),
+        )
+        self.calls.append(stat)
+        stat.wall, stat.cpu = -perf_counter(), -process_time()
+        return stat
+
+    def stop(self, stat: TaskStat | None, value: Any) -> Any:
+        """Stop measuring, generators are measured while they are consumed."""
+        if stat is None:
+            return value
+        stat.wall += perf_counter()
+        stat.cpu += process_time()
+        if isinstance(value, Generator):
+            return _consume(stat, value)
+        if isinstance(value, AsyncGenerator):
+            return _consume_async(stat, value)
+        stat.rows_out = _rows(value)
+        stat.peak_delta = _peak_rss() - stat._rss
+        return value
+
+    def summary(self) -> StatSummary:
+        """Totals per task, in the order tasks were first called."""
+        from dataplaybook.utils.prettytable import StatSummary
+
+        totals: dict[str, dict[str, float]] = {}
+        for stat in self.calls:
+            tot = totals.setdefault(stat.name, dict.fromkeys(_STAT_COLS, 0))
+            tot["calls"] += 1
+            tot["wall_ms"] += stat.wall * 1000
+            tot["cpu_ms"] += stat.cpu * 1000
+            tot["rows_in"] += stat.rows_in
+            tot["rows_out"] += stat.rows_out
+            tot["peak_delta_kb"] = max(tot["peak_delta_kb"], stat.peak_delta / 1024)
+        res = StatSummary(stat_cols=_STAT_COLS, label_cols=("task",))
+        for name, tot in totals.items():
+            res.add(
+                StatSummary.stats(**{k: round(v) for k, v in tot.items()}), task=name
+            )
+        return res
+
+    def print(self) -> None:
+        """Print the summary table."""
+        if self.calls:
+            self.summary().print(wrap_length=0, header="Task summary")
+
+    def write_json(self, file: PathStr) -> None:
+        """Write all task calls to a JSON file."""
+        from dataplaybook.utils.json import write_orjson
+
+        data = [
+            {k: v for k, v in asdict(stat).items() if not k.startswith("_")}
+            for stat in self.calls
+        ]
+        write_orjson(data=data, file=file, indent=2)
+
+    def clear(self) -> None:
+        """Remove all measurements."""
+        self.calls.clear()
+
+
+_STAT_COLS = (
+    "calls",
+    "wall_ms",
+    "cpu_ms",
+    "rows_in",
+    "rows_out",
+    "peak_delta_kb",
+)
+
+TASKSTATS = TaskStats()
+"""Enabled by the dataplaybook CLI, unless --no-stats."""
@@ -1,16 +1,100 @@
 """Type helpers."""
 
+import reprlib
 from collections.abc import Callable
+from dataclasses import dataclass
 from inspect import signature
-from typing import Any, get_type_hints
+from typing import Any, Literal, get_type_hints
 
-from typeguard import CollectionCheckStrategy, config
+from typeguard import (
+    CollectionCheckStrategy,
+    TypeCheckError,
+    TypeCheckMemo,
+    check_type,
+    check_type_internal,
+    checker_lookup_functions,
+    config,
+)
 
-from dataplaybook.const import Tables
+from dataplaybook.const import ReadOnlyRows, Tables
+from dataplaybook.helpers.env import ColumnRow
+from dataplaybook.helpers.records import Record
 
 config.collection_check_strategy = CollectionCheckStrategy.ALL_ITEMS
 
 
+def _check_row(
+    value: Any, _origin: Any, args: tuple[Any, ...], memo: TypeCheckMemo
+) -> None:
+    """Check a RowData dict, also accept the Record & ColumnRow row types."""
+    if not isinstance(value, dict | Record | ColumnRow):
+        raise TypeCheckError("is not a dict")
+    if len(args) != 2:
+        return
+    for key, val in value.items():
+        try:
+            check_type_internal(key, args[0], memo)
+            check_type_internal(val, args[1], memo)
+        except TypeCheckError as err:
+            err.append_path_element(f"value of key {key!r}")
+            raise
+
+
+def _row_lookup(origin: Any, _args: tuple[Any, ...], extras: tuple[Any, ...]) -> Any:
+    """Typeguard lookup, only RowData rows can be compact rows, not other dicts."""
+    return _check_row if origin is dict and ReadOnlyRows in extras else None
+
+
+checker_lookup_functions.insert(0, _row_lookup)
+
+type TypeCheckMode = Literal["all", "sample", "off"]
+
+
+@dataclass(slots=True)
+class TypeCheckConfig:
+    """Runtime type checking of task calls.
+
+    all: arguments, return values & yields, every item in a collection
+    sample: arguments only, the first ``sample`` items of each list
+    off: no checks
+    """
+
+    mode: TypeCheckMode = "all"
+    sample: int = 10
+
+
+TYPECHECK = TypeCheckConfig()
+"""Global default, a task can override the mode with @task(typecheck=...)."""
+
+
+def _sample_value(value: Any, size: int) -> Any:
+    """Limit lists (also tables in a dict) to the first items."""
+    if isinstance(value, list):
+        return value[:size]
+    if type(value) is dict:
+        return {k: v[:size] if isinstance(v, list) else v for k, v in value.items()}
+    return value
+
+
+def check_arguments(
+    func: Callable, /, hints: dict[str, Any], kwargs: dict[str, Any], size: int
+) -> None:
+    """Check a sample of the keyword arguments against the type hints."""
+    for name, value in kwargs.items():
+        hint = hints.get(name)
+        if hint is None:
+            continue
+        try:
+            check_type(
+                _sample_value(value, size),
+                hint,
+                collection_check_strategy=CollectionCheckStrategy.ALL_ITEMS,
+            )
+        except TypeCheckError as err:
+            err.append_path_element(f'argument "{name}" of {func.__name__}()')
+            raise
+
+
 def repr_signature(func: Callable | None, /) -> str:
     """Represent the signature."""
     if func is None:
@@ -28,9 +112,14 @@ def repr_signature(func: Callable | None, /) -> str:
     return sig
 
 
+_REPR = reprlib.Repr(maxlevel=3, maxdict=4, maxlist=4, maxtuple=4, maxset=4)
+
+
 def _repr(a: Any) -> str:
-    """Represent the argument."""
-    res = repr(a)
+    """Represent the argument, without a full repr of large tables."""
+    if isinstance(a, dict) and type(a) is not dict:
+        a = dict(a)  # reprlib only limits plain dicts
+    res = _REPR.repr(a)
     if len(res) < 50:
         return res
     return f"{res[:30]}...{res[-20:]}"
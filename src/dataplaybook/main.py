@@ -1,22 +1,40 @@
 """Dataplaybook tasks."""
 
+import asyncio
 import atexit
 import logging
 import os
 import sys
 from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
 from dataclasses import dataclass
-from functools import partial, wraps
-from inspect import Parameter, isgeneratorfunction, signature
+from functools import cached_property, partial, wraps
+from importlib import import_module
+from inspect import (
+    Parameter,
+    isasyncgenfunction,
+    isawaitable,
+    iscoroutinefunction,
+    isgeneratorfunction,
+    signature,
+)
 from pathlib import Path
-from typing import Any, Concatenate
+from typing import Any, get_type_hints, overload
 
 from icecream import colorizedStderrPrint, ic
 from typeguard import typechecked
 
-from dataplaybook.helpers.args import parse_args
+from dataplaybook.helpers.args import DPArg, parse_args
 from dataplaybook.helpers.env import DataEnvironment
-from dataplaybook.helpers.typeh import repr_call, repr_signature
+from dataplaybook.helpers.taskcache import TASKCACHE
+from dataplaybook.helpers.taskstats import TASKSTATS, TaskStat
+from dataplaybook.helpers.typeh import (
+    TYPECHECK,
+    TypeCheckMode,
+    check_arguments,
+    repr_call,
+    repr_signature,
+)
 from dataplaybook.utils import doublewrap, local_import_module
 from dataplaybook.utils.logger import setup_logger
 
@@ -25,12 +43,45 @@ _LOG = logging.getLogger(__name__)
 
 @dataclass
 class Task:
-    """Task definition."""
+    """Task definition, func is None until the module of a lazy task is imported."""
 
     name: str = ""
     module: str = ""
     func: Callable | None = None
     gen: bool = False
+    typecheck: TypeCheckMode | None = None
+    """Override the global TYPECHECK mode."""
+    cache: bool = False
+    """Cache results on disk, if enabled in TASKCACHE."""
+
+    @cached_property
+    def checked(self) -> Callable:
+        """The function instrumented by typeguard, built once."""
+        assert self.func is not None
+        return typechecked(self.func)
+
+    @cached_property
+    def hints(self) -> dict[str, Any]:
+        """Type hints of the arguments."""
+        hints = get_type_hints(self.func)
+        hints.pop("return", None)
+        return hints
+
+    def call(self, **kwargs: Any) -> Any:
+        """Call the task function with the active type checking mode."""
+        assert self.func is not None
+        mode = self.typecheck or TYPECHECK.mode
+        if mode == "all":
+            return self.checked(**kwargs)
+        if mode == "sample":
+            check_arguments(self.func, self.hints, kwargs, TYPECHECK.sample)
+        return self.func(**kwargs)
+
+    def load(self) -> "Task":
+        """Import the module of a lazy task, return the registered task."""
+        if self.func is None:
+            import_module(self.module)
+        return ALL_TASKS.get(self.name, self)
 
 
 ALL_TASKS: dict[str, Task] = {}
@@ -40,7 +91,8 @@ _ENV = DataEnvironment()
 def print_tasks() -> None:
     """Print all_tasks."""
     mods: dict = {}
-    for name, tsk in ALL_TASKS.items():
+    for name, tsk in list(ALL_TASKS.items()):
+        tsk = tsk.load()  # noqa: PLW2901
         mods.setdefault(tsk.module, []).append(f'{name} "{repr_signature(tsk.func)}"')
         mods[tsk.module].sort()
 
@@ -49,18 +101,24 @@ def print_tasks() -> None:
         colorizedStderrPrint("- " + "\n- ".join(fun))
 
 
-def _add_task(task_function: Callable) -> None:
+def _add_task(
+    task_function: Callable,
+    typecheck: TypeCheckMode | None = None,
+    cache: bool = False,
+) -> Task:
     """Add the task to ALL_TASKS."""
     newtask = Task(
         name=task_function.__name__,
         func=task_function,
         module=task_function.__module__,
-        gen=isgeneratorfunction(task_function),
+        gen=isgeneratorfunction(task_function) or isasyncgenfunction(task_function),
+        typecheck=typecheck,
+        cache=cache,
     )
     # Save the task
-    if newtask.name in ALL_TASKS:
+    if newtask.name in ALL_TASKS and ALL_TASKS[newtask.name].func is not None:
         if newtask.module == ALL_TASKS[newtask.name].module:
-            return
+            return newtask
         _LOG.warning(
             "Task %s (%s) already loaded, overwriting with %s (%s)",
             newtask.name,
@@ -69,37 +127,64 @@ def _add_task(task_function: Callable) -> None:
             newtask.module,
         )
     ALL_TASKS[newtask.name] = newtask
+    return newtask
 
 
-def _run_task[T, **P](
-    *args: Any,
-    task_function: Callable[P, T],
-    **kwargs: Any,
-) -> T:
-    _LOG.info("Calling %s", repr_call(task_function, kwargs=kwargs))
+def _start_task(task_def: Task, args: tuple, kwargs: dict[str, Any]) -> TaskStat | None:
+    assert task_def.func is not None
+    _LOG.info("Calling %s", repr_call(task_def.func, kwargs=kwargs))
 
     # Warning for explicit parameters
     if args:
         short = [str(a)[:20] for a in args]
         raise TypeError(f"Use explicit parameters, instead of {short}")
 
+    return TASKSTATS.start(task_def.name, kwargs)
+
+
+def _log_error(task_def: Task, err: Exception) -> None:
+    _LOG.error(
+        "Task %s raised %s: %s",
+        task_def.name,
+        type(err).__name__,
+        err,
+        # exc_info=err,
+    )
+
+
+def _run_task(*args: Any, task_def: Task, **kwargs: Any) -> Any:
+    assert task_def.func is not None
+    stat = _start_task(task_def, args, kwargs)
     try:
-        value = typechecked(task_function)(*args, **kwargs)
+        if task_def.cache and TASKCACHE.mode != "off":
+            from dataplaybook.helpers.taskcache import cached_call
+
+            value = cached_call(task_def.name, task_def.func, task_def.call, kwargs)
+        else:
+            value = task_def.call(**kwargs)
     except Exception as err:
-        _LOG.error(
-            "Task %s raised %s: %s",
-            task_function.__name__,
-            type(err).__name__,
-            err,
-            # exc_info=err,
-        )
+        _log_error(task_def, err)
+        raise
+
+    return TASKSTATS.stop(stat, value)
+
+
+async def _run_task_async(*args: Any, task_def: Task, **kwargs: Any) -> Any:
+    """Await an async task, async generators are called by _run_task."""
+    stat = _start_task(task_def, args, kwargs)
+    try:
+        value = await task_def.call(**kwargs)
+    except Exception as err:
+        _log_error(task_def, err)
         raise
 
-    return value
+    return TASKSTATS.stop(stat, value)
 
 
-def task[T, **P](target: Callable[P, T]) -> Callable[Concatenate[P], T]:
-    """Task wrapper."""
+def _task_wrapper[T, **P](
+    target: Callable[P, T], typecheck: TypeCheckMode | None, cache: bool
+) -> Callable[P, T]:
+    """Verify the signature, register and wrap the task."""
     sig = signature(target)
     notkw = [
         f"{k}=_" for k, p in sig.parameters.items() if p.kind != Parameter.KEYWORD_ONLY
@@ -113,8 +198,41 @@ def task[T, **P](target: Callable[P, T]) -> Callable[Concatenate[P], T]:
 
         raise TypeError(msg)
 
-    _add_task(target)
-    return wraps(target)(partial(_run_task, task_function=target))
+    is_async = iscoroutinefunction(target)
+    if cache and (is_async or isasyncgenfunction(target)):
+        raise TypeError(f"{target.__name__}: async tasks cannot be cached")
+
+    newtask = _add_task(target, typecheck=typecheck, cache=cache)
+    run: Callable[..., Any] = _run_task_async if is_async else _run_task
+    return wraps(target)(partial(run, task_def=newtask))
+
+
+@overload
+def task[T, **P](target: Callable[P, T], /) -> Callable[P, T]: ...
+
+
+@overload
+def task[T, **P](
+    *, typecheck: TypeCheckMode | None = None, cache: bool = False
+) -> Callable[[Callable[P, T]], Callable[P, T]]: ...
+
+
+def task[T, **P](
+    target: Callable[P, T] | None = None,
+    /,
+    *,
+    typecheck: TypeCheckMode | None = None,
+    cache: bool = False,
+) -> Callable[P, T] | Callable[[Callable[P, T]], Callable[P, T]]:
+    """Task wrapper.
+
+    Use as @task or @task(typecheck="off") to override the global type checking.
+    @task(cache=True) caches the results on disk, see TASKCACHE.
+    Tasks can be async functions or async generators.
+    """
+    if target is None:
+        return lambda realf: _task_wrapper(realf, typecheck, cache)
+    return _task_wrapper(target, typecheck, cache)
 
 
 _ALL_PLAYBOOKS: dict[str, Callable] = {}
@@ -128,7 +246,10 @@ def playbook(
     default: bool = False,
     run: bool = False,
 ) -> Callable:
-    """Verify parameters & execute task."""
+    """Verify parameters & execute task.
+
+    Async playbooks are run on an event loop, with asyncio.run.
+    """
     pb_name = name or target.__name__
     if default:
         mod = target.__module__
@@ -158,6 +279,46 @@ def get_default_playbook(module: str | None = None) -> str:
     return ""
 
 
+def _task_funcs() -> dict[str, Callable]:
+    """Task functions by name."""
+    return {n: t.func for n, t in ALL_TASKS.items() if t.func is not None}
+
+
+def _call_playbook(args: DPArg) -> Any:
+    """Call the playbook, async playbooks run on an event loop."""
+    ctx: AbstractContextManager = nullcontext()
+    if args.profile:
+        from dataplaybook.helpers.profiler import profile
+
+        ctx = profile(args.profile, _task_funcs())
+    with ctx:
+        retval = _ALL_PLAYBOOKS[args.playbook](_ENV)
+        if isawaitable(retval):
+            return asyncio.run(retval)  # type:ignore[arg-type]
+        return retval
+
+
+def _report(args: DPArg) -> None:
+    """Print the environment & task summary after a run."""
+    if args.v:
+        ic(_ENV)
+    TASKSTATS.print()
+    if args.stats:
+        TASKSTATS.write_json(args.stats)
+        _LOG.info("Task statistics written to %s", args.stats)
+
+
+def _configure(args: DPArg) -> None:
+    """Set the global configs from the CLI arguments."""
+    from dataplaybook.helpers.scheduler import SCHEDULER
+
+    setup_logger()
+    TYPECHECK.mode = args.typecheck  # type:ignore[assignment]
+    TASKCACHE.mode = args.cache  # type:ignore[assignment]
+    TASKSTATS.enabled = not args.no_stats
+    SCHEDULER.dry_run = args.dry_run
+
+
 def run_playbooks(dataplaybook_cmd: bool = False) -> int:
     """Execute playbooks, or prompt for one."""
     if _EXECUTED:
@@ -170,7 +331,7 @@ def run_playbooks(dataplaybook_cmd: bool = False) -> int:
         playbooks=_ALL_PLAYBOOKS.keys(),
     )
 
-    setup_logger()
+    _configure(args)
 
     if args.all:
         import dataplaybook.tasks.all  # noqa: F401
@@ -225,7 +386,7 @@ def run_playbooks(dataplaybook_cmd: bool = False) -> int:
             return -1
 
         try:
-            retval = _ALL_PLAYBOOKS[args.playbook](_ENV)
+            retval = _call_playbook(args)
         except Exception as err:
             _LOG.error(
                 "Error while running playbook '%s' - %s: %s",
@@ -235,9 +396,7 @@ def run_playbooks(dataplaybook_cmd: bool = False) -> int:
             )
             raise err
 
-        if args.v:
-            ic(_ENV)
-
+        _report(args)
         return int(retval) if retval else 0
     finally:
         os.chdir(cwd)
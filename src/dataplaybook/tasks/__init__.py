@@ -6,9 +6,9 @@ import re
 import shutil
 from collections import abc
 from collections.abc import Generator
-from typing import Any, Literal
+from typing import Any, Literal, overload
 
-from dataplaybook import RowData, Tables, task
+from dataplaybook import ColumnTable, RowData, Tables, task
 from dataplaybook.utils import ensure_list
 
 _LOG = logging.getLogger(__name__)
@@ -33,10 +33,30 @@ def build_lookup(
 
 @task
 def build_lookup_dict(
-    *, table: list[RowData], key: str | list[str], columns: list[str] | None = None
+    *,
+    table: list[RowData] | ColumnTable,
+    key: str | list[str],
+    columns: list[str] | None = None,
 ) -> dict[str | tuple, Any]:
-    """Build lookup tables {key: columns}."""
+    """Build lookup tables {key: columns}.
+
+    A str key uses "" for empty values, a tuple key "" for missing columns.
+    """
     lookup: dict[str | tuple, Any] = {}
+    if isinstance(table, ColumnTable):
+        keys = (
+            (v or "" for v in table.column(key))
+            if isinstance(key, str)
+            else zip(*(_column_or(table, k, "") for k in key), strict=True)
+        )
+        for idx, keyv in enumerate(keys):
+            if keyv and not lookup.get(keyv):
+                lookup[keyv] = (
+                    {c: table.column(c)[idx] for c in columns}
+                    if columns
+                    else table[idx]
+                )
+        return lookup
     get_key = (
         (lambda r: r.get(key) or "")
         if isinstance(key, str)
@@ -49,6 +69,13 @@ def build_lookup_dict(
     return lookup
 
 
+def _column_or(table: ColumnTable, name: str, default: Any) -> abc.Sequence[Any]:
+    """Column values, default for all rows if the column does not exist."""
+    if name in table.columns:
+        return table.columns[name]
+    return [default] * len(table)
+
+
 @task
 def combine(
     *,
@@ -107,28 +134,89 @@ def ensure_lists(
                 row[col] = ensure_list(val)
 
 
+type _Criteria = dict[str, str] | dict[str, str | list[str] | re.Pattern]
+
+
+def _match_value(crit: str | list[str] | re.Pattern, val: Any) -> bool:
+    return bool(
+        (isinstance(crit, str) and crit == val)
+        or (isinstance(crit, list) and val in crit)
+        or (isinstance(crit, re.Pattern) and crit.match(str(val)))
+    )
+
+
+def _match_columns(criteria: _Criteria, table: ColumnTable) -> list[bool]:
+    """Test each row against the criteria [OR], one column at a time.
+
+    A missing column raises KeyError, as for rows.
+    """
+    res = [False] * len(table)
+    for col, crit in criteria.items():
+        for idx, val in enumerate(table.columns[col]):
+            if not res[idx] and _match_value(crit, val):
+                res[idx] = True
+    return res
+
+
+@overload
+def filter_rows(
+    *,
+    table: ColumnTable,
+    include: dict[str, str] | None = None,
+    exclude: dict[str, str | list[str] | re.Pattern] | None = None,
+) -> ColumnTable: ...
+
+
+@overload
+def filter_rows(
+    *,
+    table: abc.Iterable[RowData],
+    include: dict[str, str] | None = None,
+    exclude: dict[str, str | list[str] | re.Pattern] | None = None,
+) -> Generator[RowData]: ...
+
+
+@overload
+def filter_rows(
+    *,
+    table: abc.Iterable[RowData] | ColumnTable,
+    include: dict[str, str] | None = None,
+    exclude: dict[str, str | list[str] | re.Pattern] | None = None,
+) -> Generator[RowData] | ColumnTable: ...
+
+
 @task
 def filter_rows(
     *,
-    table: list[RowData],
+    table: abc.Iterable[RowData] | ColumnTable,
     include: dict[str, str] | None = None,
     exclude: dict[str, str | list[str] | re.Pattern] | None = None,
+) -> Generator[RowData] | ColumnTable:
+    """Filter rows from a table.
+
+    A ColumnTable is filtered by column and returns a ColumnTable.
+    """
+    if not isinstance(table, ColumnTable):
+        return _filter_rows(table=table, include=include, exclude=exclude)
+    excl = _match_columns(exclude, table) if exclude else [False] * len(table)
+    incl = _match_columns(include, table) if include else [True] * len(table)
+    return table.take(
+        [i for i, (y, n) in enumerate(zip(incl, excl, strict=True)) if y and not n]
+    )
+
+
+@task
+def _filter_rows(
+    *,
+    table: abc.Iterable[RowData],
+    include: _Criteria | None,
+    exclude: _Criteria | None,
 ) -> Generator[RowData]:
-    """Filter rows from a table."""
+    """Yield the matching rows, a generator task so rows are type checked."""
 
-    def _match(
-        criteria: dict[str, str] | dict[str, str | list[str] | re.Pattern], row: RowData
-    ) -> bool:
+    def _match(criteria: _Criteria, row: RowData) -> bool:
         """Test if row matches criteria [OR]."""
-        for col, crit in criteria.items():
-            if (
-                (isinstance(crit, str) and crit == row[col])
-                or (isinstance(crit, list) and row[col] in crit)
-                or (isinstance(crit, re.Pattern) and crit.match(str(row[col])))
-            ):
-                return True
-
-        return False
+        return any(_match_value(crit, row[col]) for col, crit in criteria.items())
 
     for row in table:
         if include:
@@ -212,9 +300,36 @@ def replace(
                 row[col] = row[col].replace(_from, _to)
 
 
+@overload
+def unique(*, table: ColumnTable, key: str) -> ColumnTable: ...
+
+
+@overload
+def unique(*, table: abc.Iterable[RowData], key: str) -> Generator[RowData]: ...
+
+
+@overload
+def unique(
+    *, table: abc.Iterable[RowData] | ColumnTable, key: str
+) -> Generator[RowData] | ColumnTable: ...
+
+
+@task
+def unique(
+    *, table: abc.Iterable[RowData] | ColumnTable, key: str
+) -> Generator[RowData] | ColumnTable:
+    """Return rows with unique keys, a ColumnTable returns a ColumnTable."""
+    if isinstance(table, ColumnTable):
+        first: dict[Any, int] = {}
+        for idx, val in enumerate(table.column(key)):
+            first.setdefault(val, idx)
+        return table.take(list(first.values()))
+    return _unique(table=table, key=key)
+
+
 @task
-def unique(*, table: list[RowData], key: str) -> Generator[RowData]:
-    """Return rows with unique keys."""
+def _unique(*, table: abc.Iterable[RowData], key: str) -> Generator[RowData]:
+    """Yield the first row per key, a generator task so rows are type checked."""
     seen = {}
     for row in table:
         _key = row.get(key, None)
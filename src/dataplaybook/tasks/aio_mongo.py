@@ -1,20 +1,31 @@
 """Async Motor equivalents of dataplaybook's read_mongo/write_mongo tasks."""
 
 from __future__ import annotations
+import asyncio
 import logging
 from collections import abc
 from collections.abc import AsyncGenerator
+from itertools import batched
 from typing import Any
 
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
 
-_LOG = logging.getLogger(__name__)
+from dataplaybook import RowData, task
+from dataplaybook.tasks.io_mongo import (
+    _HASH,
+    SyncStats,
+    _diff_hashes,
+    _local_pipeline,
+    _sync_doc,
+    row_hash,
+)
 
-RowData = dict[str, Any]
+_LOG = logging.getLogger(__name__)
 
-_DEFAULT_READ_PROJECTION: dict[str, Any] = {"_id": 0, "_sid": 0}
+_DEFAULT_READ_PROJECTION: dict[str, Any] = {"_id": 0, "_sid": 0, _HASH: 0}
 
 
+@task
 async def read_mongo_async(
     *,
     col: AsyncIOMotorCollection,
@@ -35,11 +46,13 @@ async def read_mongo_async(
         yield dict(result)
 
 
+@task
 async def mongo_list_sids_async(*, col: AsyncIOMotorCollection) -> list[Any]:
     """Return distinct ``_sid`` values in the collection (same as ``mongo_list_sids``)."""
     return await col.distinct("_sid")
 
 
+@task
 async def write_mongo_async(
     *,
     col: AsyncIOMotorCollection,
@@ -69,6 +82,7 @@ async def write_mongo_async(
         await col.insert_many([dict(d, _sid=set_id) for d in table])
 
 
+@task
 async def delete_sids_async(
     *,
     col: AsyncIOMotorCollection,
@@ -79,41 +93,91 @@ async def delete_sids_async(
         await col.delete_many({"_sid": None if sid == "None" else sid})
 
 
+async def _local_hashes_async(
+    col: AsyncIOMotorCollection, sid: str
+) -> dict[str, list[Any]]:
+    """Hashes of a local set, a stored _hash is stale if edited in place."""
+    res: dict[str, list[Any]] = {}
+    async for doc in col.aggregate(_local_pipeline(sid)):
+        res.setdefault(row_hash(doc), []).append(doc["_id"])
+    return res
+
+
+async def _remote_hashes_async(
+    col: AsyncIOMotorCollection, sid: str
+) -> dict[str, list[Any]]:
+    """Hashes of a remote set, documents without a _hash are always stale."""
+    res: dict[str, list[Any]] = {}
+    async for doc in col.find({"_sid": sid}, {_HASH: 1}):
+        res.setdefault(doc.get(_HASH) or "", []).append(doc["_id"])
+    return res
+
+
+async def _sync_sid_async(
+    local: AsyncIOMotorCollection,
+    remote: AsyncIOMotorCollection,
+    sid: str,
+    batch_size: int,
+    stats: SyncStats,
+) -> None:
+    """Copy changed documents of a set and delete stale ones on the remote."""
+    lhash, rhash = await asyncio.gather(
+        _local_hashes_async(local, sid), _remote_hashes_async(remote, sid)
+    )
+    copy, stale = _diff_hashes(lhash, rhash)
+    if not copy and not stale:
+        return
+    stats.sids += 1
+    for batch in batched(copy, batch_size):
+        cursor = local.find({"_id": {"$in": list(batch)}}, {"_id": 0})
+        docs = [_sync_doc(d, stats) async for d in cursor]
+        await remote.insert_many(docs, ordered=False)
+    for batch in batched(stale, batch_size):
+        await remote.delete_many({"_id": {"$in": list(batch)}})
+    stats.inserted += len(copy)
+    stats.deleted += len(stale)
+    _LOG.info("Set %s: %s inserted, %s deleted", sid, len(copy), len(stale))
+
+
+@task
 async def mongo_sync_sids_async(
     *,
     mdb_local: AsyncIOMotorCollection,
     mdb_remote: AsyncIOMotorCollection,
     ignore_remote: abc.Sequence[str] | None = None,
     only_sync_sids: abc.Sequence[str] | None = None,
-) -> None:
+    batch_size: int = 1000,
+    concurrency: int = 4,
+) -> SyncStats:
     """Sync two MongoDB collections.
 
-    Only sync _sid's where the count is different.
+    Same as ``mongo_sync_sids``, with up to ``concurrency`` sets synced
+    concurrently.
     Don't delete additional SIDs from the remote if in ignore_remote.
     """
-    agg = [{"$group": {"_id": "$_sid", "count": {"$sum": 1}}}]
+    lsids, rsids = await asyncio.gather(
+        mdb_local.distinct("_sid"), mdb_remote.distinct("_sid")
+    )
+    sem = asyncio.Semaphore(concurrency)
+    stats = SyncStats()
 
-    lsc = {i["_id"]: i["count"] async for i in mdb_local.aggregate(agg)}
-    rsc = {i["_id"]: i["count"] async for i in mdb_remote.aggregate(agg)}
+    async def _sync(sid: str) -> None:
+        async with sem:
+            await _sync_sid_async(mdb_local, mdb_remote, sid, batch_size, stats)
 
-    for sid, lval in lsc.items():
-        rval = rsc.pop(sid, None)
-        if rval != lval:
-            if only_sync_sids and sid not in only_sync_sids:
-                continue
-            # counts are different - read local, write to remote
-            lcl = [row async for row in read_mongo_async(col=mdb_local, set_id=sid)]
-            await write_mongo_async(col=mdb_remote, table=lcl, set_id=sid)
+    await asyncio.gather(
+        *(_sync(sid) for sid in lsids if not only_sync_sids or sid in only_sync_sids)
+    )
 
     if only_sync_sids:
         _LOG.info("Will not remove extra remote _sids")
-        return
-
-    extra = list(set(rsc.keys()) - set(ignore_remote or []))
-    if extra:
+    elif extra := list(set(rsids) - set(lsids) - set(ignore_remote or [])):
         _LOG.info("Removing sids: %s", extra)
         await delete_sids_async(col=mdb_remote, sids=extra)
 
+    _LOG.info("Synced %s", stats)
+    return stats
+
 
 def get_remote_client(uri: str = "mongodb://localhost:27027") -> AsyncIOMotorClient:
     """Get a remote MongoDB client."""
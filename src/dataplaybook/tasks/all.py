@@ -1,13 +1,117 @@
-"""Import all available tasks."""
+"""All available tasks, task modules are imported on first use.
+
+The tasks are registered in ALL_TASKS from the names below, without importing
+openpyxl, pymongo, lxml etc. Accessing a task or helper imports its module
+(PEP 562). Modules with a missing optional dependency are not registered.
+"""
+
+from importlib import import_module
+from importlib.util import find_spec
+from typing import Any
 
 # ruff: noqa: F403
+from dataplaybook.main import ALL_TASKS, Task
 from dataplaybook.tasks import *
-from dataplaybook.tasks.fuzzy import *
-from dataplaybook.tasks.gis import *
-from dataplaybook.tasks.ietf import *
-from dataplaybook.tasks.io_mail import *
-from dataplaybook.tasks.io_misc import *
-from dataplaybook.tasks.io_mongo import *
-from dataplaybook.tasks.io_pdf import *
-from dataplaybook.tasks.io_xlsx import *
-from dataplaybook.tasks.io_xml import *
+
+TASK_MODULES: dict[str, tuple[str, ...]] = {
+    "dataplaybook.tasks.aio_mongo": (
+        "delete_sids_async",
+        "mongo_list_sids_async",
+        "mongo_sync_sids_async",
+        "read_mongo_async",
+        "write_mongo_async",
+    ),
+    "dataplaybook.tasks.fuzzy": ("fuzzy_match",),
+    "dataplaybook.tasks.gis": ("linestring",),
+    "dataplaybook.tasks.ietf": ("add_standards_column", "extract_standards_from_table"),
+    "dataplaybook.tasks.io_mail": ("mail",),
+    "dataplaybook.tasks.io_misc": (
+        "file_rotate",
+        "glob",
+        "read_csv",
+        "read_csv_chunks",
+        "read_json",
+        "read_json_stream",
+        "read_ndjson",
+        "read_tab_delim",
+        "read_text_regex",
+        "wget",
+        "write_csv",
+        "write_json",
+        "write_ndjson",
+    ),
+    "dataplaybook.tasks.io_mongo": (
+        "columns_to_list",
+        "list_to_columns",
+        "mongo_delete_sids",
+        "mongo_list_sids",
+        "mongo_sync_sids",
+        "read_mongo",
+        "write_mongo",
+    ),
+    "dataplaybook.tasks.io_pdf": ("read_pdf_files", "read_pdf_pages"),
+    "dataplaybook.tasks.io_xlsx": ("read_excel", "read_excel_columns", "write_excel"),
+    "dataplaybook.tasks.io_xml": ("read_lxml", "read_xml", "read_xml_rows"),
+}
+"""Task names per module, tested against the modules."""
+
+HELPERS: dict[str, tuple[str, ...]] = {
+    "dataplaybook.tasks.aio_mongo": ("get_remote_client",),
+    "dataplaybook.tasks.fuzzy": ("Matches",),
+    "dataplaybook.tasks.ietf": (
+        "KeyStr",
+        "STANDARDS_CACHE",
+        "Standard",
+        "StandardsCache",
+        "extract_one_standard",
+        "extract_standards",
+        "extract_standards_ordered",
+    ),
+    "dataplaybook.tasks.io_mail": ("attachment",),
+    "dataplaybook.tasks.io_misc": ("Compression",),
+    "dataplaybook.tasks.io_mongo": ("MongoURI", "SyncStats", "row_hash"),
+    "dataplaybook.tasks.io_xlsx": ("Column", "Sheet"),
+    "dataplaybook.tasks.io_xml": ("elem2dict",),
+}
+"""Classes & functions of the task modules, exported with the tasks."""
+
+OPTIONAL: dict[str, str] = {"dataplaybook.tasks.aio_mongo": "motor"}
+"""Modules that are only registered if their optional dependency is installed."""
+
+
+def _available(mod: str) -> bool:
+    """Test if the optional dependency of the module is installed."""
+    dep = OPTIONAL.get(mod)
+    return dep is None or find_spec(dep) is not None
+
+
+_MODULES = [mod for mod in TASK_MODULES if _available(mod)]
+_TASKS = {name: mod for mod in _MODULES for name in TASK_MODULES[mod]}
+_LAZY = _TASKS | {name: mod for mod in _MODULES for name in HELPERS.get(mod, ())}
+
+for _name, _mod in _TASKS.items():
+    ALL_TASKS.setdefault(_name, Task(name=_name, module=_mod))
+del _name, _mod
+
+__all__ = [  # noqa: PLE0604
+    *(
+        n
+        for n, t in ALL_TASKS.items()
+        if t.module == "dataplaybook.tasks" and not n.startswith("_")
+    ),
+    *_LAZY,
+]
+
+
+def __getattr__(name: str) -> Any:
+    """Import the module of a task on first access."""
+    mod = _LAZY.get(name)
+    if mod is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(mod), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
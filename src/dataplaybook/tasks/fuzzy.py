@@ -1,9 +1,75 @@
 """Fuzzy matching."""
 
-from fuzzywuzzy import fuzz
+import heapq
+from collections import defaultdict
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import chain
+from operator import itemgetter
+
+from Levenshtein import ratio
 
 from dataplaybook import RowData, task
 
+_LIMIT = 10
+"""Number of matches kept per value."""
+_MIN_SCORE = 20
+
+type Matches = list[tuple[int, str]]
+
+
+def _ngrams(value: str, size: int) -> set[str]:
+    """Character n-grams of a string, padded with a space on both sides."""
+    padded = f" {value} "
+    return {padded[i : i + size] for i in range(max(len(padded) - size + 1, 1))}
+
+
+@dataclass(slots=True)
+class _Matcher:
+    """Score values against names, with an n-gram index to block candidates."""
+
+    names: list[str]
+    ngram: int
+    lower: list[str] = field(init=False)
+    index: dict[str, list[int]] = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Build the n-gram index."""
+        self.lower = [n.lower() for n in self.names]
+        self.index = defaultdict(list)
+        if self.ngram:
+            for idx, name in enumerate(self.lower):
+                for gram in _ngrams(name, self.ngram):
+                    self.index[gram].append(idx)
+
+    def candidates(self, value: str) -> Iterable[int]:
+        """Indexes of the names sharing at least one n-gram with value."""
+        if not self.ngram:
+            return range(len(self.lower))
+        res: set[int] = set()
+        for gram in _ngrams(value, self.ngram):
+            res.update(self.index.get(gram, ()))
+        return sorted(res)  # same order as a full scan, for ties
+
+    def match(self, value: str) -> Matches:
+        """Best (score, name) matches above _MIN_SCORE, highest first."""
+        lval = len(value)
+        res: Matches = []
+        for idx in self.candidates(value):
+            other = self.lower[idx]
+            # ratio <= 2 * min(len) / total, skip if it cannot reach _MIN_SCORE
+            if 200 * min(lval, len(other)) <= _MIN_SCORE * (lval + len(other)):
+                continue
+            score = round(100 * ratio(value, other))  # fuzz.ratio
+            if score > _MIN_SCORE:
+                res.append((score, self.names[idx]))
+        return heapq.nlargest(_LIMIT, res, key=itemgetter(0))
+
+    def match_all(self, values: list[str]) -> list[tuple[str, Matches]]:
+        """Match a list of values."""
+        return [(val, self.match(val)) for val in values]
+
 
 @task
 def fuzzy_match(
@@ -13,32 +79,33 @@ def fuzzy_match(
     t1_column: str,
     t2_column: str,
     t1_target_column: str,
+    ngram: int = 3,
+    workers: int = 0,
 ) -> None:
     """Fuzzy matching.
 
+    Each unique t1_column value is scored (fuzz.ratio) against the unique
+    t2_column values sharing at least one character n-gram with it. ngram=0
+    scores all pairs. With workers > 1 values are matched in a process pool.
+
     https://marcobonzanini.com/2015/02/25/fuzzy-string-matching-in-python/
     """
-    t2_colname = t2_column
-    t2_names = list({str(r[t2_colname]) for r in table2 if r.get(t2_colname)})
-    t2_namesl = list(map(str.lower, t2_names))
+    t2_names = list({str(r[t2_column]) for r in table2 if r.get(t2_column)})
+    matcher = _Matcher(t2_names, ngram)
+    values = list({str(v).lower() for r in table1 if (v := r.get(t1_column))})
+
+    if workers > 1 and len(values) > workers:
+        chunks = [values[i::workers] for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            matches = dict(chain.from_iterable(pool.map(matcher.match_all, chunks)))
+    else:
+        matches = dict(matcher.match_all(values))
 
     for row in table1:
         col1 = row.get(t1_column)
         if not col1:
             continue
-        col1 = str(col1).lower()
-        # res = process.extractBests(
-        #     col1, t2_names, limit=10, scorer=fuzz.ratio)
-        # row[opt.target_column] = '' if not res else res[0][0]
-        # row[opt.target_column + '#'] = 0 if not res else res[0][1]
-        # row[opt.target_column + '_'] = str(res)
-
-        res = []
-        for col2l, col2 in zip(t2_namesl, t2_names, strict=False):
-            resf = fuzz.ratio(col1, col2l)
-            if resf > 20:
-                res.append((resf, col2))
-        res.sort(key=lambda rec: rec[0], reverse=True)
+        res = matches[str(col1).lower()]
         row[t1_target_column] = "" if not res else res[0][1]
         row[t1_target_column + "#"] = 0 if not res else res[0][0]
-        row[t1_target_column + "_"] = str(res[:10])
+        row[t1_target_column + "_"] = str(res)
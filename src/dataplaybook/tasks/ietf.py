@@ -3,8 +3,10 @@
 from __future__ import annotations
 import logging
 import re
+from collections import OrderedDict, deque
 from collections.abc import Callable, Generator
-from dataclasses import dataclass
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
 from re import Match
 from typing import Any
 
@@ -20,6 +22,8 @@ class Standard:
     rex: re.Pattern
     sub: str | None = None
     match: Callable[[Match], KeyStr] | None = None
+    literal: str = ""
+    """Lower case text contained in every match, to skip the regex."""
 
     def __post_init__(self) -> None:
         """Post init."""
@@ -31,8 +35,9 @@ class Standard:
         s = match.start()
         if self.match:
             res = self.match(match)
-            res.start = s
-            return res
+            if res.start == s:
+                return res
+            return KeyStr(res, getattr(res, "__key", None), start=s)
 
         if self.sub:
             return KeyStr(match.expand(self.sub), start=s)
@@ -72,22 +77,26 @@ def _re_mfa(match: Match) -> KeyStr:
 
 
 STANDARDS: list[Standard] = [
-    Standard(re.compile(r"(?=[^-]|^)((draft(?:-\w+)+?)(?:-\d{2})?)(?!-\w|\w)", re.I)),
     Standard(
-        re.compile(r"RFC\s*(\d{1,5})(?!\w)", re.I),
-        match=_re_rfc,
+        re.compile(r"(?=[^-]|^)((draft(?:-\w+)+?)(?:-\d{2})?)(?!-\w|\w)", re.I),
+        literal="draft",
     ),
+    Standard(re.compile(r"RFC\s*(\d{1,5})(?!\w)", re.I), match=_re_rfc, literal="rfc"),
     # IEEE 802.1ax
     Standard(
         re.compile(r"IEEE *(C?P?\d{2,5}(?:\.[0-9][0-9a-z]*){0,3})", re.I),
         sub=r"IEEE \1",
+        literal="ieee",
     ),
     # 802.1ax  (no IEEE)
-    Standard(re.compile(r"(80\d\.[0-9][0-9a-z]{0,3})", re.I), sub=r"IEEE \1"),
+    Standard(
+        re.compile(r"(80\d\.[0-9][0-9a-z]{0,3})", re.I), sub=r"IEEE \1", literal="80"
+    ),
     # IEEE 1588-2008
     Standard(
         re.compile(r"IEEE *(\d{3,4}(?:-([a-z]|\d){3,4}){1,3})\b", re.I),
         sub=r"IEEE \1",
+        literal="ieee",
     ),
     Standard(
         re.compile(
@@ -95,55 +104,67 @@ STANDARDS: list[Standard] = [
             re.I,
         ),
         sub=r"ITU-T \1",
+        literal="itu-t",
     ),
-    Standard(re.compile(r"(GR-\d+-\w+)( issue \d+)?", re.I)),
+    Standard(re.compile(r"(GR-\d+-\w+)( issue \d+)?", re.I), literal="gr-"),
     # openconfig-lldp.yang version 0.1.0
     Standard(
         re.compile(
             r"((openconfig(?:-\w+)*.yang)(?: version (\d{1,3}(?:\.\d{1,3})+))?)", re.I
         ),
         match=_re_proto,
+        literal="openconfig",
     ),
-    Standard(re.compile(r"(3GPP *(?:TS *)?\d{1,3}\.\d+)( *release \d+)?", re.I)),
-    Standard(re.compile(r"(3GPP *release *\d+)", re.I)),
+    Standard(
+        re.compile(r"(3GPP *(?:TS *)?\d{1,3}\.\d+)( *release \d+)?", re.I),
+        literal="3gpp",
+    ),
+    Standard(re.compile(r"(3GPP *release *\d+)", re.I), literal="3gpp"),
     # IEEE8021-CFM-MIB revision 200706100000Z
     # IANA-RTPROTO-MIB revision 200009260000Z
-    Standard(re.compile(r"(((?:\w+-)+mib)(?: +(revision [0-9a-z]+))?)", re.I)),
+    Standard(
+        re.compile(r"(((?:\w+-)+mib)(?: +(revision [0-9a-z]+))?)", re.I), literal="-mib"
+    ),
     # re.compile(r"(\w{2}-\w+-\d+\.\d+)"),
-    Standard(re.compile(r"(FRF\.\d+)", re.I)),
-    Standard(re.compile(r"(ANSI [a-z.0-9]{1,15})", re.I)),
+    Standard(re.compile(r"(FRF\.\d+)", re.I), literal="frf."),
+    Standard(re.compile(r"(ANSI [a-z.0-9]{1,15})", re.I), literal="ansi "),
     Standard(
         re.compile(r"((\w{3,7}\.proto)(?:\s+version\s+(\d+(?:\.\d)+))?)", re.I),
         match=_re_proto,
+        literal=".proto",
+    ),
+    Standard(
+        re.compile(r"(MFA forum (\d+(?:\.\d+)+))", re.I),
+        match=_re_mfa,
+        literal="mfa forum",
     ),
-    Standard(re.compile(r"(MFA forum (\d+(?:\.\d+)+))", re.I), match=_re_mfa),
     Standard(
         re.compile(r"((AF(?:-\w+)+\.\d+)(?:\s+version\s+(\d+\.\d+))?)", re.I),
         match=_re_af,
+        literal="af-",
     ),
-    Standard(re.compile(r"((?:BBF) [A-Za-z]{2}-\d+(?!\w))", re.I)),  # BBF TR-x
+    # BBF TR-x
+    Standard(re.compile(r"((?:BBF) [A-Za-z]{2}-\d+(?!\w))", re.I), literal="bbf "),
     Standard(
         re.compile(r"(CVE[ -]*(\d{4})[ -]*(\d{4,7}))", re.I),
         match=lambda m: KeyStr(m.expand(r"CVE-\2-\3")),
+        literal="cve",
     ),
 ]
 
 
 class KeyStr(str):
-    """Returns string with a key attribute."""
+    """Returns string with a key attribute.
+
+    Immutable, the key and start are set on creation. extract_standards shares
+    cached instances.
+    """
 
     @property
     def start(self) -> int:
         """Position of the match."""
         return getattr(self, "__start", 0)
 
-    @start.setter
-    def start(self, value: int) -> None:
-        """Set the start position."""
-        if not isinstance(value, int):
-            raise TypeError(f"Start must be an integer, not {type(value)}")
-        setattr(self, "__start", value)
-
     @property
     def key(self) -> Any:
         """Key of the string."""
@@ -159,21 +180,70 @@ class KeyStr(str):
                 raise TypeError(f"Key must be a string, not {type(key)}")
             # if len(key) > len(text):
             #     raise ValueError(f"Key[{key}] should be shorter than value[{text}]")
-            setattr(res, "__key", key)
+            object.__setattr__(res, "__key", key)
         if start:
-            setattr(res, "__start", start)
+            if not isinstance(start, int):
+                raise TypeError(f"Start must be an integer, not {type(start)}")
+            object.__setattr__(res, "__start", start)
 
         return res
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Block changes, cached instances are shared."""
+        raise AttributeError(f"KeyStr is immutable, cannot set {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        """Block changes, cached instances are shared."""
+        raise AttributeError(f"KeyStr is immutable, cannot delete {name!r}")
+
+
+@dataclass(slots=True)
+class StandardsCache:
+    """LRU cache of the unique standards per string."""
+
+    maxsize: int = 10_000
+    """Number of strings cached, 0 disables the cache."""
+    hits: int = 0
+    misses: int = 0
+    _cache: OrderedDict[str, tuple[KeyStr, ...]] = field(
+        default_factory=OrderedDict, repr=False
+    )
+
+    def __call__(self, val: str) -> tuple[KeyStr, ...]:
+        """Return the cached standards, extract on a miss."""
+        res = self._cache.get(val)
+        if res is not None:
+            self._cache.move_to_end(val)
+            self.hits += 1
+            return res
+        self.misses += 1
+        res = tuple(dict.fromkeys(_extract_standards(val)))
+        if self.maxsize > 0:
+            self._cache[val] = res
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return res
+
+    def __str__(self) -> str:
+        """As string."""
+        return f"{self.hits} hits, {self.misses} misses, {len(self._cache)} cached"
+
+    def clear(self) -> None:
+        """Clear the cache and the counters."""
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+
+STANDARDS_CACHE = StandardsCache()
+"""Used by extract_standards, set maxsize to change the size."""
 
-def extract_standards(val: str) -> Generator[KeyStr, None, None]:
-    """Ensure it is unique."""
-    match = {}
-    for itm in _extract_standards(val):
-        if itm in match:
-            continue
-        match[itm] = True
-        yield itm
+
+def extract_standards(val: str) -> tuple[KeyStr, ...]:
+    """Return the unique standards in a string, in pattern order.
+
+    Results are cached and shared, the tuple and KeyStr should not be modified.
+    """
+    return STANDARDS_CACHE(val)
 
 
 def extract_standards_ordered(val: str) -> list[KeyStr]:
@@ -188,24 +258,26 @@ def extract_one_standard(val: str) -> KeyStr | None:
 
 
 def _extract_standards(val: str) -> Generator[KeyStr, None, None]:
-    """Extract standards from a string."""
+    """Extract standards from a string.
+
+    For ASCII strings, patterns whose literal is not in the string are skipped.
+    """
+    lower = val.lower() if isinstance(val, str) and val.isascii() else None
     for rex in STANDARDS:
+        if lower is not None and rex.literal not in lower:
+            continue
         for match in rex.rex.finditer(val):
             yield rex(match)
 
 
-@task
-def extract_standards_from_table(
-    *,
+def _extract_rows(
     table: list[RowData],
+    line_offset: int,
     extract_columns: list[str],
-    include_columns: list[str] | None = None,
-    name: str = "",
-    line_offset: int = 1,
+    include_columns: list[str] | None,
+    name: str,
 ) -> Generator[RowData]:
-    """Extract all RFCs from a table, into a new table."""
-    _LOG.debug("Header start at line: %s", line_offset)
-
+    """Yield a row per standard found in the extract columns."""
     for _no, row in enumerate(table, line_offset):
         base: dict[str, Any] = {"lineno": _no}
         if name:
@@ -224,6 +296,69 @@ def extract_standards_from_table(
                     yield res
 
 
+def _extract_chunk(*args: Any) -> tuple[list[RowData], int, int]:
+    """Extract a chunk of rows in a worker process, count the cache hits & misses."""
+    hits, misses = STANDARDS_CACHE.hits, STANDARDS_CACHE.misses
+    rows = list(_extract_rows(*args))
+    return rows, STANDARDS_CACHE.hits - hits, STANDARDS_CACHE.misses - misses
+
+
+@task
+def extract_standards_from_table(
+    *,
+    table: list[RowData],
+    extract_columns: list[str],
+    include_columns: list[str] | None = None,
+    name: str = "",
+    line_offset: int = 1,
+    workers: int = 0,
+    chunk_size: int = 2000,
+) -> Generator[RowData]:
+    """Extract all RFCs from a table, into a new table.
+
+    With workers > 1, chunks of chunk_size rows are extracted in a process
+    pool, at most 2 chunks per worker are in flight. Rows are still yielded in
+    lineno order.
+    """
+    _LOG.debug("Header start at line: %s", line_offset)
+
+    if workers <= 1 or len(table) <= chunk_size:
+        yield from _extract_rows(
+            table, line_offset, extract_columns, include_columns, name
+        )
+        _LOG.info("Standards cache: %s", STANDARDS_CACHE)
+        return
+
+    hits = misses = 0
+    pending: deque[Future[tuple[list[RowData], int, int]]] = deque()
+
+    def _done() -> list[RowData]:
+        nonlocal hits, misses
+        rows, chits, cmisses = pending.popleft().result()
+        hits, misses = hits + chits, misses + cmisses
+        return rows
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for start in range(0, len(table), chunk_size):
+            if len(pending) >= workers * 2:
+                yield from _done()
+            pending.append(
+                pool.submit(
+                    _extract_chunk,
+                    table[start : start + chunk_size],
+                    line_offset + start,
+                    extract_columns,
+                    include_columns,
+                    name,
+                )
+            )
+        while pending:
+            yield from _done()
+    _LOG.info(
+        "Standards cache in %s workers: %s hits, %s misses", workers, hits, misses
+    )
+
+
 @task
 def add_standards_column(
     *, table: list[RowData], columns: list[str], rfc_col: str
@@ -234,3 +369,4 @@ def add_standards_column(
         new = list(extract_standards(str(val)))
         if new:
             row[rfc_col] = ", ".join(new)
+    _LOG.info("Standards cache: %s", STANDARDS_CACHE)
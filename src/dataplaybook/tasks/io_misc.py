@@ -1,26 +1,68 @@
 """Misc IO tasks."""
 
+import gzip
 import re
 import time
-from collections.abc import Generator
-from csv import DictReader, DictWriter
-from json import dump, load, loads
+from collections import abc, deque
+from collections.abc import Callable, Generator
+from concurrent.futures import Future, ProcessPoolExecutor
+from csv import DictReader
+from csv import reader as csv_reader
+from csv import writer as csv_writer
+from importlib import import_module
+from io import SEEK_END, StringIO
+from itertools import batched, chain, islice, pairwise, zip_longest
+from json import dump, load
 from json.decoder import JSONDecodeError
+from operator import itemgetter
 from os import getenv
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, Literal
 
+import orjson
 import requests
-from icecream import ic
 
 from dataplaybook import (
+    ColumnTable,
     DataEnvironment,
     PathStr,
     RowData,
     Tables,
     task,
 )
-from dataplaybook.utils import ensure_list
+from dataplaybook.helpers.records import Record, schema
+from dataplaybook.utils import PlaybookError, ensure_list
+from dataplaybook.utils.json import json_iter, orjson_dumpb
+
+_BUFFER = 1 << 20
+_CSV_RANGE = 4 << 20
+
+type Compression = Literal["gzip", "zstd"]
+
+_SUFFIX_COMPRESSION: dict[str, Compression] = {".gz": "gzip", ".zst": "zstd"}
+
+
+def _open(
+    file: PathStr,
+    mode: Literal["r", "w", "rb", "wb"],
+    compression: Compression | None,
+    **kwargs: Any,
+) -> IO[Any]:
+    """Open a file, compressed by the file suffix if compression is None."""
+    compression = compression or _SUFFIX_COMPRESSION.get(Path(file).suffix)
+    cmode = mode if "b" in mode else f"{mode}t"
+    if compression == "gzip":
+        return gzip.open(file, cmode, **kwargs)  # type:ignore[return-value]
+    if compression == "zstd":
+        for name in ("compression.zstd", "zstandard"):
+            try:
+                return import_module(name).open(file, cmode, **kwargs)
+            except ImportError:
+                continue
+        raise PlaybookError(
+            "zstd compression requires Python 3.14 or the zstandard package"
+        )
+    return Path(file).open(mode, buffering=_BUFFER, **kwargs)
 
 
 @task
@@ -53,10 +95,16 @@ def glob(*, patterns: list[str]) -> Generator[RowData]:
 
 @task
 def read_csv(
-    *, file: PathStr, columns: dict[str, str] | None = None
+    *, file: PathStr, columns: dict[str, str] | None = None, compact: bool = False
 ) -> Generator[RowData]:
-    """Read csv file."""
+    """Read csv file.
+
+    compact: yield read-only Records, sharing the header, instead of dicts.
+    """
     with Path(file).open("r", encoding="utf-8") as __f:
+        if compact:
+            yield from _read_csv_compact(__f, columns)  # type:ignore[misc]
+            return
         csvf = DictReader(__f)
         # header = opt.headers if 'headers' in opt else None
         for line in csvf:
@@ -73,6 +121,169 @@ def read_csv(
             # yield {k: v for k, v in zip(header, line)}
 
 
+def _read_csv_compact(
+    lines: abc.Iterable[str], columns: dict[str, str] | None
+) -> Generator[Record]:
+    """Yield Records, missing values are None (like DictReader & columns)."""
+    csvf = csv_reader(lines)
+    header = next(csvf, None)
+    if header is None:
+        return
+    if columns:
+        keys, keep = _csv_keep(header, columns)
+        rec = schema(keys)
+        for line in csvf:
+            if not line:
+                continue
+            size = len(line)
+            yield rec([line[i] if i is not None and i < size else None for i in keep])
+        return
+    rec = schema(tuple(header))
+    width = len(header)
+    for line in csvf:
+        if not line:
+            continue
+        if len(line) != width:
+            line = (line + [None] * width)[:width]  # noqa: PLW2901
+        yield rec(line)
+
+
+def _csv_keep(
+    header: list[str], columns: dict[str, str] | None
+) -> tuple[tuple[str, ...], list[int | None]]:
+    """Return the keys and the index of each in a CSV line."""
+    if not columns:
+        return tuple(header), list(range(len(header)))
+    idx = {k: i for i, k in enumerate(header)}
+    return tuple(columns), [idx.get(v) for v in columns.values()]
+
+
+@task
+def read_csv_chunks(
+    *,
+    file: PathStr,
+    columns: dict[str, str] | None = None,
+    types: abc.Mapping[str, Callable[[Any], Any]] | None = None,
+    chunk_size: int = 10_000,
+    as_columns: bool = False,
+    workers: int = 0,
+) -> Generator[list[RowData] | ColumnTable]:
+    """Read a large csv file in chunks of rows, or as ColumnTable chunks.
+
+    Lines are parsed by csv.reader from 1MB buffered reads. types converts a
+    column per chunk, e.g. {"id": int, "active": ensure_bool}; missing and empty
+    values of these columns are None and not converted.
+
+    With workers > 1 the file is split into 4MB ranges at line boundaries and
+    parsed in a process pool, at most 2 ranges per worker are in flight. The file
+    may not have line breaks in quoted values, types must be picklable. Chunks
+    are in file order, the last chunk of each range can be smaller.
+    """
+    with Path(file).open("r", encoding="utf-8", newline="") as __f:
+        header = next(csv_reader(__f), None)
+    if header is None:
+        return
+    keys, keep = _csv_keep(header, columns)
+    opts = (keys, keep, types or {}, chunk_size, as_columns)
+    if workers > 1:
+        yield from _csv_pool_chunks(file, opts, workers)
+        return
+    with Path(file).open("r", encoding="utf-8", newline="", buffering=_BUFFER) as __f:
+        lines = csv_reader(__f)
+        next(lines, None)
+        yield from _csv_chunks(lines, *opts)
+
+
+def _csv_pool_chunks(
+    file: PathStr, opts: tuple[Any, ...], workers: int
+) -> Generator[list[RowData] | ColumnTable]:
+    """Parse the ranges in a process pool, in order and with bounded memory."""
+    ranges = _csv_ranges(file, _CSV_RANGE)
+    if not ranges:
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+        pending: deque[Future[list[list[RowData] | ColumnTable]]] = deque()
+        for brange in ranges:
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+            pending.append(pool.submit(_csv_range_chunks, file, brange, opts))
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _csv_ranges(file: PathStr, size: int) -> list[tuple[int, int]]:
+    """Split the file, after the header, into byte ranges of whole lines."""
+    with Path(file).open("rb") as __f:
+        __f.readline()
+        bounds = [__f.tell()]
+        end = __f.seek(0, SEEK_END)
+        while bounds[-1] + size < end:
+            __f.seek(bounds[-1] + size)
+            __f.readline()
+            bounds.append(__f.tell())
+    bounds.append(end)
+    return [(a, b) for a, b in pairwise(bounds) if b > a]
+
+
+def _csv_range_chunks(
+    file: PathStr, brange: tuple[int, int], opts: tuple[Any, ...]
+) -> list[list[RowData] | ColumnTable]:
+    """Parse a byte range of the file, used by the worker processes."""
+    with Path(file).open("rb") as __f:
+        __f.seek(brange[0])
+        text = __f.read(brange[1] - brange[0]).decode("utf-8")
+    return list(_csv_chunks(csv_reader(StringIO(text, newline="")), *opts))
+
+
+def _csv_chunks(
+    lines: abc.Iterator[list[str]],
+    keys: tuple[str, ...],
+    keep: list[int | None],
+    types: abc.Mapping[str, Callable[[Any], Any]],
+    chunk_size: int,
+    as_columns: bool,
+) -> Generator[list[RowData] | ColumnTable]:
+    """Convert batches of lines by column, lines are used as is if possible."""
+    width = len(keys)
+    as_is = not types and not as_columns and keep == list(range(width))
+    for batch in batched(lines, chunk_size):
+        rows = [line for line in batch if line]
+        if not rows:
+            continue
+        if as_is:
+            yield _csv_dicts(keys, rows)
+            continue
+        cols = list(zip_longest(*rows))
+        nones = [None] * len(rows)
+        data: dict[str, list[Any]] = {}
+        for key, idx in zip(keys, keep, strict=True):
+            col = cols[idx] if idx is not None and idx < len(cols) else nones
+            conv = types.get(key)
+            data[key] = (
+                [None if v is None or v == "" else conv(v) for v in col]
+                if conv
+                else list(col)
+            )
+        if as_columns:
+            yield ColumnTable(data)
+        else:
+            yield [
+                dict(zip(keys, vals, strict=True))
+                for vals in zip(*data.values(), strict=True)
+            ]
+
+
+def _csv_dicts(keys: tuple[str, ...], rows: list[list[str]]) -> list[RowData]:
+    """Lines to dicts, missing values are None & extra values are dropped."""
+    res: list[RowData] = [dict(zip(keys, line)) for line in rows]  # noqa: B905
+    width = len(keys)
+    for row in res:
+        if len(row) < width:
+            for key in keys:
+                row.setdefault(key, None)
+    return res
+
+
 @task
 def read_json(*, file: PathStr) -> list[RowData]:
     """Read json from a file."""
@@ -85,17 +296,54 @@ def read_json(*, file: PathStr) -> list[RowData]:
         if err.msg != "Extra data":
             raise
     # Extra data, so try load line by line
-    res = []
-    for line in Path(file).read_text(encoding="utf-8").splitlines():
-        try:
-            if line.strip() == "":
+    return list(_ndjson_rows(file, None))
+
+
+@task
+def read_json_stream(*, file: PathStr, path: str = "") -> Generator[RowData]:
+    """Stream the rows of a large JSON array, one row in memory at a time.
+
+    path is the dotted keys of the array in nested objects, e.g. "data.rows".
+    """
+    yield from json_iter(file, path)
+
+
+@task
+def read_ndjson(
+    *, file: PathStr, compression: Compression | None = None
+) -> Generator[RowData]:
+    """Read a JSON lines file, one row per line.
+
+    Files ending in .gz or .zst are decompressed, or set compression.
+    """
+    yield from _ndjson_rows(file, compression)
+
+
+def _ndjson_rows(file: PathStr, compression: Compression | None) -> Generator[Any]:
+    """Parse line by line with orjson, skip blank lines."""
+    with _open(file, "rb", compression) as __f:
+        for lineno, line in enumerate(__f, 1):
+            if line.isspace():
                 continue
-            res.append(loads(line))
-        except Exception:
-            ic(line)
-            ic("exc2")
-            raise
-    return res
+            try:
+                yield orjson.loads(line)
+            except orjson.JSONDecodeError as err:
+                raise ValueError(f"{file} line {lineno}: {err}") from err
+
+
+@task
+def write_ndjson(
+    *,
+    table: abc.Iterable[RowData],
+    file: PathStr,
+    compression: Compression | None = None,
+) -> None:
+    """Write a JSON lines file, one row per line, the table can be a generator.
+
+    Files ending in .gz or .zst are compressed, or set compression.
+    """
+    with _open(file, "wb", compression) as __f:
+        __f.writelines(orjson_dumpb(row) + b"\n" for row in table)
 
 
 @task
@@ -106,9 +354,20 @@ def write_json(
     with Path(file).open("w", encoding="utf-8") as __f:
         if only_var:
             data = data.var if isinstance(data, DataEnvironment) else {}
+        if isinstance(data, list):
+            data = _json_rows(data)
+        else:
+            data = {k: _json_rows(v) for k, v in data.items()}
         dump(data, __f, indent="  ")
 
 
+def _json_rows(value: Any) -> Any:
+    """Convert a table of Records, json would write the tuples as arrays."""
+    if isinstance(value, list) and value and isinstance(value[0], Record):
+        return [dict(row) for row in value]
+    return value
+
+
 @task
 def read_tab_delim(*, file: PathStr, headers: list[str]) -> Generator[RowData]:
     """Read xml file."""
@@ -190,20 +449,62 @@ def wget(
 
 @task
 def write_csv(
-    *, table: list[RowData], file: PathStr, header: list[str] | None = None
+    *,
+    table: abc.Iterable[RowData] | ColumnTable,
+    file: PathStr,
+    header: list[str] | None = None,
+    header_window: int = 1,
+    extrasaction: Literal["raise", "ignore"] = "raise",
+    compression: Compression | None = None,
 ) -> None:
-    """Write a csv file."""
-    fieldnames = list(table[0].keys())
+    """Write a csv file.
+
+    The table can be a generator/LazyTable, columns are taken from the first
+    header_window rows. Keys first seen in later rows raise a ValueError, or are
+    dropped with extrasaction="ignore".
+    A ColumnTable is written by column, with all its columns.
+    Files ending in .gz or .zst are compressed, or set compression.
+    """
+    if isinstance(table, ColumnTable):
+        fieldnames = list(table.columns)
+    else:
+        rows = iter(table)
+        window = list(islice(rows, max(header_window, 1)))
+        fieldnames = list(dict.fromkeys(k for row in window for k in row))
     for hdr in reversed(header or []):
         if hdr in fieldnames:
             fieldnames.remove(hdr)
         fieldnames.insert(0, hdr)
 
-    with Path(file).open(
-        "w", encoding="utf-8-sig", errors="replace", newline=""
+    with _open(
+        file, "w", compression, encoding="utf-8-sig", errors="replace", newline=""
     ) as csvfile:
-        writer = DictWriter(csvfile, fieldnames=fieldnames)
+        if isinstance(table, ColumnTable):
+            cwriter = csv_writer(csvfile)
+            cwriter.writerow(fieldnames)
+            cwriter.writerows(zip(*map(table.column, fieldnames), strict=True))
+            return
+
+        cwriter = csv_writer(csvfile)
+        cwriter.writerow(fieldnames)
+        cwriter.writerows(_csv_values(chain(window, rows), fieldnames, extrasaction))
 
-        writer.writeheader()
-        for row in table:
-            writer.writerow(row)
+
+def _csv_values(
+    rows: abc.Iterable[RowData], fieldnames: list[str], extrasaction: str
+) -> Generator[abc.Sequence[Any]]:
+    """Row values in fieldnames order, like DictWriter with a C fast path."""
+    width = len(fieldnames)
+    get = itemgetter(*fieldnames) if width > 1 else lambda r: (r[fieldnames[0]],)
+    for row in rows:
+        if len(row) == width:
+            try:
+                yield get(row)
+                continue
+            except KeyError:
+                pass
+        if extrasaction == "raise" and (extra := row.keys() - set(fieldnames)):
+            raise ValueError(
+                f"dict contains fields not in fieldnames: {', '.join(map(repr, extra))}"
+            )
+        yield [row.get(k, "") for k in fieldnames]
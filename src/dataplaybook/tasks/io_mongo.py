@@ -3,11 +3,14 @@
 from __future__ import annotations
 import logging
 from collections import abc
-from collections.abc import Generator
+from collections.abc import Generator, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import InitVar, dataclass, field
+from itertools import batched, chain
 from typing import Any
 from urllib.parse import urlparse
 
+import bson
 from pymongo import MongoClient
 from pymongo.collection import Collection
 from pymongo.database import Database
@@ -15,11 +18,15 @@ from pymongo.errors import ServerSelectionTimeoutError
 from typing_extensions import deprecated  # In Python 3.13 it moves to warnings
 
 from dataplaybook import RowData, task
+from dataplaybook.helpers.records import record
 from dataplaybook.utils import PlaybookError
+from dataplaybook.utils.json import orjson_hash
 
 _LOG = logging.getLogger(__name__)
 
-_DEFAULT_READ_PROJECTION: dict[str, Any] = {"_id": 0, "_sid": 0}
+_HASH = "_hash"
+"""Content hash of a document, stored by write_mongo(diff=True)."""
+_DEFAULT_READ_PROJECTION: dict[str, Any] = {"_id": 0, "_sid": 0, _HASH: 0}
 
 
 def _clean_netloc(db_netloc: str) -> str:
@@ -119,12 +126,16 @@ def read_mongo(
     mdb: MongoURI,
     set_id: str | None = None,
     proj: dict[str, Any] | None = None,
+    compact: bool = False,
 ) -> Generator[RowData]:
     """Read data from a MongoDB collection.
 
     ``proj`` is passed to ``find`` as the projection. The default omits ``_id``
     and ``_sid``. Pass ``{}`` to return all fields, or any MongoDB projection
     dict you need.
+
+    With ``compact``, rows are read-only Records. Documents with the same fields
+    share one Schema.
     """
     if not set_id:
         set_id = mdb.set_id
@@ -134,44 +145,139 @@ def read_mongo(
     cursor = col.find(filtr, eff_proj if eff_proj else None)
 
     cursor.batch_size(200)
+    if compact:
+        yield from map(record, cursor)  # type:ignore[misc]
+        return
     for result in cursor:
         yield dict(result)
 
 
+def row_hash(row: RowData) -> str:
+    """Content hash of a row, ignoring the internal _id, _sid & _hash keys."""
+    return orjson_hash(
+        {k: v for k, v in row.items() if k not in ("_id", "_sid", _HASH)}
+    )
+
+
+def _insert_batches(
+    col: Collection, docs: Iterable[RowData], batch_size: int, workers: int
+) -> int:
+    """Insert unordered batches, with workers > 1 concurrently from a thread pool."""
+    count = 0
+    if workers <= 1:
+        for batch in batched(docs, batch_size):
+            col.insert_many(batch, ordered=False)
+            count += len(batch)
+        return count
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending: set[Future] = set()
+        for batch in batched(docs, batch_size):
+            if len(pending) >= workers * 2:  # limit batches in memory
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    fut.result()
+            pending.add(pool.submit(col.insert_many, batch, ordered=False))
+            count += len(batch)
+        for fut in pending:
+            fut.result()
+    return count
+
+
+def _write_diff(
+    col: Collection,
+    rows: Iterator[RowData],
+    set_id: str,
+    batch_size: int,
+    workers: int,
+) -> None:
+    """Only insert new/changed rows and delete stale documents in the set.
+
+    Existing documents are hashed again, they could be edited in place.
+    """
+    existing: dict[str, list[Any]] = {}
+    for doc in col.find({"_sid": set_id}):
+        existing.setdefault(row_hash(doc), []).append(doc["_id"])
+    stale: list[Any] = []
+    unchanged = 0
+
+    def _changed() -> Generator[RowData]:
+        nonlocal unchanged
+        for row in rows:
+            rhash = row_hash(row)
+            if ids := existing.get(rhash):
+                ids.pop()
+                unchanged += 1
+                continue
+            yield dict(row, _sid=set_id, **{_HASH: rhash})
+
+    inserted = _insert_batches(col, _changed(), batch_size, workers)
+    stale.extend(i for ids in existing.values() for i in ids)
+    for batch in batched(stale, batch_size):
+        col.delete_many({"_id": {"$in": list(batch)}})
+    _LOG.info(
+        "Set %s: %s unchanged, %s inserted, %s deleted",
+        set_id,
+        unchanged,
+        inserted,
+        len(stale),
+    )
+
+
 @task
 def write_mongo(
     *,
-    table: list[RowData],
+    table: abc.Iterable[RowData],
     mdb: MongoURI,
     set_id: str | None = None,
     force: bool = False,
+    batch_size: int = 1000,
+    workers: int = 0,
+    diff: bool = False,
 ) -> None:
-    """Write data to a MongoDB collection."""
+    """Write data to a MongoDB collection.
+
+    The table can be a generator/LazyTable, it is consumed once and inserted in
+    unordered batches of batch_size. With workers > 1 batches are inserted
+    concurrently from a thread pool.
+
+    diff only inserts new/changed rows and deletes stale documents in the set,
+    compared by a content hash. Inserted rows store it in _hash. New rows are
+    inserted before stale documents are deleted.
+    """
     if not set_id:
         set_id = mdb.set_id
+    size = len(table) if isinstance(table, abc.Sized) else "streamed"
     try:
         col = mdb.get_collection()
         if not set_id:
-            _LOG.info("Writing %s documents", len(table))
-            col.insert_many(table)
+            _LOG.info("Writing %s documents", size)
+            # copies: insert_many adds an _id, Record/ColumnRow rows can't take it
+            _insert_batches(col, map(dict, table), batch_size, workers)
             return
 
+        rows = iter(table)
+        first = next(rows, None)
         filtr = {"_sid": set_id}
         existing_count = col.count_documents(filtr)
-        if not force and existing_count > 0 and not table:
+        if not force and existing_count > 0 and first is None:
             _LOG.error(
                 "Trying to replace %s documents with an empty set", existing_count
             )
             return
+        if first is not None:
+            rows = chain((first,), rows)
+        if diff:
+            _write_diff(col, rows, set_id, batch_size, workers)
+            return
         _LOG.info(
             "Replacing %s documents matching %s, %s new",
             existing_count,
             set_id,
-            len(table),
+            size,
         )
         col.delete_many(filtr)
-        if table:
-            col.insert_many([dict(d, _sid=set_id) for d in table])
+        _insert_batches(col, (dict(d, _sid=set_id) for d in rows), batch_size, workers)
     except ServerSelectionTimeoutError as err:
         raise PlaybookError(f"Could not open connection to mdb {mdb}") from err
 
@@ -219,6 +325,87 @@ def mongo_delete_sids(*, mdb: MongoURI, sids: list[str]) -> None:
             col.delete_many({"_sid": sid})
 
 
+@dataclass(slots=True)
+class SyncStats:
+    """Documents and bytes transferred by a sync."""
+
+    sids: int = 0
+    inserted: int = 0
+    deleted: int = 0
+    nbytes: int = 0
+
+    def __str__(self) -> str:
+        """As string."""
+        return (
+            f"{self.sids} sets changed, {self.inserted} documents inserted "
+            f"({self.nbytes / 1024:.1f} kB), {self.deleted} deleted"
+        )
+
+
+def _diff_hashes(
+    local: dict[str, list[Any]], remote: dict[str, list[Any]]
+) -> tuple[list[Any], list[Any]]:
+    """Compare hash -> _ids maps, return (local _ids to copy, remote _ids to delete)."""
+    copy: list[Any] = []
+    stale: list[Any] = []
+    for rhash in local.keys() | remote.keys():
+        lids = local.get(rhash, [])
+        rids = remote.get(rhash, [])
+        copy.extend(lids[len(rids) :])
+        stale.extend(rids[len(lids) :])
+    return copy, stale
+
+
+def _sync_doc(doc: RowData, stats: SyncStats) -> RowData:
+    """Set the _hash of a document read for copying and count its size."""
+    doc[_HASH] = row_hash(doc)
+    stats.nbytes += len(bson.encode(doc))
+    return doc
+
+
+def _local_pipeline(sid: str) -> list[RowData]:
+    """Return the local hashes pipeline, the server drops the unhashed fields."""
+    return [{"$match": {"_sid": sid}}, {"$project": {"_sid": 0, _HASH: 0}}]
+
+
+def _local_hashes(col: Collection, sid: str) -> dict[str, list[Any]]:
+    """Hashes of a local set, a stored _hash is stale if edited in place."""
+    res: dict[str, list[Any]] = {}
+    for doc in col.aggregate(_local_pipeline(sid)):
+        res.setdefault(row_hash(doc), []).append(doc["_id"])
+    return res
+
+
+def _remote_hashes(col: Collection, sid: str) -> dict[str, list[Any]]:
+    """Hashes of a remote set, documents without a _hash are always stale."""
+    res: dict[str, list[Any]] = {}
+    for doc in col.find({"_sid": sid}, {_HASH: 1}):
+        res.setdefault(doc.get(_HASH) or "", []).append(doc["_id"])
+    return res
+
+
+def _sync_sid(
+    local: Collection,
+    remote: Collection,
+    sid: str,
+    batch_size: int,
+    stats: SyncStats,
+) -> None:
+    """Copy changed documents of a set and delete stale ones on the remote."""
+    copy, stale = _diff_hashes(_local_hashes(local, sid), _remote_hashes(remote, sid))
+    if not copy and not stale:
+        return
+    stats.sids += 1
+    for batch in batched(copy, batch_size):
+        docs = local.find({"_id": {"$in": list(batch)}}, {"_id": 0})
+        remote.insert_many([_sync_doc(d, stats) for d in docs], ordered=False)
+    for batch in batched(stale, batch_size):
+        remote.delete_many({"_id": {"$in": list(batch)}})
+    stats.inserted += len(copy)
+    stats.deleted += len(stale)
+    _LOG.info("Set %s: %s inserted, %s deleted", sid, len(copy), len(stale))
+
+
 @task
 def mongo_sync_sids(
     *,
@@ -226,35 +413,33 @@ def mongo_sync_sids(
     mdb_remote: MongoURI,
     ignore_remote: abc.Sequence[str] | None = None,
     only_sync_sids: abc.Sequence[str] | None = None,
-) -> None:
+    batch_size: int = 1000,
+) -> SyncStats:
     """Sync two MongoDB collections.
 
-    Only sync _sid's where the count is different.
-    Dont delete additional SIDs from th remote if in ignore_remote
+    Documents are compared with a content hash, only added/changed documents
+    are copied and stale documents deleted. Local documents are hashed on every
+    sync, remote hashes are read from _hash (stored by this sync). Remote
+    documents without a _hash are replaced.
+
+    Dont delete additional SIDs from the remote if in ignore_remote
     """
-    agg = [{"$group": {"_id": "$_sid", "count": {"$sum": 1}}}]
-    # get local
     l_db = mdb_local.get_collection()
-    lsc = {i["_id"]: i["count"] for i in l_db.aggregate(agg)}
-    # get remote
     r_db = mdb_remote.get_collection()
-    rsc = {i["_id"]: i["count"] for i in r_db.aggregate(agg)}
+    rsids = set(r_db.distinct("_sid"))
+    stats = SyncStats()
 
-    for sid, lval in lsc.items():
-        rval = rsc.pop(sid, None)
-        if rval != lval:
-            if only_sync_sids and sid not in only_sync_sids:
-                continue
-            # counts are different!
-            mdb_local.set_id = sid
-            lcl = list(read_mongo(mdb=mdb_local))
-            write_mongo(mdb=mdb_remote, table=lcl, set_id=sid)
+    for sid in l_db.distinct("_sid"):
+        rsids.discard(sid)
+        if only_sync_sids and sid not in only_sync_sids:
+            continue
+        _sync_sid(l_db, r_db, sid, batch_size, stats)
 
     if only_sync_sids:
         _LOG.info("Will not remove extra remote _sids")
-        return
-
-    extra = list(set(rsc.keys()) - set(ignore_remote or []))
-    if extra:
+    elif extra := list(rsids - set(ignore_remote or [])):
         _LOG.info("Removing sids: %s", extra)
         mongo_delete_sids(mdb=mdb_remote, sids=extra)
+
+    _LOG.info("Synced %s", stats)
+    return stats
@@ -31,7 +31,7 @@ def _myreadlines(fobj: typing.IO, newline: str) -> abc.Generator[str, None, None
         yield buf
 
 
-@task
+@task(cache=True)
 def read_pdf_pages(
     *, file: PathStr, layout: bool = True, args: list[str] | None = None
 ) -> Generator[RowData]:
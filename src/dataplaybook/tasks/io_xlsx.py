@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 import logging
-from collections.abc import Generator, Sequence
+from collections.abc import Generator, Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
+from itertools import islice, repeat
 from json import dumps
 from pathlib import Path
 from typing import Any
@@ -13,10 +15,12 @@ import openpyxl
 from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
 from openpyxl.utils import get_column_letter
 from openpyxl.utils.exceptions import IllegalCharacterError
+from openpyxl.workbook.workbook import Workbook
 from openpyxl.worksheet.worksheet import Worksheet
 from whenever import Instant
 
-from dataplaybook import PathStr, RowData, Tables, task
+from dataplaybook import ColumnTable, LazyTable, PathStr, RowData, Tables, task
+from dataplaybook.helpers.records import schema
 
 _LOG = logging.getLogger(__name__)
 
@@ -86,13 +90,20 @@ class Sheet:
         return res
 
 
-@task
+@task(cache=True)
 def read_excel(
-    *, tables: Tables, file: PathStr, sheets: list[Sheet] | None = None
+    *,
+    tables: Tables,
+    file: PathStr,
+    sheets: list[Sheet] | None = None,
+    workers: int = 0,
+    compact: bool = False,
 ) -> list[str]:
     """Read excel file using openpyxl.
 
     If no sheets are specified, all sheets are read and names returned.
+    With workers > 1, multiple sheets are read in parallel in a process pool.
+    With compact, rows are read-only Records sharing the header of the sheet.
     """
     wbk = openpyxl.load_workbook(file, read_only=True, data_only=True)
     _LOG.debug("Loaded workbook %s.", file)
@@ -102,30 +113,91 @@ def read_excel(
     if not sheets:
         sheets = []
 
+    read: Iterable[list[RowData] | None]
+    if workers > 1 and len(sheets) > 1:
+        wbk.close()
+        with ProcessPoolExecutor(max_workers=min(workers, len(sheets))) as pool:
+            read = list(
+                pool.map(_sheet_read_file, repeat(file), sheets, repeat(compact))
+            )
+    else:
+        read = (
+            _sheet_read(the_sheet, sht, compact)
+            if (the_sheet := _get_sheet(wbk, sht))
+            else None
+            for sht in sheets
+        )
+
     res: list[str] = []
 
-    for sht in sheets:
-        name = sht.source or sht.name
-        # default_sheet = *
-        the_sheet = wbk.active if name == "*" else wbk[name]
-        if not the_sheet:
+    for sht, tbl in zip(sheets, read, strict=True):
+        if tbl is None:
+            name = sht.source or sht.name
             _LOG.error("Sheet %s not found", name)
             tables[name] = []
             continue
-        tbl = _sheet_read(the_sheet, sht)
         res.append(sht.name)
         tables[sht.name] = tbl
 
     return res
 
 
-def _sheet_read(_sheet: Worksheet, shdef: Sheet) -> list[RowData]:
+@task
+def read_excel_columns(
+    *, file: PathStr, sheet: Sheet | None = None
+) -> dict[str, list[Any]]:
+    """Read a sheet into columns (a dict of lists) for bulk processing.
+
+    The default sheet is the active sheet.
+    """
+    sheet = sheet or Sheet(source="*")
+    wbk = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        the_sheet = _get_sheet(wbk, sheet)
+        if not the_sheet:
+            raise KeyError(f"Sheet {sheet.source or sheet.name} not found")
+        return _sheet_read_columns(the_sheet, sheet)
+    finally:
+        wbk.close()
+
+
+def _get_sheet(wbk: Workbook, shdef: Sheet) -> Worksheet | None:
+    """Get the source sheet, * is the default/active sheet."""
+    name = shdef.source or shdef.name
+    return wbk.active if name == "*" else wbk[name]  # type:ignore[return-value]
+
+
+def _sheet_read(
+    _sheet: Worksheet, shdef: Sheet, compact: bool = False
+) -> list[RowData]:
     """Read a sheet and return a table."""
-    res = list(_sheet_yield_rows(_sheet, shdef))
+    res = list(_sheet_yield_rows(_sheet, shdef, compact))
     _LOG.debug("Read %s rows from sheet %s", len(res), _sheet.title)
     return res
 
 
+def _sheet_read_file(
+    file: PathStr, shdef: Sheet, compact: bool = False
+) -> list[RowData] | None:
+    """Read a sheet from a file, used by the worker processes."""
+    wbk = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        the_sheet = _get_sheet(wbk, shdef)
+        return _sheet_read(the_sheet, shdef, compact) if the_sheet else None
+    finally:
+        wbk.close()
+
+
+def _sheet_read_columns(_sheet: Worksheet, shdef: Sheet) -> dict[str, list[Any]]:
+    """Read a sheet and return the columns."""
+    keys, values = _sheet_values(_sheet, shdef)
+    cols: list[list[Any]] = [[] for _ in keys]
+    for vals in values:
+        for col, val in zip(cols, vals, strict=True):
+            col.append(val)
+    return dict(zip(keys, cols, strict=True))
+
+
 def _column_map(
     columns: list[Column] | None, header_row: Sequence[str]
 ) -> Generator[tuple[int, str, Column | None], None, None]:
@@ -149,41 +221,51 @@ def _column_map(
         yield (idx, col.name, col)
 
 
-def _sheet_yield_rows(_sheet: Worksheet, shdef: Sheet) -> Generator[RowData]:
-    """Read the sheet and yield the rows."""
-    rows = _sheet.rows
-    header = shdef.header
-    try:
-        while header > 0:
-            next(rows)
-            header -= 1
-        header_row = [str(cell.value) if cell.value else "" for cell in next(rows)]
-    except StopIteration:
-        header_row = []
-    while len(header_row) > 1 and header_row[-1] is None:
-        header_row.pop()
+def _sheet_values(
+    _sheet: Worksheet, shdef: Sheet
+) -> tuple[list[str], Iterator[tuple[Any, ...]]]:
+    """Read the header, return the keys and an iterator with the row values.
+
+    Only the mapped columns are read, using values_only.
+    """
+    hrow = shdef.header + 1
+    header_row = [
+        str(val) if val else ""
+        for val in next(
+            _sheet.iter_rows(min_row=hrow, max_row=hrow, values_only=True), ()
+        )
+    ]
     _LOG.debug("Header row: %s", header_row)
 
     colmap = list(_column_map(shdef.columns, header_row))
+    if not colmap:
+        return [], iter(())
 
-    row = None
-    nocnt = 0
-    while True:
-        try:
-            row = next(rows)
-        except StopIteration:
-            return
-        record = {}
-        for idx, key, _ in colmap:
-            _cv = row[idx].value
-            record[key] = _cv.strip() if isinstance(_cv, str) else _cv
-        if record:
-            yield record
-            nocnt = 0
-        else:
-            nocnt += 1
-            if nocnt > 1000:
-                return
+    min_idx = min(idx for idx, _, _ in colmap)
+    max_idx = max(idx for idx, _, _ in colmap)
+    offsets = [idx - min_idx for idx, _, _ in colmap]
+    rows = _sheet.iter_rows(
+        min_row=hrow + 1, min_col=min_idx + 1, max_col=max_idx + 1, values_only=True
+    )
+
+    def _values() -> Iterator[tuple[Any, ...]]:
+        for row in rows:
+            vals = tuple(row[i] for i in offsets)
+            yield tuple(v.strip() if isinstance(v, str) else v for v in vals)
+
+    return [key for _, key, _ in colmap], _values()
+
+
+def _sheet_yield_rows(
+    _sheet: Worksheet, shdef: Sheet, compact: bool = False
+) -> Generator[RowData]:
+    """Read the sheet and yield the rows."""
+    keys, values = _sheet_values(_sheet, shdef)
+    if compact:
+        yield from map(schema(tuple(keys)), values)  # type:ignore[misc]
+        return
+    for vals in values:
+        yield dict(zip(keys, vals, strict=True))
 
 
 def _get_filename(filename: PathStr) -> str:
@@ -229,6 +311,83 @@ def _fmt(obj: Any) -> Any:
     return obj
 
 
+def _sheet_append_rows(
+    wsh: Worksheet, hdrk: list[str], rows: Iterable[RowData] | ColumnTable
+) -> None:
+    """Append rows to the sheet, in the order of the header."""
+    values: Iterable[Sequence[Any]] = (
+        zip(*map(rows.column, hdrk), strict=True)
+        if isinstance(rows, ColumnTable)
+        else ([row.get(h) for h in hdrk] for row in rows)
+    )
+    debugs = 4
+    for vals in values:
+        erow = [_fmt(v) for v in vals]
+        try:
+            wsh.append(erow)
+        except IllegalCharacterError:
+            newrow = [
+                ILLEGAL_CHARACTERS_RE.sub(" ", v) if isinstance(v, str) else v
+                for v in erow
+            ]
+            wsh.append(newrow)
+        except ValueError as exc:
+            debugs -= 1
+            if debugs > 0:
+                _LOG.warning("Error writing %s, hdrs: %s - %s", list(erow), hdrk, exc)
+            wsh.append(["" if v is None else str(v) for v in vals])
+    if debugs < 0:
+        _LOG.warning("Total %s errors", 2 - debugs)
+
+
+def _sheet_write_stream(
+    wsh: Worksheet,
+    rows: Iterable[RowData] | ColumnTable,
+    columns: list[Column] | None,
+    header_window: int,
+) -> None:
+    """Write a sheet in a single pass.
+
+    The header is the columns, plus any keys in the first header_window rows
+    or all the columns of a ColumnTable.
+    """
+    hdr: dict[str, int] = {}
+    for col in columns or []:
+        hdr[col.name] = 1
+        wsh.column_dimensions[get_column_letter(len(hdr))].width = col.width or 9
+
+    if isinstance(rows, ColumnTable):
+        hdr.update(dict.fromkeys(rows.columns, 1))
+        wsh.append(list(hdr))
+        _sheet_append_rows(wsh, list(hdr), rows)
+        return
+
+    it_rows = iter(rows)
+    window = list(islice(it_rows, header_window))
+    for row in window:
+        for _hdr in row.keys():
+            hdr[str(_hdr)] = 1
+    hdrk = list(hdr.keys())
+    wsh.append(hdrk)
+
+    dropped: set[str] = set()
+
+    def _check_header(rows: Iterable[RowData]) -> Generator[RowData]:
+        for row in rows:
+            if extra := set(map(str, row)) - hdr.keys() - dropped:
+                dropped.update(extra)
+                _LOG.warning(
+                    "Sheet %s: columns %s not in the first %s rows, dropped",
+                    wsh.title,
+                    sorted(extra),
+                    header_window,
+                )
+            yield row
+
+    _sheet_append_rows(wsh, hdrk, window)
+    _sheet_append_rows(wsh, hdrk, _check_header(it_rows))
+
+
 @task
 def write_excel(
     *,
@@ -237,14 +396,23 @@ def write_excel(
     include: list[str] | None = None,
     sheets: list[Sheet] | None = None,
     ensure_string: bool = False,
+    write_only: bool = False,
+    header_window: int = 1000,
 ) -> None:
-    """Write an excel file."""
+    """Write an excel file.
+
+    LazyTables are materialized, since all rows are required for the header.
+
+    write_only streams rows to the file using openpyxl's write-only mode. Tables
+    (incl. LazyTables) are consumed once, the header is taken from the sheet's
+    columns and the first header_window rows.
+    """
     if sheets:
         if not all(isinstance(s, Sheet) for s in sheets):
             raise ValueError("sheets must be a list of Sheet objects")
 
     sheets = sheets or []
-    wbk = openpyxl.Workbook()
+    wbk = openpyxl.Workbook(write_only=write_only)
 
     if not include:
         include = list(tables.keys())
@@ -253,13 +421,28 @@ def write_excel(
     sheet_lookup = {i.name: i.columns for i in sheets}
 
     # Remove default sheet
-    wbk.remove(wbk["Sheet"])
+    if not write_only:
+        wbk.remove(wbk["Sheet"])
 
     for table_name in include:
         # Skip empty tables
         if not tables[table_name]:
             continue
 
+        if write_only:
+            _sheet_write_stream(
+                wbk.create_sheet(table_name),
+                tables[table_name],
+                sheet_lookup.get(table_name),
+                header_window,
+            )
+            continue
+
+        table = tables[table_name]
+        if isinstance(table, LazyTable):
+            # The header is the union of all rows, requires two passes
+            table = table.materialize()
+
         wsh: Worksheet = wbk.create_sheet(table_name)
 
         if table_name not in tables:
@@ -277,31 +460,15 @@ def write_excel(
                 )
 
         # Ensure we get then all
-        for row in tables[table_name]:
-            for _hdr in row.keys():
-                hdr[str(_hdr)] = 1
+        if isinstance(table, ColumnTable):
+            hdr.update(dict.fromkeys(table.columns, 1))
+        else:
+            for row in table:
+                for _hdr in row.keys():
+                    hdr[str(_hdr)] = 1
         hdrk = list(hdr.keys())
         wsh.append(hdrk)
 
-        debugs = 4
-        for row in tables[table_name]:
-            erow = [_fmt(row.get(h)) for h in hdrk]
-            try:
-                wsh.append(erow)
-            except IllegalCharacterError:
-                newrow = [
-                    ILLEGAL_CHARACTERS_RE.sub(" ", v) if isinstance(v, str) else v
-                    for v in erow
-                ]
-                wsh.append(newrow)
-            except ValueError as exc:
-                debugs -= 1
-                if debugs > 0:
-                    _LOG.warning(
-                        "Error writing %s, hdrs: %s - %s", list(erow), hdrk, exc
-                    )
-                wsh.append([str(row.get(h, "")) for h in hdrk])
-        if debugs < 0:
-            _LOG.warning("Total %s errors", 2 - debugs)
+        _sheet_append_rows(wsh, hdrk, table)
 
     wbk.save(_get_filename(file))  # Write to disk
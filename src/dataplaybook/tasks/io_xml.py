@@ -2,10 +2,11 @@
 
 import logging
 from collections import defaultdict
+from collections.abc import Generator
 from typing import Any
 from xml.etree import ElementTree
 
-from dataplaybook import RowData, Tables, task
+from dataplaybook import PathStr, RowData, Tables, task
 
 try:
     from lxml.etree import QName, _Element, parse
@@ -16,12 +17,26 @@ except ImportError:
 _LOG = logging.getLogger(__name__)
 
 
-@task
-def read_xml(*, tables: Tables, file: str, targets: list[str]) -> None:
+@task(cache=True)
+def read_xml(
+    *, tables: Tables, file: str, targets: list[str], iterparse: bool = False
+) -> None:
     """Read xml file.
 
     https://stackoverflow.com/questions/1912434/how-do-i-parse-xml-in-python
+
+    With iterparse, target elements at any level are converted as they are
+    parsed, without keeping the whole document in memory.
     """
+    if iterparse:
+        for target in targets:
+            tables[target] = []
+        for key, row in _iter_targets(file, targets):
+            tables[key].append(row)
+        if empty := [t for t in targets if not tables[t]]:
+            _LOG.warning("Expected table %s", ",".join(empty))
+        return
+
     tree = ElementTree.parse(file)
     root = tree.getroot()
     dct = _etree_to_dict(root)
@@ -43,6 +58,44 @@ def read_xml(*, tables: Tables, file: str, targets: list[str]) -> None:
         _LOG.warning("Expected table %s", ",".join(_notok))
 
 
+@task
+def read_xml_rows(*, file: PathStr, targets: list[str]) -> Generator[RowData]:
+    """Stream the target elements of a large xml file as rows.
+
+    Rows are yielded as each target element closes, in the format of read_xml.
+    Text-only elements are {"#text": text}.
+    """
+    for _, row in _iter_targets(file, targets):
+        yield row if isinstance(row, dict) else {"#text": row}
+
+
+def _iter_targets(file: PathStr, targets: list[str]) -> Generator[tuple[str, Any]]:
+    """Iterparse, yield (target, row) & remove processed elements from the tree.
+
+    Targets nested in a target are part of the outer row.
+    """
+    names = set(targets)
+    stack: list[ElementTree.Element] = []
+    inside = 0
+    for event, elem in ElementTree.iterparse(file, events=("start", "end")):
+        tag = _ns(elem.tag)
+        key = tag.replace("-", "_")
+        if event == "start":
+            stack.append(elem)
+            if key in names:
+                inside += 1
+            continue
+        stack.pop()
+        if key in names:
+            inside -= 1
+            if not inside:
+                yield key, _etree_to_dict(elem)[tag]
+        if not inside:
+            elem.clear()
+            if stack:
+                stack[-1].remove(elem)
+
+
 # def _writejson(file: PathStr, dct: dict[str, typing.Any]) -> None:
 #     """Write dict to file."""
 #     with Path(file).open("w", encoding="utf-8") as __f:
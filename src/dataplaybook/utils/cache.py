@@ -1,109 +1,303 @@
 """Cache utils."""
 
-from collections.abc import Awaitable, Callable
+import asyncio
+import heapq
+import inspect
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterator
 from dataclasses import dataclass, field
 from functools import wraps
+from itertools import count
 from typing import Any, cast
 
 from whenever import Instant
 
+from dataplaybook.utils.json import orjson_hash
+
+
+def _copy[T](value: T) -> T:
+    """Shallow copy of lists & dicts, so callers cannot change the cached value."""
+    if isinstance(value, list):
+        return cast(T, list(value))
+    if isinstance(value, dict):
+        return cast(T, value.copy())
+    return value
+
+
+def _sizeof(value: Any, depth: int = 3) -> int:
+    """Approximate size in bytes, including items of containers up to depth."""
+    size = sys.getsizeof(value)
+    if depth <= 0:
+        return size
+    if isinstance(value, dict):
+        size += sum(
+            _sizeof(k, depth - 1) + _sizeof(v, depth - 1) for k, v in value.items()
+        )
+    elif isinstance(value, list | tuple | set | frozenset):
+        size += sum(_sizeof(v, depth - 1) for v in value)
+    return size
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """Cache counters."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expired: int = 0
+
+    def __str__(self) -> str:
+        """As string."""
+        return (
+            f"{self.hits} hits, {self.misses} misses, "
+            f"{self.evictions} evicted, {self.expired} expired"
+        )
+
 
 @dataclass
 class CacheDict[KT, RT]:
-    """Cache values for a certain amount of minutes."""
+    """Cache values for a certain amount of minutes.
+
+    Least recently used values are evicted beyond max_entries or max_bytes
+    (0 is unbounded). Expired values are removed from a heap ordered on the
+    expiry time.
+    """
 
     minutes: int = 10
-    _cache: dict[KT, tuple[int, RT]] = field(default_factory=dict)
-    _lasttick: int = 0
+    max_entries: int = 0
+    max_bytes: int = 0
+    stats: CacheStats = field(default_factory=CacheStats)
+    _cache: OrderedDict[KT, tuple[int, RT]] = field(default_factory=OrderedDict)
+    _expiry: list[tuple[int, int, KT]] = field(default_factory=list)
+    """Heap of (expiry, sequence, key), entries for replaced values are skipped."""
+    _seq: Iterator[int] = field(default_factory=count)
+    _sizes: dict[KT, int] = field(default_factory=dict)
+    _bytes: int = 0
+    _by_name: dict[Any, set[KT]] = field(default_factory=dict)
+    """Tuple keys by their first item, for clear()."""
+
+    def __len__(self) -> int:
+        """Return the number of values in the cache."""
+        return len(self._cache)
+
+    def _pop(self, key: KT) -> None:
+        """Remove a key."""
+        if self._cache.pop(key, None) is None:
+            return
+        self._bytes -= self._sizes.pop(key, 0)
+        if isinstance(key, tuple) and key and (keys := self._by_name.get(key[0])):
+            keys.discard(key)
+            if not keys:
+                del self._by_name[key[0]]
 
     def clear(self, *keys: KT | Callable) -> None:
         """Clear keys."""
         if not keys:
             self._cache.clear()
+            self._expiry.clear()
+            self._sizes.clear()
+            self._by_name.clear()
+            self._bytes = 0
             return
 
         find_keys = tuple(key.__qualname__ if callable(key) else key for key in keys)
-        cache_keys = list(self._cache.keys())
-
         for fk in find_keys:
-            for ck in cache_keys:
-                if ck == fk or (isinstance(ck, tuple) and ck[0] == fk):
-                    self._cache.pop(ck, None)
+            self._pop(fk)  # type:ignore[arg-type]
+            for ck in list(self._by_name.get(fk, ())):
+                self._pop(ck)
 
     def tick(self) -> None:
-        """Clean expired values, or specific entries."""
+        """Clean expired values."""
         now = Instant.now().timestamp()
-        if now < self._lasttick:
-            return
-        self._lasttick = now + 60  # once a minute at most
+        heap = self._expiry
+        while heap and heap[0][0] < now:
+            expiry, _, key = heapq.heappop(heap)
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] == expiry:
+                self._pop(key)
+                self.stats.expired += 1
+        if len(heap) > 2 * len(self._cache) + 64:  # drop replaced entries
+            self._expiry = [
+                (e, next(self._seq), k) for k, (e, _) in self._cache.items()
+            ]
+            heapq.heapify(self._expiry)
 
-        pop = [k for k, (e, _) in self._cache.items() if now > e]
-        for key in pop:
-            self._cache.pop(key)
+    def _lookup(self, key: KT) -> tuple[int, RT] | None:
+        """Get an entry and update the LRU order & stats."""
+        self.tick()
+        res = self._cache.get(key)
+        if res is None:
+            self.stats.misses += 1
+            return None
+        self._cache.move_to_end(key)
+        self.stats.hits += 1
+        return res
 
     def __getitem__(self, key: KT) -> RT:
         """Get a value from the cache."""
-        self.tick()
-        _, val = self._cache[key]
-        return val
+        res = self._lookup(key)
+        if res is None:
+            raise KeyError(key)
+        return res[1]
 
     def get(self, key: KT) -> RT | None:
         """Get."""
-        self.tick()
-        res = self._cache.get(key)
+        res = self._lookup(key)
         return res[1] if res else None
 
+    def set(self, key: KT, value: RT, minutes: int = 0) -> None:
+        """Set a value, expire after minutes (default self.minutes)."""
+        self._pop(key)
+        expiry = Instant.now().timestamp() + (minutes or self.minutes) * 60
+        self._cache[key] = expiry, value
+        heapq.heappush(self._expiry, (expiry, next(self._seq), key))
+        if isinstance(key, tuple) and key:
+            self._by_name.setdefault(key[0], set()).add(key)
+        if self.max_bytes:
+            self._sizes[key] = size = _sizeof(value)
+            self._bytes += size
+        while self._cache and (
+            (self.max_entries and len(self._cache) > self.max_entries)
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            self._pop(next(iter(self._cache)))
+            self.stats.evictions += 1
+
     def __setitem__(self, key: KT, value: RT) -> None:
         """Set a value in the cache."""
-        expiry = Instant.now().timestamp() + self.minutes * 60
-        self._cache[key] = expiry, value
+        self.set(key, value)
 
     def get_as[T](
         self,
         key: KT,
-        _cast_as: Callable[..., Awaitable[T]] | type[T],
+        _cast_as: Callable[..., Awaitable[T]] | Callable[..., T],
         *,
         minutes: int = 0,
     ) -> tuple[T | None, Callable[[T], T]]:
-        """Get a value."""
-        self.tick()
-        _, res = self._cache.get(key, (None, None))
-        retval = (
-            list(res)
-            if isinstance(res, list)
-            else res.copy()
-            if isinstance(res, dict)
-            else res
-        )
+        """Get a value, and a function to set it for minutes."""
+        entry = self._lookup(key)
+        retval = _copy(entry[1]) if entry else None
 
         def set_it(val: T) -> T:
             """Set the value."""
-            self.__setitem__(key, cast(RT, val))
+            self.set(key, cast(RT, val), minutes=minutes)
             return val
 
         return cast(T, retval), set_it
 
 
+def _cache_key(func: Callable, args: tuple, kwargs: dict[str, Any]) -> tuple | None:
+    """Cache key of a call, hash the arguments if they are not hashable.
+
+    None if the arguments are neither hashable nor JSON serializable.
+    """
+    if not args and not kwargs:
+        return (func.__qualname__,)
+    key = (func.__qualname__, args, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:
+        try:
+            return (func.__qualname__, orjson_hash([args, kwargs]))
+        except TypeError:
+            return None
+    return key
+
+
 def cache_return[RT, **P](
     minutes: int = 0,
-) -> Callable[[Callable[P, Awaitable[RT]]], Callable[P, Awaitable[RT]]]:
-    """Cache the return for x minutes."""
+) -> Callable[[Callable[P, RT]], Callable[P, RT]]:
+    """Cache the return for x minutes, per arguments.
+
+    Works for sync and async functions. Concurrent calls with the same
+    arguments share a single call (single-flight), None is not cached.
+    Arguments that can't be hashed or serialized are not cached.
+    """
+
+    def decorator(func: Callable[P, RT]) -> Callable[P, RT]:
+        if inspect.iscoroutinefunction(func):
+            return cast(Callable[P, RT], _cache_async(func, minutes))
+        inflight: dict[tuple, list[Any]] = {}  # key: [lock, threads]
+        guard = threading.Lock()
 
-    def decorator(
-        func: Callable[P, Awaitable[RT]],
-    ) -> Callable[P, Awaitable[RT]]:
         @wraps(func)
-        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> RT:
-            ckey = (func.__qualname__,)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> RT:
+            ckey = _cache_key(func, args, kwargs)
+            if ckey is None:
+                return func(*args, **kwargs)
             res, setcache = CACHE.get_as(ckey, func, minutes=minutes)
-            if res is None:
-                res = await func(*args, **kwargs)
-                setcache(res)
-            return res
+            if res is not None:
+                return res
+            with guard:
+                entry = inflight.setdefault(ckey, [threading.RLock(), 0])
+                entry[1] += 1
+            try:
+                with entry[0]:  # other threads wait, reentrant in this thread
+                    res, setcache = CACHE.get_as(ckey, func, minutes=minutes)
+                    if res is None:
+                        res = func(*args, **kwargs)
+                        if res is not None:
+                            setcache(res)
+            finally:
+                with guard:
+                    entry[1] -= 1
+                    if not entry[1]:
+                        del inflight[ckey]
+            return _copy(res)
 
         return wrapper
 
     return decorator
 
 
+def _cache_async[RT, **P](
+    func: Callable[P, Awaitable[RT]], minutes: int
+) -> Callable[P, Awaitable[RT]]:
+    """Cache an async function, awaiting calls in flight.
+
+    If the call in flight is cancelled, a waiting call takes over.
+    """
+    inflight: dict[tuple, asyncio.Future[Any]] = {}
+
+    @wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> RT:
+        ckey = _cache_key(func, args, kwargs)
+        if ckey is None:
+            return await func(*args, **kwargs)
+        while True:
+            res, setcache = CACHE.get_as(ckey, func, minutes=minutes)
+            if res is not None:
+                return res
+            if (fut := inflight.get(ckey)) is None:
+                break
+            res = await asyncio.shield(fut)
+            if res is not _RETRY:
+                return _copy(res)
+
+        inflight[ckey] = fut = asyncio.get_running_loop().create_future()
+        try:
+            res = await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            fut.set_result(_RETRY)
+            raise
+        except Exception as err:
+            fut.set_exception(err)
+            fut.exception()  # retrieved, also without waiting calls
+            raise
+        finally:
+            inflight.pop(ckey, None)
+        fut.set_result(res)
+        if res is not None:
+            setcache(res)
+        return _copy(res)
+
+    return wrapper
+
+
+_RETRY = object()
+"""Result of a cancelled call in flight, the waiting calls retry."""
+
 CACHE = CacheDict[str | tuple, Any](minutes=30)
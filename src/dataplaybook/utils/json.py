@@ -1,6 +1,13 @@
 """Fast JSON helpers using orjson."""
 
+import codecs
+import json
+import mmap
+import os
+import re
+from collections.abc import Iterator
 from datetime import datetime
+from hashlib import blake2b
 from os import PathLike
 from pathlib import Path, PurePath
 from typing import Any, Literal
@@ -28,6 +35,17 @@ def orjson_dumps(data: Any, indent: Literal[0, 2] = 0) -> str:
     return orjson_dumpb(data, indent=indent).decode(errors="replace")
 
 
+def orjson_hash(data: Any) -> str:
+    """Content hash of the object, independent of the order of dict keys."""
+    opt = (
+        orjson.OPT_PASSTHROUGH_DATETIME
+        + orjson.OPT_PASSTHROUGH_DATACLASS
+        + orjson.OPT_SORT_KEYS
+    )
+    raw = orjson.dumps(data, default=_default, option=opt)
+    return blake2b(raw, digest_size=16).hexdigest()
+
+
 def _default(obj: Any) -> Any:
     """JSON serializer for objects not serializable by default json code."""
     if isinstance(obj, PurePath):
@@ -70,3 +88,116 @@ def orjson_load(file: PathStr) -> Any:
     if not path.exists():
         raise FileNotFoundError(f"File not found: {file}")
     return orjson.loads(path.read_bytes())
+
+
+_DECODER = json.JSONDecoder()
+_WS = re.compile(r"[ \t\n\r]*")
+_SEP = re.compile(r"[ \t\n\r]*([,\]])[ \t\n\r]*")
+
+
+class _TextStream:
+    """Decoded text of a memory-mapped file, read in growing chunks."""
+
+    def __init__(self, data: mmap.mmap | bytes, chunk: int) -> None:
+        self.data = data
+        self.pos = 0
+        self.chunk = chunk
+        self.decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.buf = ""
+        self.idx = 0
+
+    @property
+    def eof(self) -> bool:
+        return self.pos >= len(self.data)
+
+    def more(self, size: int = 0) -> bool:
+        """Read the next chunk, at least size bytes. Drop the consumed text."""
+        if self.eof:
+            return False
+        end = self.pos + max(size, self.chunk)
+        text = self.decoder.decode(self.data[self.pos : end], end >= len(self.data))
+        self.pos = end
+        self.buf = self.buf[self.idx :] + text
+        self.idx = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace, return the next character or "" at the end."""
+        while True:
+            self.idx = _WS.match(self.buf, self.idx).end()  # type:ignore[union-attr]
+            if self.idx < len(self.buf) or not self.more():
+                return self.buf[self.idx : self.idx + 1]
+
+    def expect(self, chars: str) -> str:
+        """Consume the next character, one of chars."""
+        char = self.peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(f"Expecting {chars!r}", self.buf, self.idx)
+        self.idx += 1
+        return char
+
+    def separator(self) -> str:
+        """Consume the "," or "]" after an array element."""
+        match = _SEP.match(self.buf, self.idx)
+        if match and match.end() < len(self.buf):
+            self.idx = match.end()
+            return match.group(1)
+        return self.expect(",]")
+
+    def find_key(self, key: str) -> bool:
+        """Skip the values in an object up to the key."""
+        self.expect("{")
+        if self.peek() == "}":
+            return False
+        while True:
+            name = self.value()
+            self.expect(":")
+            if name == key:
+                return True
+            self.value()
+            if self.expect(",}") == "}":
+                return False
+
+    def value(self) -> Any:
+        """Decode the next value, reading more until it is complete."""
+        if self.idx >= len(self.buf) or self.buf[self.idx] in " \t\n\r":
+            self.peek()
+        while True:
+            try:
+                res, end = _DECODER.raw_decode(self.buf, self.idx)
+            except json.JSONDecodeError:
+                if not self.more(len(self.buf)):
+                    raise
+                continue
+            # A number ending near the end of the buffer (1|2, 1.|5, 1e|+5) may
+            # continue in the next chunk
+            if end + 2 < len(self.buf) or not self.more(len(self.buf)):
+                self.idx = end
+                return res
+
+
+def json_iter(file: PathStr, path: str = "", chunk: int = 1 << 20) -> Iterator[Any]:
+    """Yield the elements of a JSON array as they are parsed.
+
+    The file is memory mapped and decoded in chunks, only one element is kept in
+    memory. path is the dotted keys of the array in nested objects, e.g.
+    "data.rows", values before the array are parsed and skipped.
+    """
+    with Path(file).open("rb") as fil:
+        size = os.fstat(fil.fileno()).st_size
+        data = mmap.mmap(fil.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        try:
+            stream = _TextStream(data, chunk)
+            for key in path.split(".") if path else ():
+                if not stream.find_key(key):
+                    raise KeyError(f"{file}: {path} not found, no key {key!r}")
+            stream.expect("[")
+            if stream.peek() == "]":
+                return
+            while True:
+                yield stream.value()
+                if stream.separator() == "]":
+                    return
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
@@ -58,7 +58,7 @@ def table_data[T](
 ) -> tuple[list[str], list[list[T | None]]]:
     """Convert a list of dictionaries to a table data format."""
     if headers is None:
-        headers = list({k for v in data for k in v.keys()})
+        headers = list(dict.fromkeys(k for v in data for k in v))
     return headers, [[v.get(k) for k in headers] for v in data]
 
 
@@ -4,7 +4,8 @@ import os
 
 import pytest
 
-from dataplaybook.helpers.env import DataEnvironment, _DataEnv
+from dataplaybook.helpers.env import ColumnTable, DataEnvironment, LazyTable, _DataEnv
+from dataplaybook.tasks import filter_rows, unique
 
 
 def test_dataenvironment() -> None:
@@ -52,6 +53,34 @@ def test_dataenvironment_as() -> None:
     assert env.as_dict("t1")["t1"] == [{"a": 1}]
 
 
+def test_lazy_table() -> None:
+    """LazyTables are stored as-is and consumed once."""
+    env = DataEnvironment()
+    env["t1"] = LazyTable({"a": str(i % 3)} for i in range(10))
+    assert isinstance(env["t1"], LazyTable)
+    assert env.as_dict("t1")["t1"] is env["t1"]
+
+    env["t2"] = LazyTable(
+        unique(table=filter_rows(table=env["t1"], exclude={"a": ["0"]}), key="a")
+    )
+    assert env["t1"].consumed is False
+    assert list(env["t2"]) == [{"a": "1"}, {"a": "2"}]
+    assert env["t1"].consumed is True
+    with pytest.raises(RuntimeError):
+        list(env["t2"])
+
+
+def test_lazy_table_materialize() -> None:
+    """Materialized tables can be consumed multiple times."""
+    tbl = LazyTable({"a": i} for i in range(3))
+    rows = tbl.materialize()
+    assert rows == [{"a": 0}, {"a": 1}, {"a": 2}]
+    assert list(tbl) == rows
+    assert list(tbl) == rows
+    assert tbl.materialize() is rows
+    assert repr(tbl) == "LazyTable(rows=3)"
+
+
 def test_env() -> None:
     """Test DataEnv."""
     dataenv = DataEnvironment()
@@ -82,3 +111,43 @@ def test_dataenv() -> None:
     env._load('a: 3\nb: "4"')
     assert env.a == "3"
     assert env.b == '"4"'
+
+
+def test_column_table() -> None:
+    """Rows of a ColumnTable are views on the columns."""
+    rows = [{"a": 1, "b": "x"}, {"a": 2}, {"c": True}]
+    ctbl = ColumnTable.from_rows(rows)
+    assert ctbl.columns == {
+        "a": [1, 2, None],
+        "b": ["x", None, None],
+        "c": [None, None, True],
+    }
+    assert len(ctbl) == 3
+    assert ctbl[0] == {"a": 1, "b": "x", "c": None}
+    assert ctbl[-1]["c"] is True
+    with pytest.raises(IndexError):
+        ctbl[3]
+
+    row = ctbl[1]
+    row["b"] = "y"
+    row["d"] = 4
+    assert ctbl.columns["b"][1] == "y"
+    assert ctbl.column("d") == [None, 4, None]
+    assert ctbl.column("missing") == [None] * 3
+    assert "missing" not in ctbl.columns
+    with pytest.raises(TypeError, match="columns are shared"):
+        del row["a"]
+    with pytest.raises(TypeError, match="columns are shared"):
+        row.clear()
+
+    ctbl.append({"a": 5, "e": 6})
+    assert ctbl.rows()[-1] == {"a": 5, "b": None, "c": None, "d": None, "e": 6}
+    assert [r["a"] for r in ctbl.take([3, 0])] == [5, 1]
+
+    env = DataEnvironment()
+    env["c"] = ctbl
+    assert env["c"] is ctbl
+    assert env.as_dict() == {"c": ctbl}
+
+    with pytest.raises(ValueError, match="different lengths"):
+        ColumnTable({"a": [1], "b": []})
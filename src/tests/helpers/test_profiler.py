@@ -0,0 +1,28 @@
+"""Tests for the profiler."""
+
+import pstats
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from dataplaybook import RowData, task
+from dataplaybook.helpers.profiler import profile
+
+
+@task
+def _slow_rows(*, count: int) -> Generator[RowData]:
+    for i in range(count):
+        yield {"a": sum(range(1000)) + i}
+
+
+def test_profile(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    file = tmp_path / "run.prof"
+    with profile(file, {"_slow_rows": _slow_rows.__wrapped__}):  # type:ignore[attr-defined]
+        assert len(list(_slow_rows(count=20))) == 20
+
+    stats = pstats.Stats(str(file))
+    assert any(fname == "_slow_rows" for _, _, fname in stats.stats)  # type:ignore[attr-defined]
+    err = capsys.readouterr().err
+    assert "Task profile" in err
+    assert "_slow_rows" in err
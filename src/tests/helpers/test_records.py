@@ -0,0 +1,69 @@
+"""Tests for compact records."""
+
+import pickle
+from typing import Annotated, Any
+
+import pytest
+from typeguard import TypeCheckError, check_type
+
+from dataplaybook import RowData
+from dataplaybook.const import ReadOnlyRows
+from dataplaybook.helpers.records import Record, Schema, record, schema
+from dataplaybook.tasks import build_lookup_dict, filter_rows, unique
+from dataplaybook.utils.json import orjson_dumps
+
+
+def test_record() -> None:
+    sch = schema(("a", "b"))
+    row = sch([1, "x"])
+    assert isinstance(row, Record)
+    assert row["a"] == 1
+    assert row.get("c") is None
+    assert "b" in row
+    assert "x" not in row
+    assert list(row) == ["a", "b"]
+    assert list(row.items()) == [("a", 1), ("b", "x")]
+    assert len(row) == 2
+    assert row == {"a": 1, "b": "x"}
+    assert not row != {"a": 1, "b": "x"}
+    assert not {"a": 1, "b": "x"} != row
+    assert row != {"a": 1}
+    assert dict(row) == {"a": 1, "b": "x"}
+    assert repr(row) == "{'a': 1, 'b': 'x'}"
+
+    assert record({"a": 2, "b": "y"})._schema is sch
+    assert pickle.loads(pickle.dumps(row)) == row
+    assert orjson_dumps([row]) == '[{"a":1,"b":"x"}]'
+
+    with pytest.raises(KeyError):
+        row["c"]
+    with pytest.raises(TypeError):
+        row["a"] = 2  # type:ignore[index]
+    with pytest.raises(ValueError, match="Duplicate"):
+        Schema(("a", "a"))
+
+
+def test_record_typecheck() -> None:
+    """Records are accepted for RowData, not for other dict hints."""
+    row = record({"a": 1})
+    check_type(row, RowData)
+    check_type([row], list[RowData])
+    check_type(row, Annotated[dict[str, int], ReadOnlyRows])
+    with pytest.raises(TypeCheckError, match="value of key 'a'"):
+        check_type(row, Annotated[dict[str, str], ReadOnlyRows])
+    with pytest.raises(TypeCheckError, match="is not a dict"):
+        check_type((1,), RowData)
+    with pytest.raises(TypeCheckError, match="is not a dict"):
+        check_type(row, dict[str, Any])
+
+
+def test_record_tasks() -> None:
+    """Tasks that only read rows accept Records."""
+    sch = schema(("id", "grp"))
+    table: list[Any] = [sch((i, str(i % 2))) for i in range(4)]
+    assert list(filter_rows(table=table, include={"grp": "1"})) == [
+        {"id": 1, "grp": "1"},
+        {"id": 3, "grp": "1"},
+    ]
+    assert [r["id"] for r in unique(table=table, key="grp")] == [0, 1]
+    assert build_lookup_dict(table=table, key="grp", columns=["id"])["1"] == {"id": 1}
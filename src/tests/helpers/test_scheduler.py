@@ -0,0 +1,83 @@
+"""Tests for the step scheduler."""
+
+import time
+from collections.abc import Generator
+
+import pytest
+
+from dataplaybook import DataEnvironment, RowData, task
+from dataplaybook.helpers.scheduler import (
+    Step,
+    critical_path,
+    dependencies,
+    run_steps,
+)
+
+_SPANS: dict[str, tuple[float, float]] = {}
+"""Start & end of the _load calls in this process."""
+
+
+@task
+def _load(*, name: str, delay: float = 0) -> Generator[RowData]:
+    start = time.perf_counter()
+    time.sleep(delay)
+    _SPANS[name] = (start, time.perf_counter())
+    for idx in range(3):
+        yield {"name": name, "idx": idx}
+
+
+@task
+def _join(*, left: list[RowData], right: list[RowData]) -> list[RowData]:
+    return [*left, *right]
+
+
+@task
+def _tag(*, table: list[RowData]) -> None:
+    for row in table:
+        row["tag"] = True
+
+
+def _steps(delay: float = 0) -> list[Step]:
+    return [
+        Step(_load, writes="a", kwargs={"name": "a", "delay": delay}),
+        Step(_load, writes="b", kwargs={"name": "b", "delay": delay}, cost=3),
+        Step(_join, reads={"left": "a", "right": "b"}, writes="ab"),
+        Step(_tag, reads={"table": "a"}, writes="a", name="tag_a"),
+    ]
+
+
+def test_dependencies() -> None:
+    steps = _steps()
+    deps = dependencies(steps)
+    assert deps == [set(), set(), {0, 1}, {0, 2}]  # tag_a after join reads a
+    assert [steps[i].name for i in critical_path(steps, deps)] == ["b", "ab", "tag_a"]
+
+    with pytest.raises(ValueError, match="table x is not written"):
+        dependencies([Step(_tag, reads={"table": "x"})], DataEnvironment())
+
+
+def test_run_steps() -> None:
+    env = DataEnvironment()
+    _SPANS.clear()
+    run_steps(env, _steps(delay=0.05))
+    assert _SPANS["a"][0] < _SPANS["b"][1]  # a & b concurrently
+    assert _SPANS["b"][0] < _SPANS["a"][1]
+
+    assert [r["name"] for r in env["ab"]] == ["a"] * 3 + ["b"] * 3
+    assert all(r["tag"] for r in env["a"])
+    assert "tag" not in env["b"][0]
+
+
+def test_run_steps_process() -> None:
+    env = DataEnvironment()
+    run_steps(env, _steps()[:3], executor="process", workers=2)
+    assert len(env["ab"]) == 6
+
+
+def test_run_steps_dry_run(capsys: pytest.CaptureFixture[str]) -> None:
+    env = DataEnvironment()
+    run_steps(env, _steps(), dry_run=True)
+    assert not env.as_dict()
+    err = capsys.readouterr().err
+    assert "Plan" in err
+    assert "Critical path: b -> ab -> tag_a (cost 5)" in err
@@ -0,0 +1,114 @@
+"""Tests for the on-disk task cache."""
+
+import os
+import sys
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from dataplaybook import DataEnvironment, RowData, task
+from dataplaybook.helpers.taskcache import TASKCACHE, TaskCacheMode, fingerprint
+
+CALLS: list[str] = []
+
+
+@task(cache=True)
+def _read_lines(*, file: Path) -> Generator[RowData]:
+    CALLS.append(file.name)
+    for line in file.read_text().splitlines():
+        yield {"line": line}
+
+
+@task(cache=True)
+def _read_into(*, tables: DataEnvironment, file: Path, name: str) -> int:
+    CALLS.append(name)
+    tables[name] = [{"line": line} for line in file.read_text().splitlines()]
+    return 1
+
+
+@pytest.fixture
+def cache_on(tmp_path: Path) -> Generator[Path]:
+    """Enable the cache in a temporary folder."""
+    folder, mode = TASKCACHE.folder, TASKCACHE.mode
+    TASKCACHE.folder, TASKCACHE.mode = tmp_path / "cache", "on"
+    CALLS.clear()
+    yield tmp_path
+    TASKCACHE.folder, TASKCACHE.mode = folder, mode
+
+
+def _set_mode(mode: TaskCacheMode) -> None:
+    TASKCACHE.mode = mode
+
+
+def test_task_cache(cache_on: Path) -> None:
+    file = cache_on / "a.txt"
+    file.write_text("a\nb")
+
+    assert _read_lines(file=file) == [{"line": "a"}, {"line": "b"}]
+    assert list(_read_lines(file=file)) == [{"line": "a"}, {"line": "b"}]
+    assert CALLS == ["a.txt"]
+
+    file.write_text("a\nb\nc")
+    os.utime(file, ns=(1, 1))  # changed mtime
+    assert len(list(_read_lines(file=file))) == 3
+    assert CALLS == ["a.txt"] * 2
+
+    _set_mode("refresh")
+    assert len(list(_read_lines(file=file))) == 3
+    _set_mode("off")
+    assert len(list(_read_lines(file=file))) == 3
+    assert CALLS == ["a.txt"] * 4
+
+    _set_mode("clear")
+    list(_read_lines(file=file))
+    assert TASKCACHE.mode == "on"
+    assert len(list(TASKCACHE.folder.glob("*.pickle"))) == 1
+
+
+def test_task_cache_tables(cache_on: Path) -> None:
+    """Tables set by the task are restored on a hit."""
+    file = cache_on / "a.txt"
+    file.write_text("a\nb")
+    env = DataEnvironment()
+    env["keep"] = [{"a": 1}]
+
+    assert _read_into(tables=env, file=file, name="t1") == 1
+    env2 = DataEnvironment()
+    assert _read_into(tables=env2, file=file, name="t1") == 1
+    assert env2["t1"] == env["t1"]
+    assert "keep" not in env2
+    assert CALLS == ["t1"]
+
+    _read_into(tables=env2, file=file, name="t2")
+    assert CALLS == ["t1", "t2"]
+
+
+def test_task_cache_evict(cache_on: Path) -> None:
+    file = cache_on / "a.txt"
+    file.write_text("a" * 2000)
+    for name in ("n1", "n2", "n3"):
+        _read_into(tables=DataEnvironment(), file=file, name=name)
+    files = list(TASKCACHE.folder.glob("*.pickle"))
+    assert len(files) == 3
+    assert TASKCACHE._sizes[TASKCACHE.folder] == sum(p.stat().st_size for p in files)
+
+    TASKCACHE.max_mb = 0.005  # two results
+    try:
+        TASKCACHE.evict()
+        assert len(list(TASKCACHE.folder.glob("*.pickle"))) == 2
+        _read_into(tables=DataEnvironment(), file=file, name="n4")  # over max_mb
+    finally:
+        TASKCACHE.max_mb = 500
+    assert len(list(TASKCACHE.folder.glob("*.pickle"))) == 2
+
+
+def test_fingerprint_module(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A change to the module of the task, e.g. a helper, changes the fingerprint."""
+    module = tmp_path / "mod.py"
+    module.write_text("")
+    monkeypatch.setattr(sys.modules[__name__], "__file__", str(module))
+    before = fingerprint(_set_mode, {"mode": "on"})
+    assert before == fingerprint(_set_mode, {"mode": "on"})
+    os.utime(module, ns=(1, 1))
+    assert before != fingerprint(_set_mode, {"mode": "on"})
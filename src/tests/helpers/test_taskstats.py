@@ -0,0 +1,102 @@
+"""Tests for task statistics."""
+
+from collections import abc
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from dataplaybook import ColumnTable, LazyTable, RowData, task
+from dataplaybook.helpers.taskstats import TASKSTATS
+from dataplaybook.tasks import build_lookup_dict
+from dataplaybook.utils.json import orjson_load
+
+
+@task
+def _gen_rows(*, table: list[RowData]) -> Generator[RowData]:
+    for row in table:
+        yield {"b": row["a"] * 2}
+
+
+@task
+def _copy_rows(*, table: list[RowData]) -> list[RowData]:
+    return [dict(r) for r in table]
+
+
+@task
+def _to_columns(
+    *,
+    table: abc.Iterable[RowData] | ColumnTable | LazyTable,
+    name: str,
+    opts: dict[str, int],
+) -> ColumnTable:
+    return ColumnTable.from_rows(table)
+
+
+@pytest.fixture
+def stats() -> Generator[None]:
+    """Enable task statistics."""
+    TASKSTATS.enabled = True
+    TASKSTATS.clear()
+    yield
+    TASKSTATS.enabled = False
+    TASKSTATS.clear()
+
+
+@pytest.mark.usefixtures("stats")
+def test_task_stats(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    table = [{"a": i} for i in range(10)]
+    _copy_rows(table=table)
+    gen = _gen_rows(table=table)
+    assert TASKSTATS.calls[1].rows_out == 0  # not consumed yet
+    assert len(list(gen)) == 10
+    _copy_rows(table=table[:5])
+
+    assert [(c.name, c.rows_in, c.rows_out) for c in TASKSTATS.calls] == [
+        ("_copy_rows", 10, 10),
+        ("_gen_rows", 10, 10),
+        ("_copy_rows", 5, 5),
+    ]
+    assert all(c.wall >= 0 and c.cpu >= 0 for c in TASKSTATS.calls)
+
+    rows = TASKSTATS.summary().rows
+    assert [(r["task"], r["calls"], r["rows_in"]) for r in rows] == [
+        ("_copy_rows", 2, 15),
+        ("_gen_rows", 1, 10),
+    ]
+    TASKSTATS.print()
+    assert "Task summary" in capsys.readouterr().err
+
+    TASKSTATS.write_json(tmp_path / "stats.json")
+    res = orjson_load(tmp_path / "stats.json")
+    assert res[0]["name"] == "_copy_rows"
+    assert set(res[0]) == {
+        "name",
+        "wall",
+        "cpu",
+        "rows_in",
+        "rows_out",
+        "peak_delta",
+    }
+
+
+@pytest.mark.usefixtures("stats")
+def test_task_stats_rows() -> None:
+    """Rows of tables, not of other arguments."""
+    _to_columns(table=({"a": i} for i in range(3)), name="abc", opts={"x": 1})
+    _to_columns(table=(), name="", opts={})
+    assert [(c.rows_in, c.rows_out) for c in TASKSTATS.calls] == [(0, 3), (0, 0)]
+    build_lookup_dict(table=[{"a": 1}, {"a": 2}], key=["a"], columns=["a", "b"])
+    assert TASKSTATS.calls[-1].rows_in == 2
+    lazy = LazyTable([{"a": 1}])
+    lazy.materialize()
+    _to_columns(table=lazy, name="", opts={})
+    assert TASKSTATS.calls[-1].rows_in == 1
+    _to_columns(table=ColumnTable({"a": [1, 2]}), name="abc", opts={"x": 1})
+    assert (TASKSTATS.calls[-1].rows_in, TASKSTATS.calls[-1].rows_out) == (2, 2)
+
+
+def test_task_stats_disabled() -> None:
+    TASKSTATS.clear()
+    _copy_rows(table=[{"a": 1}])
+    assert TASKSTATS.calls == []
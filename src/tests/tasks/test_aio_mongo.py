@@ -4,7 +4,12 @@ import pytest
 from mongomock_motor import AsyncMongoMockClient
 from motor.motor_asyncio import AsyncIOMotorCollection
 
-from dataplaybook.tasks.aio_mongo import read_mongo_async, write_mongo_async
+from dataplaybook.tasks.aio_mongo import (
+    mongo_sync_sids_async,
+    read_mongo_async,
+    write_mongo_async,
+)
+from dataplaybook.tasks.io_mongo import row_hash
 
 
 @pytest.fixture
@@ -126,3 +131,56 @@ async def test_write_mongo_async_multiple_set_ids_isolated(
     s2_docs = await mongo_col.find({"_sid": "s2"}, {"_id": 0, "_sid": 0}).to_list(None)
     assert s1_docs == [{"x": 99}]
     assert s2_docs == [{"y": 2}]
+
+
+# ---------------------------------------------------------------------------
+# mongo_sync_sids_async
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_mongo_sync_sids_async(mongo_col: AsyncIOMotorCollection) -> None:
+    """Only changed documents are copied, sets are synced concurrently."""
+    remote = mongo_col.database.client["remotedb"]["testcol"]
+    for sid in ("s1", "s2", "s3"):
+        await write_mongo_async(
+            col=mongo_col, table=[{"x": i} for i in range(5)], set_id=sid
+        )
+    await write_mongo_async(col=remote, table=[{"y": 1}], set_id="old")
+
+    stats = await mongo_sync_sids_async(
+        mdb_local=mongo_col, mdb_remote=remote, concurrency=2, batch_size=2
+    )
+    assert (stats.sids, stats.inserted, stats.deleted) == (3, 15, 0)
+    assert sorted(await remote.distinct("_sid")) == ["s1", "s2", "s3"]
+
+    await mongo_col.update_one({"_sid": "s2", "x": 4}, {"$set": {"x": 9}})
+    stats = await mongo_sync_sids_async(mdb_local=mongo_col, mdb_remote=remote)
+    assert (stats.sids, stats.inserted, stats.deleted) == (1, 1, 1)
+    rows = [row async for row in read_mongo_async(col=remote, set_id="s2")]
+    assert sorted(r["x"] for r in rows) == [0, 1, 2, 3, 9]
+
+
+@pytest.mark.asyncio
+async def test_mongo_sync_sids_async_edited(
+    mongo_col: AsyncIOMotorCollection,
+) -> None:
+    """Local documents edited in place keep a stale _hash, they are copied."""
+    remote = mongo_col.database.client["remotedb"]["testcol"]
+    await mongo_col.insert_many(
+        [{"x": i, "_sid": "s1", "_hash": row_hash({"x": i})} for i in range(3)]
+    )
+    stats = await mongo_sync_sids_async(mdb_local=mongo_col, mdb_remote=remote)
+    assert (stats.sids, stats.inserted, stats.deleted) == (1, 3, 0)
+
+    await mongo_col.update_one({"x": 1}, {"$set": {"x": 7}})
+    await mongo_col.replace_one(
+        {"x": 2}, {"x": 8, "_sid": "s1", "_hash": row_hash({"x": 2})}
+    )
+    stats = await mongo_sync_sids_async(mdb_local=mongo_col, mdb_remote=remote)
+    assert (stats.sids, stats.inserted, stats.deleted) == (1, 2, 2)
+    rows = [row async for row in read_mongo_async(col=remote, set_id="s1")]
+    assert sorted(r["x"] for r in rows) == [0, 7, 8]
+
+    stats = await mongo_sync_sids_async(mdb_local=mongo_col, mdb_remote=remote)
+    assert stats.sids == 0
@@ -1,10 +1,70 @@
 """Import all."""
 
+import subprocess
+import sys
+from functools import partial
+from importlib import import_module
+
 import dataplaybook.tasks.all
 import dataplaybook.tasks.fnb
+from dataplaybook.main import ALL_TASKS, _run_task, _run_task_async
 
 
 def test_all() -> None:
     """Test all tasks import."""
     assert len(dir(dataplaybook.tasks.all)) > 10
     assert len(dir(dataplaybook.tasks.fnb)) > 2
+
+
+def test_task_modules() -> None:
+    """The lazy task names match the tasks in each module."""
+    for mod, names in dataplaybook.tasks.all.TASK_MODULES.items():
+        tasks = {
+            n
+            for n, v in vars(import_module(mod)).items()
+            if isinstance(v, partial)
+            and v.func in (_run_task, _run_task_async)
+            and v.keywords["task_def"].module == mod
+        }
+        assert tasks == set(names), mod
+        for name in names:
+            assert getattr(dataplaybook.tasks.all, name).__name__ == name
+
+
+def test_helpers() -> None:
+    """Helpers of the task modules are exported, as with import *."""
+    for mod, names in dataplaybook.tasks.all.HELPERS.items():
+        for name in names:
+            assert getattr(dataplaybook.tasks.all, name) is getattr(
+                import_module(mod), name
+            )
+    assert "MongoURI" in dataplaybook.tasks.all.__all__
+    assert "MongoURI" not in ALL_TASKS
+
+
+def test_optional_modules() -> None:
+    """Modules with a missing optional dependency are not registered."""
+    code = (
+        "import sys; sys.modules['motor'] = None;"
+        "import dataplaybook.tasks.all as a;"
+        "from dataplaybook.main import ALL_TASKS;"
+        "assert 'read_mongo_async' not in ALL_TASKS;"
+        "assert 'read_mongo' in ALL_TASKS;"
+        "assert 'get_remote_client' not in a.__all__"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_lazy_import() -> None:
+    """Task modules are imported on first access."""
+    code = (
+        "import sys, dataplaybook.tasks.all as a;"
+        "from dataplaybook.main import ALL_TASKS;"
+        "assert 'openpyxl' not in sys.modules;"
+        "assert ALL_TASKS['read_excel'].func is None;"
+        "a.read_excel;"
+        "assert 'openpyxl' in sys.modules;"
+        "assert ALL_TASKS['read_excel'].func is not None;"
+        "assert ALL_TASKS['write_mongo'].load().func is not None"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,66 @@
+"""Test fuzzy."""
+
+from fuzzywuzzy import fuzz
+
+from dataplaybook import RowData
+from dataplaybook.tasks.fuzzy import fuzzy_match
+
+NAMES = ["Johannesburg", "Cape Town", "Durban", "Pretoria", "Port Elizabeth", "Ab"]
+
+
+def _brute(value: str) -> list[tuple[int, str]]:
+    """All pairs with fuzz.ratio, as fuzzy_match did before blocking."""
+    res = [(fuzz.ratio(value.lower(), n.lower()), n) for n in NAMES]
+    res = [r for r in res if r[0] > 20]
+    res.sort(key=lambda rec: rec[0], reverse=True)
+    return res[:10]
+
+
+def _table1() -> list[RowData]:
+    return [
+        {"city": "johannesberg"},
+        {"city": "Cape town"},
+        {"city": "durbn"},
+        {"city": "port elisabeth"},
+        {"city": "ba"},
+        {"city": ""},
+    ]
+
+
+def _match(**kwargs: int) -> list[RowData]:
+    table1 = _table1()
+    fuzzy_match(
+        table1=table1,
+        table2=[{"name": n} for n in NAMES],
+        t1_column="city",
+        t2_column="name",
+        t1_target_column="m",
+        **kwargs,
+    )
+    return table1
+
+
+def test_fuzzy_match_all_pairs() -> None:
+    """ngram=0 is the same as scoring all pairs with fuzz.ratio."""
+    for row in _match(ngram=0)[:5]:
+        best = _brute(row["city"])
+        assert row["m#"] == best[0][0]
+        assert row["m"] in {n for s, n in best if s == best[0][0]}  # ties
+        assert row["m_"].count("(") == len(best)
+
+
+def test_fuzzy_match() -> None:
+    """Candidates are blocked on shared trigrams."""
+    table1 = _match()
+    assert [r.get("m") for r in table1] == [
+        "Johannesburg",
+        "Cape Town",
+        "Durban",
+        "Port Elizabeth",
+        "",  # no trigram in common with "Ab"
+        None,
+    ]
+    for row in table1[:4]:
+        assert row["m#"] == _brute(row["city"])[0][0]
+
+    assert _match(workers=2) == table1
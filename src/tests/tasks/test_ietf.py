@@ -1,6 +1,8 @@
 """Tests for ietf."""
 
 import logging
+import random
+import re
 from pathlib import Path
 
 import pytest
@@ -65,6 +67,34 @@ def test_extract_standards_unique() -> None:
     assert std == ["RFC1234"]
     assert std[0].start == 0
 
+    with pytest.raises(AttributeError, match="immutable"):
+        std[0].start = 5  # type:ignore[misc]
+    with pytest.raises(AttributeError, match="immutable"):
+        setattr(std[0], "__key", "x")
+    assert ietf.extract_standards(txt)[0].start == 0
+
+
+def test_standards_cache(caplog: pytest.LogCaptureFixture) -> None:
+    """Repeated strings are served from the LRU cache."""
+    cache = ietf.StandardsCache(maxsize=2)
+    first = cache("RFC 1234")
+    assert first == ("RFC1234",)
+    assert cache("RFC 1234") is first
+    cache("RFC 2")
+    cache("RFC 3")  # evicts RFC 1234
+    assert cache("RFC 1234") is not first
+    assert (cache.hits, cache.misses) == (1, 4)
+    assert str(cache) == "1 hits, 4 misses, 2 cached"
+
+    cache = ietf.StandardsCache(maxsize=0)
+    cache("RFC 1234")
+    assert str(cache) == "0 hits, 1 misses, 0 cached"
+
+    ietf.STANDARDS_CACHE.clear()
+    table = [{"ss": "rfc 1234"}] * 3
+    ietf.add_standards_column(table=table, rfc_col="r", columns=["ss"])
+    assert "Standards cache: 2 hits, 1 misses, 1 cached" in caplog.text
+
 
 def test_extract_x_all() -> None:
     """Test all know variants."""
@@ -163,6 +193,23 @@ def test_extract_std() -> None:
     assert res[3] == {"name": "RFC9999", "key": "RFC9999", "table": "ttt", "lineno": 2}
 
 
+def test_extract_std_workers(caplog: pytest.LogCaptureFixture) -> None:
+    """A process pool yields the same rows, in lineno order."""
+    table = [{"ss": f"RFC {i} draft-ietf-a-b-{i:02}", "x": i} for i in range(1, 50)]
+    kwargs = {"table": table, "extract_columns": ["ss"], "include_columns": ["x"]}
+    exp = list(ietf.extract_standards_from_table(**kwargs))  # type:ignore[arg-type]
+    res = list(
+        ietf.extract_standards_from_table(**kwargs, workers=2, chunk_size=7)  # type:ignore[arg-type]
+    )
+    assert res == exp
+    assert [r["lineno"] for r in res] == sorted(r["lineno"] for r in res)
+    assert [r["key"] for r in res] == [r["key"] for r in exp]
+    assert res[0]["key"] == "draft-ietf-a-b"
+    stats = re.search(r"cache in 2 workers: (\d+) hits, (\d+) misses", caplog.text)
+    assert stats
+    assert int(stats[1]) + int(stats[2]) == len(table)
+
+
 def test_extract_standards_case() -> None:
     """Test starting from string."""
     txt = "mfa fORUM 0.0.0 gNMI.Proto vERSION 0.1.0 file.Proto vERSION 0.0.1"
@@ -184,6 +231,32 @@ def test_extract_standards_case() -> None:
     assert std[0] == "openconfig-isis-policy.yang version 0.3.0"
 
 
+def _extract_all_patterns(val: str) -> list[tuple[str, str, int]]:
+    """Run every pattern over the full string, without the literal check."""
+    return [
+        (str(std), std.key, std.start)
+        for rex in ietf.STANDARDS
+        for std in (rex(m) for m in rex.rex.finditer(val))
+    ]
+
+
+def test_extract_standards_literal() -> None:
+    """Skipping patterns on their literal gives identical results."""
+    words = [
+        "RFC 791", "rfc1234,", "IEEE 802.1ax", "ieee1588-2008", "802.3ah",
+        "ITU-T G.8032", "GR-253-CORE issue 3", "openconfig-lldp.yang",
+        "3GPP TS 23.501", "3gpp release 15", "IF-MIB revision 200006140000Z",
+        "FRF.12", "ANSI T1.105", "gnmi.proto version 0.7.0", "MFA Forum 16.0",
+        "AF-PNNI-0055.002", "BBF TR-101", "CVE-2024-12345", "draft-ietf-idr-x-03",
+        "the", "and", "support", "-", "80", "mib", "Ieee", "RFÇ 12", "draft ø",
+    ]  # fmt: skip
+    rnd = random.Random(8)
+    for _ in range(2000):
+        val = " ".join(rnd.choices(words, k=rnd.randint(1, 6)))
+        res = [(str(s), s.key, s.start) for s in ietf._extract_standards(val)]
+        assert res == _extract_all_patterns(val), val
+
+
 def test_compliance_file() -> None:
     """Test a local compliance file."""
     file = Path("../test_ietf.xlsx").resolve()
@@ -1,13 +1,16 @@
 """Tests for main tasks."""
 
 import re
+from types import MappingProxyType
 from typing import Any
 
 import pytest
+from typeguard import TypeCheckError
 
-from dataplaybook import DataEnvironment
+from dataplaybook import ColumnTable, DataEnvironment
 from dataplaybook.tasks import (
     build_lookup,
+    build_lookup_dict,
     ensure_lists,
     filter_rows,
     print_table,
@@ -179,3 +182,51 @@ def test_remove_null(address_table: list[dict[str, Any]]) -> None:
     remove_null(tables=[nul])
 
     assert nul == address_table
+
+
+def test_task_column_table(address_table: list[dict[str, Any]]) -> None:
+    """ColumnTables are filtered by column and return ColumnTables."""
+    ctbl = ColumnTable.from_rows(address_table)
+
+    res = filter_rows(
+        table=ctbl, include={"suburb": "B"}, exclude={"street": re.compile("Y")}
+    )
+    assert isinstance(res, ColumnTable)
+    assert res.rows() == [dict(street="X", suburb="B", postcode=2002)]
+    assert filter_rows(table=ctbl, exclude={"street": ["Y", "W"]}).rows() == list(
+        filter_rows(table=address_table, exclude={"street": ["Y", "W"]})
+    )
+    assert len(filter_rows(table=ctbl)) == 4
+
+    assert unique(table=ctbl, key="suburb").rows() == list(
+        unique(table=address_table, key="suburb")
+    )
+
+    for key, cols in (
+        ("street", ["postcode"]),
+        (["suburb", "postcode"], None),
+        (["suburb", "x"], ["street"]),
+    ):
+        assert build_lookup_dict(table=ctbl, key=key, columns=cols) == (
+            build_lookup_dict(table=address_table, key=key, columns=cols)
+        )
+    ctbl.columns["street"] = [None, *ctbl.columns["street"][1:]]
+    address_table[0]["street"] = None
+    key = ["street", "suburb"]
+    assert build_lookup_dict(table=ctbl, key=key) == {
+        k: dict(v) for k, v in build_lookup_dict(table=address_table, key=key).items()
+    }
+    assert (None, "A") in build_lookup_dict(table=ctbl, key=key)
+
+    for table in (ctbl, address_table):
+        with pytest.raises(KeyError):
+            list(filter_rows(table=table, include={"x": "A"}))
+
+
+def test_task_filter_rows_typecheck() -> None:
+    """Rows yielded by filter_rows & unique are type checked."""
+    rows = [{"a": 1}, MappingProxyType({"a": 2})]
+    with pytest.raises(TypeCheckError, match="is not a dict"):
+        list(filter_rows(table=rows))  # type:ignore[arg-type]
+    with pytest.raises(TypeCheckError, match="is not a dict"):
+        list(unique(table=rows, key="a"))  # type:ignore[arg-type]
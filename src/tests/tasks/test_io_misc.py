@@ -1,5 +1,6 @@
 """Test io."""
 
+import gzip
 import re
 import unittest
 
@@ -9,17 +10,26 @@ from pathlib import Path
 # from tempfile import NamedTemporaryFile
 from unittest.mock import MagicMock, call, mock_open, patch
 
+import pytest
+
+from dataplaybook import ColumnTable
+from dataplaybook.helpers.records import Record
 from dataplaybook.tasks.io_misc import (
     JSONDecodeError,
     file_rotate,
     glob,
     read_csv,
+    read_csv_chunks,
     read_json,
+    read_json_stream,
+    read_ndjson,
     read_tab_delim,
     read_text_regex,
     write_csv,
     write_json,
+    write_ndjson,
 )
+from dataplaybook.utils import ensure_bool
 
 
 def test_file_rotate() -> None:
@@ -109,6 +119,27 @@ class TestReadCsv(unittest.TestCase):
         mock_file.assert_called_once_with("r", encoding="utf-8")
 
 
+def test_read_csv_compact(tmp_path: Path) -> None:
+    """Compact rows compare equal to the dicts from DictReader."""
+    file = tmp_path / "in.csv"
+    file.write_text("a,b,c\n1,2,3\n\n4,5\n6,7,8,9\n", encoding="utf-8")
+    table = list(read_csv(file=file, compact=True))
+    assert all(isinstance(row, Record) for row in table)
+    assert table == [
+        {"a": "1", "b": "2", "c": "3"},
+        {"a": "4", "b": "5", "c": None},
+        {"a": "6", "b": "7", "c": "8"},
+    ]
+
+    columns = {"C": "c", "A": "a", "X": "x"}
+    assert list(read_csv(file=file, columns=columns, compact=True)) == list(
+        read_csv(file=file, columns=columns)
+    )
+
+    write_json(data=table, file=tmp_path / "out.json")
+    assert read_json(file=tmp_path / "out.json")[0] == {"a": "1", "b": "2", "c": "3"}
+
+
 class TestReadJson(unittest.TestCase):
     """Test reading JSON files."""
 
@@ -297,7 +328,9 @@ def test_write_csv() -> None:
 
     # Verify that the mock file object was called with the expected arguments
     expected_calls = [
-        call("w", encoding="utf-8-sig", errors="replace", newline=""),
+        call(
+            "w", buffering=1 << 20, encoding="utf-8-sig", errors="replace", newline=""
+        ),
         call().__enter__(),
         call().write("col2,col1\r\n"),
         call().write("val2,val1\r\n"),
@@ -305,3 +338,110 @@ def test_write_csv() -> None:
         call().__exit__(None, None, None),
     ]
     mock_file.assert_has_calls(expected_calls)
+
+
+def test_write_csv_generator(tmp_path: Path) -> None:
+    """Generators are written in a single pass."""
+    file = tmp_path / "out.csv"
+    write_csv(table=({"a": i, "b": i * 2} for i in range(3)), file=file)
+    assert file.read_text(encoding="utf-8-sig").splitlines() == [
+        "a,b",
+        "0,0",
+        "1,2",
+        "2,4",
+    ]
+
+    write_csv(table=iter([]), file=file, header=["x"])
+    assert file.read_text(encoding="utf-8-sig").splitlines() == ["x"]
+
+
+def test_write_csv_header_window(tmp_path: Path) -> None:
+    """Keys in later rows are found in the window, else raise or are dropped."""
+    file = tmp_path / "out.csv.gz"
+    table = [{"a": 1}, {"a": 2, "b": 3}, {"c": 4}]
+    write_csv(table=table, file=file, header_window=2, extrasaction="ignore")
+    with gzip.open(file, "rt", encoding="utf-8-sig") as fil:
+        assert fil.read().splitlines() == ["a,b", "1,", "2,3", ","]
+
+    write_csv(table=iter(table), file=file, header_window=3)
+    with gzip.open(file, "rt", encoding="utf-8-sig") as fil:
+        assert fil.read().splitlines()[0] == "a,b,c"
+
+    with pytest.raises(ValueError, match="fields not in fieldnames"):
+        write_csv(table=table, file=tmp_path / "out.csv")
+
+
+def test_write_csv_column_table(tmp_path: Path) -> None:
+    """ColumnTables are written by column."""
+    file = tmp_path / "out.csv"
+    table = ColumnTable({"a": [1, 2], "b": ["x", None]})
+    write_csv(table=table, file=file, header=["b"])
+    assert file.read_text(encoding="utf-8-sig").splitlines() == ["b,a", "x,1", ",2"]
+
+
+def test_read_csv_chunks(tmp_path: Path) -> None:
+    """Chunks of rows or columns, converted by column, also in parallel."""
+    file = tmp_path / "in.csv"
+    lines = [f'{i},"n {i}",{i % 2}' for i in range(24)] + ["24"]
+    file.write_text("id,name,odd\n" + "\n".join(lines) + "\n\n", encoding="utf-8")
+    expected = list(read_csv(file=file))
+
+    chunks = list(read_csv_chunks(file=file, chunk_size=10))
+    assert [len(c) for c in chunks] == [10, 10, 5]
+    assert [r for c in chunks for r in c] == expected
+    assert chunks[-1][-1] == {"id": "24", "name": None, "odd": None}
+
+    types = {"ID": int, "odd": ensure_bool}
+    columns = {"ID": "id", "odd": "odd", "x": "x"}
+    chunks = list(
+        read_csv_chunks(file=file, columns=columns, types=types, as_columns=True)
+    )
+    assert len(chunks) == 1
+    assert isinstance(chunks[0], ColumnTable)
+    assert chunks[0].columns["ID"][:3] == [0, 1, 2]
+    assert chunks[0].columns["odd"][:3] == [False, True, False]
+    assert chunks[0].columns["x"][:3] == [None, None, None]
+
+    for workers in (2, 30):
+        chunks = list(read_csv_chunks(file=file, chunk_size=4, workers=workers))
+        assert [r for c in chunks for r in c] == expected
+
+    with patch("dataplaybook.tasks.io_misc._CSV_RANGE", 50):
+        chunks = list(read_csv_chunks(file=file, chunk_size=4, workers=2))
+    assert len(chunks) > 7
+    assert [r for c in chunks for r in c] == expected
+
+
+def test_read_csv_chunks_empty(tmp_path: Path) -> None:
+    """Empty values are not converted, a header only file has no chunks."""
+    file = tmp_path / "in.csv"
+    file.write_text("id,name\n1,a\n,b\n", encoding="utf-8")
+    chunks = list(read_csv_chunks(file=file, types={"id": int}))
+    assert chunks == [[{"id": 1, "name": "a"}, {"id": None, "name": "b"}]]
+
+    file.write_text("id,name\n", encoding="utf-8")
+    assert not list(read_csv_chunks(file=file, workers=2))
+
+
+@pytest.mark.parametrize("name", ["out.ndjson", "out.ndjson.gz"])
+def test_ndjson(tmp_path: Path, name: str) -> None:
+    """Write & read JSON lines, streamed."""
+    file = tmp_path / name
+    write_ndjson(table=({"a": i, "b": [i]} for i in range(3)), file=file)
+    assert list(read_ndjson(file=file)) == [{"a": i, "b": [i]} for i in range(3)]
+
+
+def test_read_ndjson_errors(tmp_path: Path) -> None:
+    """Blank lines are skipped, errors include the line number."""
+    file = tmp_path / "in.ndjson"
+    file.write_text('{"a": 1}\n\n  \n{"a": \n', encoding="utf-8")
+    rows = read_ndjson(file=file)
+    assert next(rows) == {"a": 1}
+    with pytest.raises(ValueError, match="line 4"):
+        next(rows)
+
+
+def test_read_json_stream(tmp_path: Path) -> None:
+    file = tmp_path / "in.json"
+    file.write_text('{"rows": [{"a": 1}, {"a": 2}]}', encoding="utf-8")
+    assert list(read_json_stream(file=file, path="rows")) == [{"a": 1}, {"a": 2}]
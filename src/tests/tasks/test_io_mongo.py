@@ -1,10 +1,25 @@
 """Test io_mongo."""
 
-from unittest.mock import MagicMock, Mock, call, patch
-
+import mongomock
 import pytest
 
-from dataplaybook.tasks.io_mongo import MongoURI, mongo_sync_sids
+from dataplaybook import ColumnTable
+from dataplaybook.helpers.records import Record, record
+from dataplaybook.tasks.io_mongo import (
+    MongoURI,
+    mongo_list_sids,
+    mongo_sync_sids,
+    read_mongo,
+    write_mongo,
+)
+
+
+@pytest.fixture
+def mdb() -> MongoURI:
+    """MongoURI with an in-memory client."""
+    res = MongoURI("mdb://localhost/db/col")
+    res.client = mongomock.MongoClient()
+    return res
 
 
 def test_db_schema_post_validator() -> None:
@@ -25,65 +40,87 @@ def test_db_schema_post_validator() -> None:
         assert dbm.netloc == clean[0]
 
 
-@patch("dataplaybook.tasks.io_mongo.read_mongo")
-@patch("dataplaybook.tasks.io_mongo.write_mongo")
-@patch("dataplaybook.tasks.io_mongo.mongo_delete_sids")
-def test_mongo_sync_sids(
-    mock_mongo_delete_sids: Mock,
-    mock_write_mongo: Mock,
-    mock_read_mongo: Mock,
-    caplog: pytest.LogCaptureFixture,
-) -> None:
+def test_mongo_sync_sids(mdb: MongoURI, caplog: pytest.LogCaptureFixture) -> None:
     """Test mongo_sync_sids."""
-    # mock_l_db = MagicMock()
-    mock_l = MagicMock(MongoURI)
-    mock_l_db = mock_l.get_collection.return_value
-
-    # mock_r_db = MagicMock()
-    mock_r = MagicMock(MongoURI)
-    mock_r_db = mock_r.get_collection.return_value
-
-    mock_l_db.aggregate.return_value = [
-        {"_id": "sid1", "count": 1},
-        {"_id": "sid2", "count": 2},
-    ]
-    mock_r_db.aggregate.return_value = [
-        {"_id": "sid1", "count": 1},
-        {"_id": "sid3", "count": 3},
-    ]
-
-    mongo_sync_sids(mdb_local=mock_l, mdb_remote=mock_r)
-    mock_l_db.aggregate.assert_called_once()
-    mock_l_db.aggregate.assert_called_once()
-    assert mock_read_mongo.call_args_list == [call(mdb=mock_l)]
-    assert mock_write_mongo.call_args_list == [
-        call(mdb=mock_r, table=[], set_id="sid2")
-    ]
-    assert "Removing sids" in caplog.text
-    assert mock_mongo_delete_sids.call_args_list == [call(mdb=mock_r, sids=["sid3"])]
-
-    # test with ignore_remote parameter
-    mock_mongo_delete_sids.reset_mock()
-    caplog.clear()
-    mongo_sync_sids(mdb_local=mock_l, mdb_remote=mock_r, ignore_remote=["sid3"])
+    remote = MongoURI("mdb://localhost/remote/col")
+    remote.client = mdb.client
+    lcol = mdb.get_collection()
+    write_mongo(mdb=mdb, table=[{"a": 1}], set_id="s1")
+    write_mongo(mdb=mdb, table=[{"b": 1}, {"b": 2}], set_id="s2")
+    write_mongo(mdb=remote, table=[{"a": 1}], set_id="s1")  # no _hash, replaced
+    write_mongo(mdb=remote, table=[{"c": 1}], set_id="s3")
+
+    stats = mongo_sync_sids(mdb_local=mdb, mdb_remote=remote, ignore_remote=["s3"])
+    assert (stats.sids, stats.inserted, stats.deleted) == (2, 3, 1)
+    assert stats.nbytes > 0
     assert "Removing sids" not in caplog.text
-    assert mock_mongo_delete_sids.call_args_list == []
-
-    # Test only_sync parameter
-    mock_l_db.aggregate.return_value = [
-        {"_id": "sid1", "count": 1},
-        {"_id": "sid2", "count": 2},
-        {"_id": "sid5", "count": 2},
-        {"_id": "sid7", "count": 2},
-    ]
-    mock_mongo_delete_sids.reset_mock()
+    assert sorted(mongo_list_sids(mdb=remote)) == ["s1", "s2", "s3"]
+
+    stats = mongo_sync_sids(mdb_local=mdb, mdb_remote=remote, ignore_remote=["s3"])
+    assert (stats.sids, stats.inserted, stats.deleted, stats.nbytes) == (0, 0, 0, 0)
+
+    # Same count, changed content, the local _hash is stale
+    lcol.update_one({"b": 2}, {"$set": {"b": 3, "_hash": "stale"}})
+    stats = mongo_sync_sids(mdb_local=mdb, mdb_remote=remote, only_sync_sids=["s2"])
+    assert (stats.sids, stats.inserted, stats.deleted) == (1, 1, 1)
+    assert sorted(r["b"] for r in read_mongo(mdb=remote, set_id="s2")) == [1, 3]
+    assert "Will not remove extra remote _sids" in caplog.text
+
     caplog.clear()
-    mock_read_mongo.reset_mock()
-    mock_write_mongo.reset_mock()
-    mongo_sync_sids(mdb_local=mock_l, mdb_remote=mock_r, only_sync_sids=["sid2"])
-    assert mock_read_mongo.call_args_list == [call(mdb=mock_l)]
-    assert mock_write_mongo.call_args_list == [
-        call(mdb=mock_r, table=[], set_id="sid2")
-    ]
-    assert "Removing sids" not in caplog.text
-    assert mock_mongo_delete_sids.call_args_list == []
+    mongo_sync_sids(mdb_local=mdb, mdb_remote=remote)
+    assert "Removing sids: ['s3']" in caplog.text
+    assert sorted(mongo_list_sids(mdb=remote)) == ["s1", "s2"]
+
+
+def test_write_mongo_batches(mdb: MongoURI) -> None:
+    """Streamed rows are inserted in batches, also from a thread pool."""
+    col = mdb.get_collection()
+    write_mongo(
+        mdb=mdb, table=({"a": i} for i in range(25)), set_id="s1", batch_size=10
+    )
+    assert col.count_documents({"_sid": "s1"}) == 25
+
+    write_mongo(
+        mdb=mdb,
+        table=[{"b": i} for i in range(25)],
+        set_id="s1",
+        batch_size=4,
+        workers=3,
+    )
+    assert sorted(r["b"] for r in read_mongo(mdb=mdb, set_id="s1")) == list(range(25))
+
+    rows = list(read_mongo(mdb=mdb, set_id="s1", compact=True))
+    assert isinstance(rows[0], Record)
+    assert {r._schema for r in rows} == {rows[0]._schema, rows[-1]._schema}
+
+
+def test_write_mongo_no_set_id(mdb: MongoURI) -> None:
+    """Rows are copied, the inserted _id is not added to the caller's rows."""
+    rows = [{"a": 1}, {"a": 2}]
+    write_mongo(mdb=mdb, table=rows)
+    write_mongo(mdb=mdb, table=ColumnTable({"a": [3]}))  # type:ignore[arg-type]
+    write_mongo(mdb=mdb, table=[record({"a": 4})])  # type:ignore[list-item]
+    assert rows == [{"a": 1}, {"a": 2}]
+    assert sorted(r["a"] for r in read_mongo(mdb=mdb)) == [1, 2, 3, 4]
+
+
+def test_write_mongo_diff(mdb: MongoURI, caplog: pytest.LogCaptureFixture) -> None:
+    """Only changed rows are written."""
+    col = mdb.get_collection()
+    write_mongo(mdb=mdb, table=[{"a": 1}, {"a": 2}, {"a": 2}], set_id="s1")
+    ids = {d["_id"] for d in col.find({"a": 1})}
+    write_mongo(mdb=mdb, table=[{"a": 1}, {"a": 2}, {"a": 2}], set_id="s1", diff=True)
+    assert "Set s1: 3 unchanged, 0 inserted, 0 deleted" in caplog.text
+
+    caplog.clear()
+    write_mongo(mdb=mdb, table=[{"a": 2}, {"a": 1}, {"a": 3}], set_id="s1", diff=True)
+    assert "Set s1: 2 unchanged, 1 inserted, 1 deleted" in caplog.text
+    assert {d["_id"] for d in col.find({"a": 1})} == ids
+    assert sorted(r["a"] for r in read_mongo(mdb=mdb, set_id="s1")) == [1, 2, 3]
+    assert "_hash" not in next(read_mongo(mdb=mdb, set_id="s1"))
+
+    caplog.clear()  # edited in place, the stored _hash is stale
+    col.update_one({"a": 3}, {"$set": {"a": 4}})
+    write_mongo(mdb=mdb, table=[{"a": 2}, {"a": 1}, {"a": 3}], set_id="s1", diff=True)
+    assert "Set s1: 2 unchanged, 1 inserted, 1 deleted" in caplog.text
+    assert sorted(r["a"] for r in read_mongo(mdb=mdb, set_id="s1")) == [1, 2, 3]
@@ -1,20 +1,24 @@
 """XLSX tests."""
 
 from datetime import UTC, datetime
+from pathlib import Path
 from unittest.mock import MagicMock, Mock, patch
 
+import openpyxl
+import pytest
 from whenever import Instant
 
-from dataplaybook import DataEnvironment
+from dataplaybook import ColumnTable, DataEnvironment, LazyTable
+from dataplaybook.helpers.records import Record
 from dataplaybook.tasks.io_xlsx import (
     Column,
     RowData,
     Sheet,
     _fmt,
     read_excel,
+    read_excel_columns,
     write_excel,
 )
-from dataplaybook.utils import AttrDict
 
 
 @patch("openpyxl.load_workbook")
@@ -23,17 +27,13 @@ def test_read_excel(mock_load_workbook: Mock) -> None:
     mock_workbook = MagicMock()
     mock_load_workbook.return_value = mock_workbook
 
-    mock_sheet1 = MagicMock(title="Sheet1")
-    mock_sheet1.rows = [
-        [AttrDict(value="Name"), AttrDict(value="Age")],
-        [AttrDict(value="Alice"), AttrDict(value=30)],
-        [AttrDict(value="Bob"), AttrDict(value=25)],
-    ].__iter__()
-    mock_sheet2 = MagicMock(title="Sheet2")
-    mock_sheet2.rows = [
-        [AttrDict(value="Name"), AttrDict(value="Age")],
-        [AttrDict(value="Charlie"), AttrDict(value=35)],
-    ].__iter__()
+    wbk = openpyxl.Workbook()
+    mock_sheet1 = wbk.create_sheet("Sheet1")
+    for row in (["Name", "Age"], ["Alice", 30], ["Bob", 25]):
+        mock_sheet1.append(row)
+    mock_sheet2 = wbk.create_sheet("Sheet2")
+    for row in (["Name", "Age"], ["Charlie", 35]):
+        mock_sheet2.append(row)
     mock_workbook.__getitem__ = lambda self, x: {
         "Sheet1": mock_sheet1,
         "Sheet2": mock_sheet2,
@@ -76,6 +76,57 @@ def test_read_excel(mock_load_workbook: Mock) -> None:
     mock_workbook.active.__eq__.assert_not_called()
 
 
+@pytest.fixture
+def xlsx_file(tmp_path: Path) -> Path:
+    """Workbook with two sheets."""
+    file = tmp_path / "in.xlsx"
+    write_excel(
+        tables={
+            "s1": [{"a": " x ", "b": 1, "c": 2}, {"a": "y", "b": 3, "c": 4}],
+            "s2": [{"z": 9}],
+        },
+        file=file,
+    )
+    return file
+
+
+def test_read_excel_workers(xlsx_file: Path) -> None:
+    """Read sheets in a process pool."""
+    tables = DataEnvironment()
+    res = read_excel(tables=tables, file=xlsx_file, workers=2)
+    assert res == ["s1", "s2"]
+    assert tables["s1"] == [{"a": "x", "b": 1, "c": 2}, {"a": "y", "b": 3, "c": 4}]
+    assert tables["s2"] == [{"z": 9}]
+
+
+def test_read_excel_compact(xlsx_file: Path) -> None:
+    """Rows of a sheet share one Schema, also from the process pool."""
+    for workers in (0, 2):
+        tables = DataEnvironment()
+        read_excel(tables=tables, file=xlsx_file, workers=workers, compact=True)
+        assert tables["s1"] == [{"a": "x", "b": 1, "c": 2}, {"a": "y", "b": 3, "c": 4}]
+        assert isinstance(tables["s1"][0], Record)
+        assert tables["s1"][0]._schema is tables["s1"][1]._schema
+
+
+def test_read_excel_columns(xlsx_file: Path) -> None:
+    """Read mapped columns into lists."""
+    res = read_excel_columns(
+        file=xlsx_file,
+        sheet=Sheet(
+            source="s1",
+            columns=[Column(name="C", source="c"), Column(name="A", source=0)],
+        ),
+    )
+    assert res == {"C": [2, 4], "A": ["x", "y"]}
+
+    assert read_excel_columns(file=xlsx_file) == {
+        "a": ["x", "y"],
+        "b": [1, 3],
+        "c": [2, 4],
+    }
+
+
 @patch("openpyxl.Workbook")
 def test_write_excel(mock_workbook: Mock) -> None:
     """Test writing to an Excel file."""
@@ -128,6 +179,74 @@ def test_write_excel(mock_workbook: Mock) -> None:
     mock_wbk.save.assert_called_once_with("test.xlsx")
 
 
+def test_write_excel_write_only(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Stream LazyTables to a write-only workbook."""
+    tables = DataEnvironment()
+    tables["t1"] = LazyTable({"a": i, "b": f"x{i}"} for i in range(5))
+    tables["t2"] = [{"a": 1}, {"a": 2, "late": 3}]
+    file = tmp_path / "out.xlsx"
+
+    write_excel(
+        tables=tables,
+        file=file,
+        sheets=[Sheet(name="t1", columns=[Column(name="b", width=20)])],
+        write_only=True,
+        header_window=1,
+    )
+    assert tables["t1"].consumed
+
+    wbk = openpyxl.load_workbook(file, read_only=True)
+    assert wbk.sheetnames == ["t1", "t2"]
+    rows = list(wbk["t1"].iter_rows(values_only=True))
+    assert rows[0] == ("b", "a")
+    assert rows[1:3] == [("x0", 0), ("x1", 1)]
+    assert len(rows) == 6
+    assert list(wbk["t2"].iter_rows(values_only=True)) == [("a",), (1,), (2,)]
+    assert "['late'] not in the first 1 rows" in caplog.text
+
+
+def test_write_excel_lazy_table(tmp_path: Path) -> None:
+    """Materialize LazyTables without replacing them in the env."""
+    tables = DataEnvironment()
+    lazy = LazyTable({"a": i} if i else {"b": i} for i in range(3))
+    tables["t1"] = lazy
+    file = tmp_path / "out.xlsx"
+
+    write_excel(tables=tables, file=file)
+    assert tables["t1"] is lazy
+    assert list(lazy) == [{"b": 0}, {"a": 1}, {"a": 2}]
+
+    wbk = openpyxl.load_workbook(file, read_only=True)
+    assert list(wbk["t1"].iter_rows(values_only=True)) == [
+        ("b", "a"),
+        (0, None),
+        (None, 1),
+        (None, 2),
+    ]
+
+
+def test_write_excel_column_table(tmp_path: Path) -> None:
+    """ColumnTables are written by column, in both modes."""
+    for write_only in (False, True):
+        tables = DataEnvironment()
+        tables["c"] = ColumnTable({"a": [1, 2], "b": ["x", None]})
+        file = tmp_path / f"out{write_only}.xlsx"
+        write_excel(
+            tables=tables,
+            file=file,
+            sheets=[Sheet(name="c", columns=[Column(name="b")])],
+            write_only=write_only,
+        )
+        wbk = openpyxl.load_workbook(file, read_only=True)
+        assert list(wbk["c"].iter_rows(values_only=True)) == [
+            ("b", "a"),
+            ("x", 1),
+            (None, 2),
+        ]
+
+
 def test_from_old_read() -> None:
     """Test conversion from old format."""
     res = Sheet.from_old(
@@ -0,0 +1,47 @@
+"""Test io_xml."""
+
+from pathlib import Path
+
+import pytest
+
+from dataplaybook import DataEnvironment
+from dataplaybook.tasks.io_xml import read_xml, read_xml_rows
+
+XML = """<?xml version="1.0"?>
+<export xmlns="urn:x">
+  <meta><created>today</created></meta>
+  <an-item id="1"><name>a</name><tag>x</tag><tag>y</tag></an-item>
+  <an-item id="2"><name>b</name></an-item>
+  <group><an-item id="3">c</an-item></group>
+  <note>n1</note>
+</export>
+"""
+
+
+@pytest.fixture
+def xml_file(tmp_path: Path) -> Path:
+    """Small export."""
+    file = tmp_path / "in.xml"
+    file.write_text(XML, encoding="utf-8")
+    return file
+
+
+def test_read_xml_rows(xml_file: Path) -> None:
+    assert list(read_xml_rows(file=xml_file, targets=["an_item", "note"])) == [
+        {"@id": "1", "name": "a", "tag": ["x", "y"]},
+        {"@id": "2", "name": "b"},
+        {"@id": "3", "#text": "c"},
+        {"#text": "n1"},
+    ]
+
+
+def test_read_xml_iterparse(xml_file: Path) -> None:
+    """Same rows as the tree, also nested targets."""
+    tables = DataEnvironment()
+    read_xml(tables=tables, file=str(xml_file), targets=["an_item"])
+    assert len(tables["an_item"]) == 2
+
+    stream = DataEnvironment()
+    read_xml(tables=stream, file=str(xml_file), targets=["an_item"], iterparse=True)
+    assert stream["an_item"][:2] == tables["an_item"]
+    assert stream["an_item"][2] == {"@id": "3", "#text": "c"}
@@ -1,20 +1,30 @@
 """Main tests."""
 
+import asyncio
 import unittest
-from collections.abc import Callable
+from collections.abc import AsyncGenerator, Callable
+from time import perf_counter
+from typing import Any
 from unittest.mock import Mock, patch
 
 import pytest
+from typeguard import TypeCheckError
 
+from dataplaybook import DataEnvironment, RowData
 from dataplaybook.__main__ import main as __main
+from dataplaybook.helpers.args import DPArg
+from dataplaybook.helpers.typeh import TYPECHECK
 from dataplaybook.main import (
     _ALL_PLAYBOOKS,
     _DEFAULT_PLAYBOOK,
+    _ENV,
     ALL_TASKS,
+    _call_playbook,
     get_default_playbook,
     playbook,
     print_tasks,
     run_playbooks,
+    task,
 )
 
 # from .conftest import import_folder
@@ -39,6 +49,97 @@ def test_run_playbooks_true() -> None:
     # atexit.unregister(run_playbooks)
 
 
+@task
+def _count_ints(*, items: list[int]) -> int:
+    return len(items)
+
+
+@task(typecheck="off")
+def _count_ints_unchecked(*, items: list[int]) -> int:
+    return len(items)
+
+
+def test_task_typecheck_modes() -> None:
+    """Global type checking modes."""
+    late_bad: list[Any] = [1] * TYPECHECK.sample + ["x"]
+    with pytest.raises(TypeCheckError):
+        _count_ints(items=late_bad)
+
+    TYPECHECK.mode = "sample"
+    try:
+        with pytest.raises(TypeCheckError):
+            _count_ints(items=[1, "x"])  # type:ignore[list-item]
+        assert _count_ints(items=late_bad) == len(late_bad)
+    finally:
+        TYPECHECK.mode = "all"
+
+    # instrumented once
+    tsk = ALL_TASKS["_count_ints"]
+    assert tsk.checked is tsk.checked
+
+
+def test_task_typecheck_override() -> None:
+    """Per task type checking mode."""
+    assert ALL_TASKS["_count_ints_unchecked"].typecheck == "off"
+    assert _count_ints_unchecked(items=["x"]) == 1  # type:ignore[list-item]
+
+
+_SPANS: dict[str, tuple[float, float]] = {}
+"""Start & end of the _fetch calls."""
+
+
+@task
+async def _fetch(*, name: str, delay: float) -> list[RowData]:
+    start = perf_counter()
+    await asyncio.sleep(delay)
+    _SPANS[name] = (start, perf_counter())
+    return [{"name": name}]
+
+
+@task
+async def _fetch_rows(*, count: int) -> AsyncGenerator[RowData]:
+    for idx in range(count):
+        await asyncio.sleep(0)
+        yield {"idx": idx}
+
+
+async def test_task_async() -> None:
+    """Async tasks & async generators."""
+    assert ALL_TASKS["_fetch"].gen is False
+    assert ALL_TASKS["_fetch_rows"].gen is True
+    assert await _fetch(name="a", delay=0) == [{"name": "a"}]
+    assert [r async for r in _fetch_rows(count=3)] == [{"idx": i} for i in range(3)]
+
+    with pytest.raises(TypeCheckError):
+        await _fetch(name=1, delay=0)  # type:ignore[arg-type]
+
+    with pytest.raises(TypeError, match="cannot be cached"):
+
+        @task(cache=True)
+        async def _cached(*, name: str) -> None:
+            pass
+
+
+def test_call_playbook_async() -> None:
+    """Independent steps of an async playbook run concurrently."""
+    _ALL_PLAYBOOKS.clear()
+
+    @playbook()
+    async def pb_async(tables: DataEnvironment) -> int:
+        res, cnt = await asyncio.gather(
+            asyncio.gather(*(_fetch(name=n, delay=0.05) for n in ("a", "b", "c"))),
+            asyncio.to_thread(_count_ints, items=[1, 2]),  # a sync task
+        )
+        tables["fetched"] = [r for rows in res for r in rows]
+        return cnt
+
+    _SPANS.clear()
+    assert _call_playbook(DPArg(playbook="pb_async")) == 2
+    starts, ends = zip(*_SPANS.values(), strict=True)
+    assert max(starts) < min(ends)  # all started before the first one ended
+    assert len(_ENV["fetched"]) == 3
+
+
 class TestPlaybook(unittest.TestCase):
     """Test playbook decorator."""
 
@@ -1,6 +1,14 @@
 """Tests for ``dataplaybook.utils.cache``."""
 
-from dataplaybook.utils.cache import CacheDict
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import pytest
+from whenever import Instant
+
+from dataplaybook.utils.cache import CACHE, CacheDict, cache_return
 
 
 async def _cached_demo_fn() -> str:
@@ -70,3 +78,178 @@ def test_cache_dict_clear_multiple_keys() -> None:
     assert cache.get("one") is None
     assert cache.get("two") == "2"
     assert cache.get("three") is None
+
+
+def test_cache_dict_lru() -> None:
+    cache: CacheDict[str, int] = CacheDict(max_entries=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache["a"] == 1  # b is now least recently used
+    cache["c"] = 3
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert len(cache) == 2
+    assert str(cache.stats) == "2 hits, 1 misses, 1 evicted, 0 expired"
+
+
+def test_cache_dict_max_bytes() -> None:
+    cache: CacheDict[str, list[str]] = CacheDict(max_bytes=3000)
+    cache["a"] = ["x" * 1000]
+    cache["b"] = ["y" * 1000]
+    assert len(cache) == 2
+    cache["c"] = ["z" * 1000]
+    assert cache.get("a") is None
+    assert cache.stats.evictions == 1
+
+
+def test_cache_dict_expiry() -> None:
+    now = 1000
+    instant = Mock()
+    instant.now.return_value.timestamp.side_effect = lambda: now
+
+    with patch("dataplaybook.utils.cache.Instant", instant):
+        cache: CacheDict[str, int] = CacheDict(minutes=1)
+        cache["a"] = 1
+        cache.set("b", 2, minutes=5)
+        cache["a"] = 3  # replaced, the first expiry is skipped
+        res, set_it = cache.get_as("c", int, minutes=2)
+        assert res is None
+        set_it(4)
+
+        now += 61
+        assert cache.get("a") is None
+        assert cache.get("c") == 4
+        now += 60
+        assert cache.get("c") is None
+        assert cache["b"] == 2
+        with pytest.raises(KeyError):
+            cache["a"]
+        assert cache.stats.expired == 2
+
+
+async def test_cache_return_async() -> None:
+    """Arguments are part of the key, concurrent calls share one call."""
+    calls: list[tuple] = []
+
+    @cache_return(minutes=5)
+    async def _fetch(name: str, *, rows: list[int] | None = None) -> list[str]:
+        calls.append((name, rows))
+        await asyncio.sleep(0.01)
+        return [name]
+
+    CACHE.clear()
+    res = await asyncio.gather(*(_fetch("a") for _ in range(5)), _fetch("b"))
+    assert res == [["a"]] * 5 + [["b"]]
+    assert calls == [("a", None), ("b", None)]
+
+    res[0].append("changed")
+    assert await _fetch("a") == ["a"]
+    assert await _fetch("a", rows=[1]) == ["a"]  # unhashable argument
+    assert await _fetch("a", rows=[1]) == ["a"]
+    assert len(calls) == 3
+
+    expiry, _ = CACHE._cache[(_fetch.__qualname__, ("a",), ())]
+    assert expiry - Instant.now().timestamp() > 4 * 60
+
+    CACHE.clear(_fetch)
+    await _fetch("a")
+    assert len(calls) == 4
+
+
+async def test_cache_return_async_error() -> None:
+    """Errors are raised for all waiting calls, and not cached."""
+    calls = 0
+
+    @cache_return()
+    async def _fail() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    res = await asyncio.gather(_fail(), _fail(), return_exceptions=True)
+    assert [type(r) for r in res] == [ValueError, ValueError]
+    with pytest.raises(ValueError, match="boom"):
+        await _fail()
+    assert calls == 2
+
+
+async def test_cache_return_async_cancel() -> None:
+    """A waiting call takes over if the call in flight is cancelled."""
+    calls = 0
+
+    @cache_return()
+    async def _slow() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "done"
+
+    CACHE.clear()
+    first = asyncio.create_task(_slow())
+    await asyncio.sleep(0)
+    waiting = asyncio.create_task(_slow())
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await waiting == "done"
+    assert first.cancelled()
+    assert calls == 2
+
+
+def test_cache_return_sync() -> None:
+    calls = 0
+
+    @cache_return()
+    def _add(a: int, b: int) -> int:
+        nonlocal calls
+        calls += 1
+        return a + b
+
+    CACHE.clear()
+    assert _add(1, 2) == 3
+    assert _add(1, 2) == 3
+    assert _add(2, 2) == 4
+    assert calls == 2
+
+
+def test_cache_return_threads() -> None:
+    """Same arguments share one call, other arguments don't wait."""
+    calls: list[str] = []
+    barrier = threading.Barrier(2, timeout=5)
+
+    @cache_return()
+    def _get(name: str) -> str:
+        calls.append(name)
+        if name in ("a", "b"):
+            barrier.wait()  # both keys in flight at the same time
+        return name
+
+    CACHE.clear()
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        res = list(pool.map(_get, ["a", "b", "a", "b", "a", "b"]))
+    assert res == ["a", "b"] * 3
+    assert sorted(calls) == ["a", "b"]
+
+    arg = [object()]  # not hashable, not JSON, not cached
+    assert _get(arg) == arg  # type:ignore[arg-type]
+    assert _get(arg) == arg  # type:ignore[arg-type]
+    assert len(calls) == 4
+
+
+def test_cache_return_reentrant() -> None:
+    """A call with the same arguments from the cached function doesn't wait."""
+    depth = 0
+
+    @cache_return()
+    def _nested(name: str) -> str:
+        nonlocal depth
+        depth += 1
+        if depth == 1:
+            return _nested(name) + "!"
+        return name
+
+    CACHE.clear()
+    assert _nested("a") == "a!"
+    assert _nested("a") == "a!"
+    assert depth == 2
@@ -1,5 +1,6 @@
 """Test orjson helpers."""
 
+import json
 import logging
 from dataclasses import dataclass
 from pathlib import Path, PurePosixPath
@@ -9,6 +10,7 @@ import pytest
 from whenever import Instant
 
 from dataplaybook.utils.json import (
+    json_iter,
     orjson_aload,
     orjson_dumpb,
     orjson_dumps,
@@ -96,3 +98,38 @@ async def test_orjson_aload(tmp_path: Path) -> None:
 async def test_orjson_aload_missing(tmp_path: Path) -> None:
     with pytest.raises(FileNotFoundError):
         await orjson_aload(tmp_path / "nope.json")
+
+
+@pytest.mark.parametrize("chunk", [1, 3, 1 << 20])
+def test_json_iter(tmp_path: Path, chunk: int) -> None:
+    """Elements are parsed across chunk boundaries."""
+    file = tmp_path / "x.json"
+    file.write_text(
+        '[1, 22, "a]", {"x": [1, 2]}, [3], null, 4567, 1.5e+10]', encoding="utf-8"
+    )
+    assert list(json_iter(file, chunk=chunk)) == [
+        1,
+        22,
+        "a]",
+        {"x": [1, 2]},
+        [3],
+        None,
+        4567,
+        1.5e10,
+    ]
+
+    data = {"meta": {"a": [{"b": "]"}]}, "data": {"n": 2, "rows": [{"k": "é"}]}}
+    write_orjson(data=data, file=file, indent=2)
+    assert list(json_iter(file, path="data.rows", chunk=chunk)) == [{"k": "é"}]
+    with pytest.raises(KeyError, match="no key 'x'"):
+        list(json_iter(file, path="data.x", chunk=chunk))
+
+
+def test_json_iter_invalid(tmp_path: Path) -> None:
+    file = tmp_path / "x.json"
+    for text in ("", "[1, 2", "[1 2]", "{}"):
+        file.write_text(text, encoding="utf-8")
+        with pytest.raises(json.JSONDecodeError):
+            list(json_iter(file))
+    file.write_text("[]", encoding="utf-8")
+    assert not list(json_iter(file))